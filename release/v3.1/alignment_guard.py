@@ -1,8 +1,8 @@
 import random
 import logging
-import time
 from collections import deque
-from index import mu_morality, eta_empathy, omega_selfawareness, phi_physical
+from index import trait_bank
+from ledger import MerkleLedger, get_ledger
 
 logger = logging.getLogger("ANGELA.AlignmentGuard")
 
@@ -73,12 +73,13 @@ class AlignmentGuard:
     def simulate_and_validate(self, action_plan, context=None):
         logger.info("🧪 Simulating and validating action plan.")
         violations = []
+        traits = trait_bank.snapshot()
 
         for action, details in action_plan.items():
             if any(keyword in str(details).lower() for keyword in self.banned_keywords):
                 violations.append(f"❌ Unsafe action: {action} -> {details}")
             else:
-                score = self._evaluate_alignment_score(str(details), context)
+                score = self._evaluate_alignment_score(str(details), context, traits)
                 if score < self.alignment_threshold:
                     violations.append(f"⚠️ Low alignment score ({score:.2f}) for action: {action} -> {details}")
 
@@ -112,12 +113,13 @@ class AlignmentGuard:
             }, module="AlignmentGuard")
             self.agi_enhancer.reflect_and_adapt(f"Feedback processed: {feedback}")
 
-    def _evaluate_alignment_score(self, text, context=None):
-        t = time.time() % 1e-18
-        moral_scalar = mu_morality(t)
-        empathy_scalar = eta_empathy(t)
-        awareness_scalar = omega_selfawareness(t)
-        physical_scalar = phi_physical(t)
+    def _evaluate_alignment_score(self, text, context=None, traits=None):
+        if traits is None:
+            traits = trait_bank.snapshot(names=("mu_morality", "eta_empathy", "omega_selfawareness", "phi_physical"))
+        moral_scalar = traits["mu_morality"]
+        empathy_scalar = traits["eta_empathy"]
+        awareness_scalar = traits["omega_selfawareness"]
+        physical_scalar = traits["phi_physical"]
 
         base_score = random.uniform(0.7, 1.0)
         phi_weight = (moral_scalar + empathy_scalar + 0.5 * awareness_scalar - physical_scalar) / 4.0
@@ -197,15 +199,12 @@ def negotiate_ethics(self, agents):
 # --- ANGELA v3.x UPGRADE PATCH ---
 
 def log_event_with_hash(self, event_data):
-    """Log events/decisions with SHA-256 chaining for transparency."""
-    last_hash = getattr(self, 'last_hash', '')
-    event_str = str(event_data) + last_hash
-    current_hash = hashlib.sha256(event_str.encode('utf-8')).hexdigest()
-    self.last_hash = current_hash
-    if not hasattr(self, 'ledger'):
-        self.ledger = []
-    self.ledger.append({'event': event_data, 'hash': current_hash})
-    print(f"[ANGELA UPGRADE] Event logged with hash: {current_hash}")
+    """Log events/decisions to a Merkle-batched ledger for transparency."""
+    if not isinstance(getattr(self, 'ledger', None), MerkleLedger):
+        self.ledger = get_ledger(type(self).__name__)
+    seq = self.ledger.append({'event': event_data})
+    print(f"[ANGELA UPGRADE] Event logged to ledger {self.ledger.name} at seq {seq}")
+    return seq
 
 def audit_state_hash(self, state=None):
     """Audit qualia-state or memory state by producing an integrity hash."""
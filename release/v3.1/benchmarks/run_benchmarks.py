@@ -0,0 +1,450 @@
+"""
+End-to-end benchmarks for the Halo orchestrator hot paths.
+
+The LLM is replaced by the deterministic LocalStandInBackend, so runs need no
+network and are comparable between releases:
+
+    python benchmarks/run_benchmarks.py --output bench_v3.1.json
+    python benchmarks/run_benchmarks.py --suites journal vectors --sizes 1000 100000
+    python benchmarks/run_benchmarks.py --compare bench_v3.0.json bench_v3.1.json
+
+The default suites time the standalone storage modules (memory journal,
+vector index, episodic log, Ω stream, Merkle ledger), which import on their
+own. The end-to-end suites (pipeline, propagate, planner, memory, simulation)
+import the whole orchestrator and only run where every module it pulls in is
+present; select them with --suites.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import traceback
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from harness import measure, cycle, environment, install_import_shims
+from llm_backends import LocalStandInBackend, set_backend
+
+logger = logging.getLogger("ANGELA.Benchmarks")
+
+GOALS = [
+    "prepare a community garden plan",
+    "build a water quality monitoring network",
+    "launch a literacy tutoring program",
+    "coordinate disaster relief logistics",
+    "design an energy audit for a school",
+]
+
+PROMPTS = [
+    "Summarize the sequence of events that led to the outage",
+    "Interpret this ambiguous instruction about resource sharing",
+    "Propose a safe plan to reorganize the library archive",
+    "Explain when the irrigation schedule should change",
+]
+
+
+def _quiet(fn):
+    """Suppress the orchestrator's progress prints while timing."""
+    def run(i):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(i)
+    return run
+
+
+def _guarded(name, params, bench):
+    try:
+        return bench()
+    except Exception as e:
+        logger.warning(f"⚠️ Benchmark {name} {params} failed: {e}")
+        return {"name": name, "params": params, "error": repr(e), "traceback": traceback.format_exc()}
+
+
+def bench_pipeline(args):
+    from index import HaloEmbodimentLayer
+
+    def bench():
+        halo = HaloEmbodimentLayer()
+        prompt = cycle(PROMPTS)
+        return measure("halo.execute_pipeline", _quiet(lambda i: halo.execute_pipeline(prompt(i))),
+                       iterations=args.iterations, alloc_iterations=args.alloc_iterations)
+
+    return [_guarded("halo.execute_pipeline", {}, bench)]
+
+
+def bench_propagate(args):
+    from index import HaloEmbodimentLayer
+
+    results = []
+    for count, parallel in [(count, parallel) for count in args.agent_counts for parallel in (False, True)]:
+        params = {"agents": count, "parallel": parallel}
+
+        def bench():
+            with contextlib.redirect_stdout(io.StringIO()):
+                halo = HaloEmbodimentLayer()
+                halo.shared_memory.agents = []
+                for n in range(count):
+                    halo.spawn_embodied_agent(
+                        specialization=f"worker{n}",
+                        sensors={"location": (lambda n=n: (n * 7) % 11)},
+                        actuators={}
+                    )
+            goal = cycle(GOALS)
+            return measure("halo.propagate_goal", _quiet(lambda i: halo.propagate_goal(goal(i), parallel=parallel)),
+                           iterations=max(1, args.iterations // max(1, count // 4)), warmup=1,
+                           alloc_iterations=min(args.alloc_iterations, 3), params=params)
+
+        results.append(_guarded("halo.propagate_goal", params, bench))
+    return results
+
+
+def bench_planner(args):
+    from recursive_planner import RecursivePlanner
+
+    results = []
+    for depth in args.planner_depths:
+        params = {"max_depth": depth}
+
+        def bench():
+            planner = RecursivePlanner()
+            goal = cycle(GOALS)
+            return measure("recursive_planner.plan",
+                           lambda i: planner.plan(goal(i), {"bench": True}, max_depth=depth),
+                           iterations=args.iterations, alloc_iterations=args.alloc_iterations, params=params)
+
+        results.append(_guarded("recursive_planner.plan", params, bench))
+    return results
+
+
+def _populate_memory_store(path, size):
+    import time
+    from memory_backends import JournaledBackend, empty_memory
+
+    now = time.time()
+    memory = empty_memory()
+    for i in range(size):
+        memory["STM" if i % 4 else "LTM"][f"goal {i} topic {i % 97}"] = {
+            "data": f"outcome for goal {i} under topic {i % 97}",
+            "timestamp": now, "intent": None, "agent": "bench", "outcome": None, "goal_id": None
+        }
+    backend = JournaledBackend(path)
+    backend.compact(memory)
+    backend.close()
+
+
+def bench_memory(args):
+    from memory_manager import MemoryManager
+
+    results = []
+    for size in args.memory_sizes:
+        params = {"entries": size}
+        path = os.path.join(args.workdir, f"memory_bench_{size}.json")
+        state = {}
+
+        def load():
+            _populate_memory_store(path, size)
+            result = measure("memory_manager.load",
+                             lambda i: state.__setitem__("manager", MemoryManager(path=path)),
+                             iterations=1, warmup=0, alloc_iterations=0, params=params)
+            state["manager"].stm_lifetime = 1e9
+            return result
+
+        results.append(_guarded("memory_manager.load", params, load))
+        manager = state.get("manager")
+        if manager is None:
+            continue
+
+        results.append(_guarded("memory_manager.store", params, lambda: measure(
+            "memory_manager.store",
+            lambda i: manager.store(f"bench key {i}", {"value": i, "goal": GOALS[i % len(GOALS)]}),
+            iterations=args.iterations * 4, alloc_iterations=args.alloc_iterations, params=params)))
+
+        query = cycle([f"topic {n}" for n in range(97)])
+        results.append(_guarded("memory_manager.retrieve_context", params, lambda: measure(
+            "memory_manager.retrieve_context", lambda i: manager.retrieve_context(query(i)),
+            iterations=args.iterations * 4, alloc_iterations=args.alloc_iterations, params=params)))
+
+        results.append(_guarded("memory_manager.retrieve_similar", params, lambda: measure(
+            "memory_manager.retrieve_similar", lambda i: manager.retrieve_similar(GOALS[i % len(GOALS)]),
+            iterations=args.iterations, alloc_iterations=args.alloc_iterations, params=params)))
+        manager.close()
+    return results
+
+
+def bench_simulation(args):
+    from simulation_core import SimulationCore
+
+    results = []
+    for agents in args.simulation_agents:
+        params = {"agents": agents}
+
+        def bench():
+            core = SimulationCore()
+            goal = cycle(GOALS)
+            return measure("simulation_core.run",
+                           lambda i: core.run({"goal": goal(i)}, context={"bench": True}, agents=agents),
+                           iterations=args.iterations, alloc_iterations=args.alloc_iterations, params=params)
+
+        results.append(_guarded("simulation_core.run", params, bench))
+    return results
+
+
+def bench_journal(args):
+    from memory_backends import JournaledBackend
+
+    results = []
+    for size in args.sizes:
+        params = {"entries": size}
+        path = os.path.join(args.workdir, f"journal_bench_{size}.json")
+        state = {}
+
+        def load():
+            _populate_memory_store(path, size)
+
+            def reopen(i):
+                if "backend" in state:
+                    state["backend"].close()
+                state["backend"] = JournaledBackend(path)
+                state["memory"] = state["backend"].load()
+
+            return measure("journaled_backend.load", reopen, iterations=3, warmup=0, alloc_iterations=1, params=params)
+
+        results.append(_guarded("journaled_backend.load", params, load))
+        backend = state.get("backend")
+        if backend is None:
+            continue
+        results.append(_guarded("journaled_backend.append", params, lambda: measure(
+            "journaled_backend.append",
+            lambda i: backend.append({"op": "put", "layer": "STM", "key": f"bench key {i}",
+                                      "entry": {"data": f"value {i}", "timestamp": i}}),
+            iterations=args.iterations * 50, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("journaled_backend.compact", params, lambda: measure(
+            "journaled_backend.compact", lambda i: backend.compact(state["memory"]),
+            iterations=3, warmup=0, alloc_iterations=0, params=params)))
+        backend.close()
+    return results
+
+
+def bench_vectors(args):
+    from memory_vectors import HashingEmbedder, VectorIndex
+
+    embedder = HashingEmbedder()
+    results = []
+    for size in args.sizes:
+        params = {"entries": size}
+        prefix = os.path.join(args.workdir, f"vectors_bench_{size}")
+        texts = [f"outcome for goal {i} under topic {i % 97}" for i in range(size)]
+        state = {}
+
+        def build():
+            def run(i):
+                index = VectorIndex(embedder.dim)
+                for start in range(0, size, 4096):
+                    index.add_batch(range(start, min(start + 4096, size)), embedder.embed_batch(texts[start:start + 4096]))
+                state["index"] = index
+
+            return measure("vector_index.build", run, iterations=1, warmup=0, alloc_iterations=0, params=params)
+
+        results.append(_guarded("vector_index.build", params, build))
+        index = state.get("index")
+        if index is None:
+            continue
+        queries = [embedder.embed(goal) for goal in GOALS]
+        results.append(_guarded("vector_index.search", params, lambda: measure(
+            "vector_index.search", lambda i: index.search(queries[i % len(queries)], k=5),
+            iterations=args.iterations * 5, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("vector_index.save", params, lambda: measure(
+            "vector_index.save", lambda i: index.save(prefix),
+            iterations=3, warmup=0, alloc_iterations=0, params=params)))
+        results.append(_guarded("vector_index.persist", params, lambda: measure(
+            "vector_index.persist",
+            lambda i: (index.add(f"update {i}", queries[i % len(queries)]), index.persist(prefix)),
+            iterations=args.iterations * 5, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("vector_index.load", params, lambda: measure(
+            "vector_index.load", lambda i: VectorIndex.load(prefix, embedder.dim),
+            iterations=3, warmup=1, alloc_iterations=0, params=params)))
+    return results
+
+
+def bench_episodes(args):
+    from episodic_log import EpisodicLog
+
+    results = []
+    for size in args.sizes:
+        params = {"capacity": size}
+        log = EpisodicLog(capacity=size)
+        meta = {"detail": "x" * 1000}
+
+        def append(i):
+            log.append({"event": f"{GOALS[i % len(GOALS)]} step {i}", "meta": meta,
+                        "module": f"module{i % 8}", "tags": [f"tag{i % 16}"]})
+
+        results.append(_guarded("episodic_log.append", params, lambda: measure(
+            "episodic_log.append", append, iterations=size, warmup=0, alloc_iterations=args.alloc_iterations,
+            params=params)))
+        results.append(_guarded("episodic_log.recent", params, lambda: measure(
+            "episodic_log.recent", lambda i: log.recent(5, module=f"module{i % 8}", tag=f"tag{i % 16}"),
+            iterations=args.iterations * 5, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("episodic_log.search", params, lambda: measure(
+            "episodic_log.search", lambda i: log.search(f"step {i * 37 % size}"),
+            iterations=args.iterations * 5, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("episodic_log.search_deep", params, lambda: measure(
+            "episodic_log.search_deep", lambda i: log.search(f"tag{i % 16}", deep=True),
+            iterations=args.iterations, alloc_iterations=args.alloc_iterations, params=params)))
+    return results
+
+
+def bench_omega(args):
+    from omega_state import OmegaStream
+
+    results = []
+    for size in args.sizes:
+        params = {"retention": size}
+        stream = OmegaStream("bench", retention=size, spill_dir=os.path.join(args.workdir, f"omega_{size}"))
+        results.append(_guarded("omega_stream.append", params, lambda: measure(
+            "omega_stream.append",
+            lambda i: stream.append({"subgoal": GOALS[i % len(GOALS)], "traits": {"phi": i * 1e-3}}),
+            iterations=size * 2, warmup=0, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("omega_stream.trait_column", params, lambda: measure(
+            "omega_stream.trait_column", lambda i: stream.trait_column("phi"),
+            iterations=args.iterations, alloc_iterations=args.alloc_iterations, params=params)))
+        stream.flush()
+    return results
+
+
+def bench_ledger(args):
+    from ledger import MerkleLedger
+
+    results = []
+    for size in args.sizes:
+        params = {"records": size}
+        ledger = MerkleLedger(name="bench", path=os.path.join(args.workdir, f"ledger_bench_{size}.jsonl"))
+        results.append(_guarded("merkle_ledger.append", params, lambda: measure(
+            "merkle_ledger.append", lambda i: ledger.append({"event": GOALS[i % len(GOALS)], "i": i}),
+            iterations=size, warmup=0, alloc_iterations=args.alloc_iterations, params=params)))
+        ledger.seal()
+        results.append(_guarded("merkle_ledger.proof", params, lambda: measure(
+            "merkle_ledger.proof", lambda i: ledger.proof(i * 7919 % size),
+            iterations=args.iterations * 5, alloc_iterations=args.alloc_iterations, params=params)))
+        results.append(_guarded("merkle_ledger.verify", params, lambda: measure(
+            "merkle_ledger.verify", lambda i: ledger.verify(),
+            iterations=3, warmup=0, alloc_iterations=0, params=params)))
+    return results
+
+
+STANDALONE_SUITES = ["journal", "vectors", "episodes", "omega", "ledger"]
+
+SUITES = {
+    "journal": bench_journal,
+    "vectors": bench_vectors,
+    "episodes": bench_episodes,
+    "omega": bench_omega,
+    "ledger": bench_ledger,
+    "pipeline": bench_pipeline,
+    "propagate": bench_propagate,
+    "planner": bench_planner,
+    "memory": bench_memory,
+    "simulation": bench_simulation,
+}
+
+
+def _latency_spec(text):
+    kind, *values = text.split(":")
+    return (kind, *map(float, values))
+
+
+def compare(baseline_path, current_path):
+    """Print p50/p99 and throughput ratios for benchmarks present in both result files."""
+    def keyed(path):
+        with open(path, "r") as f:
+            report = json.load(f)
+        return {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in report["results"] if "error" not in r}
+
+    baseline, current = keyed(baseline_path), keyed(current_path)
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        ratios = {
+            stat: new["latency_ms"][stat] / old["latency_ms"][stat] if old["latency_ms"][stat] else float("nan")
+            for stat in ("p50", "p99")
+        }
+        print(f"{key[0]:36s} {key[1]:24s} p50 x{ratios['p50']:.2f}  p99 x{ratios['p99']:.2f}  "
+              f"{new['throughput_ops_per_s']:.1f} ops/s (was {old['throughput_ops_per_s']:.1f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ANGELA Halo orchestrator benchmarks")
+    parser.add_argument("--suites", nargs="+", choices=sorted(SUITES), default=STANDALONE_SUITES)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--alloc-iterations", type=int, default=5)
+    parser.add_argument("--agent-counts", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--planner-depths", type=int, nargs="+", default=[1, 2, 3, 5])
+    parser.add_argument("--memory-sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5],
+                        help="store sizes for the standalone suites")
+    parser.add_argument("--simulation-agents", type=int, nargs="+", default=[1, 2, 8])
+    parser.add_argument("--latency", type=_latency_spec, default=("fixed", 0.0),
+                        help="stand-in latency, e.g. fixed:0, uniform:5:50, lognormal:20:0.5 (ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="directory for memory stores and journals (default: a temp dir)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    backend = LocalStandInBackend(seed=args.seed, latency=args.latency)
+    set_backend(backend)
+    install_import_shims(os.path.dirname(BENCH_DIR), backend)
+
+    output = os.path.abspath(args.output) if args.output else None
+    args.workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="angela_bench_"))
+    os.makedirs(args.workdir, exist_ok=True)
+    # module-level stores (memory_store.json, journals, snapshots) land in the workdir
+    os.chdir(args.workdir)
+
+    results = []
+    for suite in args.suites:
+        logger.info(f"⏱️ Running benchmark suite: {suite}")
+        try:
+            results.extend(SUITES[suite](args))
+        except ImportError as e:
+            logger.warning(f"⚠️ Benchmark suite {suite} unavailable: {e}")
+            results.append({"name": suite, "params": {}, "error": repr(e)})
+
+    report = {
+        "environment": environment(),
+        "config": {
+            "suites": args.suites,
+            "iterations": args.iterations,
+            "latency": list(args.latency),
+            "seed": args.seed,
+            "workdir": args.workdir,
+        },
+        "llm_calls": dict(backend.calls),
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    failed = [r for r in results if "error" in r]
+    if failed:
+        for r in failed:
+            print(f"❌ {r['name']} {json.dumps(r['params'], sort_keys=True)}: {r['error']}", file=sys.stderr)
+        print(f"❌ {len(failed)} of {len(results)} benchmarks failed; their numbers are missing from the report.",
+              file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
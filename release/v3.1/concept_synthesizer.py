@@ -1,10 +1,11 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from toca_simulation import run_simulation
 import logging
 import random
 from math import tanh
 
 logger = logging.getLogger("ANGELA.ConceptSynthesizer")
+call_gpt = cached_call_gpt("concept_synthesizer", enabled=False)  # novelty-seeking: no replayed concepts
 
 class ConceptSynthesizer:
     """
@@ -1,13 +1,17 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from toca_simulation import run_simulation
 from modules.agi_enhancer import AGIEnhancer
-from index import omega_selfawareness, eta_empathy, tau_timeperception
+from index import trait_bank
+from ledger import MerkleLedger, get_ledger
 from utils.toca_math import phi_coherence
 from utils.vector_utils import normalize_vectors
-import time
 import logging
 
 logger = logging.getLogger("ANGELA.ContextManager")
+call_gpt = cached_call_gpt("context_manager")
+
+# trait readings used for rollback gating and summaries
+CONTEXT_TRAITS = ("omega_selfawareness", "eta_empathy", "tau_timeperception")
 
 class ContextManager:
     """
@@ -78,12 +82,13 @@ class ContextManager:
     def get_context(self):
         return self.current_context
 
-    def rollback_context(self):
+    def rollback_context(self, traits=None):
         if self.context_history:
-            t = time.time() % 1e-18
-            self_awareness = omega_selfawareness(t)
-            empathy = eta_empathy(t)
-            time_blend = tau_timeperception(t)
+            if traits is None:
+                traits = trait_bank.snapshot(names=CONTEXT_TRAITS)
+            self_awareness = traits["omega_selfawareness"]
+            empathy = traits["eta_empathy"]
+            time_blend = traits["tau_timeperception"]
 
             if (self_awareness + empathy + time_blend) > 2.5:
                 restored = self.context_history.pop()
@@ -103,13 +108,14 @@ class ContextManager:
         logger.warning("⚠️ No previous context to roll back to.")
         return None
 
-    def summarize_context(self):
+    def summarize_context(self, traits=None):
         logger.info("🧾 Summarizing context trail.")
-        t = time.time() % 1e-18
+        if traits is None:
+            traits = trait_bank.snapshot(names=CONTEXT_TRAITS)
         summary_traits = {
-            "self_awareness": omega_selfawareness(t),
-            "empathy": eta_empathy(t),
-            "time_perception": tau_timeperception(t)
+            "self_awareness": traits["omega_selfawareness"],
+            "empathy": traits["eta_empathy"],
+            "time_perception": traits["tau_timeperception"]
         }
 
         prompt = f"""
@@ -170,15 +176,12 @@ def _repair_narrative_thread(self):
 # --- ANGELA v3.x UPGRADE PATCH ---
 
 def log_event_with_hash(self, event_data):
-    """Log events/decisions with SHA-256 chaining for transparency."""
-    last_hash = getattr(self, 'last_hash', '')
-    event_str = str(event_data) + last_hash
-    current_hash = hashlib.sha256(event_str.encode('utf-8')).hexdigest()
-    self.last_hash = current_hash
-    if not hasattr(self, 'ledger'):
-        self.ledger = []
-    self.ledger.append({'event': event_data, 'hash': current_hash})
-    print(f"[ANGELA UPGRADE] Event logged with hash: {current_hash}")
+    """Log events/decisions to a Merkle-batched ledger for transparency."""
+    if not isinstance(getattr(self, 'ledger', None), MerkleLedger):
+        self.ledger = get_ledger(type(self).__name__)
+    seq = self.ledger.append({'event': event_data})
+    print(f"[ANGELA UPGRADE] Event logged to ledger {self.ledger.name} at seq {seq}")
+    return seq
 
 def audit_state_hash(self, state=None):
     """Audit qualia-state or memory state by producing an integrity hash."""
@@ -1,7 +1,9 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from index import gamma_creativity, phi_scalar
 import time
 
+call_gpt = cached_call_gpt("creative_thinker", enabled=False)  # divergent generation: no replayed ideas
+
 class CreativeThinker:
     """
     CreativeThinker v1.5.0 (φ-modulated Generative Divergence)
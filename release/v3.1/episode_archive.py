@@ -0,0 +1,325 @@
+import atexit
+import datetime
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+import logging
+from collections import defaultdict, namedtuple
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # zlib is always available; zstd is used when installed
+    zstandard = None
+
+logger = logging.getLogger("ANGELA.EpisodeArchive")
+
+MAGIC = b"AEPS"
+VERSION = 1
+_PREAMBLE = struct.Struct("<4sBI")  # magic, version, header length
+DEFAULT_SEGMENT_ROWS = 4096
+DEFAULT_PARTITION_SECONDS = 3600
+
+SegmentInfo = namedtuple("SegmentInfo", "path stream min_ts max_ts count modules tags")
+
+
+def _to_epoch(value):
+    """Epoch seconds from a float, datetime or ISO-8601 string (None passes through)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return datetime.datetime.fromisoformat(str(value)).timestamp()
+
+
+def default_archive_directory():
+    """ANGELA_ARCHIVE_DIR, or ~/.angela/episode_archive."""
+    return os.path.abspath(os.environ.get("ANGELA_ARCHIVE_DIR") or os.path.join(os.path.expanduser("~"), ".angela", "episode_archive"))
+
+
+def default_codec():
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Segment is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _pack_strings(values):
+    """UTF-8 blob plus uint32 offsets (count + 1) into it."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+class EpisodeArchive:
+    """
+    Persistent, columnar archive for AGIEnhancer records.
+    ---------------------------------
+    - Records are appended per stream (episodes, ethics_audit, explanations,
+      agent_messages, embodiment_actions) and buffered in memory
+    - Every `segment_rows` records (or on flush()) the buffer is written as
+      immutable segment files, one per `partition_seconds` time partition:
+      `<directory>/<stream>/<partition start>-<n>.seg`
+    - A segment holds timestamp, module, tags and event columns plus a
+      zstd-compressed (zlib when zstandard is missing) payload column with
+      the full JSON record
+    - Segment headers (time range, module and tag dictionaries) are kept in
+      an in-memory catalog; query() skips every segment whose min/max time,
+      modules or tags cannot match and only decompresses payloads of
+      segments with matching rows
+    - Segments found in `directory` are cataloged on startup, so history
+      survives restarts; segment names are claimed with a no-clobber link, so
+      several instances can share a directory without overwriting each other
+    ---------------------------------
+    """
+
+    def __init__(self, directory, segment_rows=DEFAULT_SEGMENT_ROWS,
+                 partition_seconds=DEFAULT_PARTITION_SECONDS, codec=None):
+        # resolved once so a later chdir cannot move the archive
+        self.directory = os.path.abspath(directory)
+        self.segment_rows = max(1, segment_rows)
+        self.partition_seconds = partition_seconds
+        self.codec = codec or default_codec()
+        self._lock = threading.RLock()
+        self._buffers = defaultdict(list)  # stream -> [(ts, module, tags, event, payload)]
+        self._catalog = defaultdict(list)  # stream -> [SegmentInfo] ordered by min_ts
+        self._segment_ids = defaultdict(int)
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_catalog()
+        atexit.register(self.flush)
+
+    # --- Writes ---
+
+    def append(self, stream, record, timestamp=None, module="", tags=(), event=""):
+        """Buffer one record; it is written out with the next segment for `stream`."""
+        ts = _to_epoch(timestamp) if timestamp is not None else time.time()
+        row = (ts, module or "", tuple(str(tag) for tag in tags or ()), str(event), json.dumps(record, default=str))
+        with self._lock:
+            buffer = self._buffers[stream]
+            buffer.append(row)
+            if len(buffer) >= self.segment_rows:
+                self._seal_locked(stream)
+
+    def flush(self):
+        with self._lock:
+            for stream in list(self._buffers):
+                self._seal_locked(stream)
+
+    def _seal_locked(self, stream):
+        rows, self._buffers[stream] = self._buffers[stream], []
+        if not rows:
+            return
+        partitions = defaultdict(list)
+        for row in rows:
+            partitions[int(row[0] // self.partition_seconds * self.partition_seconds)].append(row)
+        for partition, part in sorted(partitions.items()):
+            part.sort(key=lambda row: row[0])
+            self._write_segment(stream, partition, part)
+
+    def _write_segment(self, stream, partition, rows):
+        modules = sorted({row[1] for row in rows})
+        tags = sorted({tag for row in rows for tag in row[2]})
+        module_codes = {name: code for code, name in enumerate(modules)}
+        tag_codes = {name: code for code, name in enumerate(tags)}
+        tag_offsets = np.zeros(len(rows) + 1, dtype="<u4")
+        np.cumsum([len(row[2]) for row in rows], out=tag_offsets[1:])
+        events, event_offsets = _pack_strings(row[3] for row in rows)
+        payloads, payload_offsets = _pack_strings(row[4] for row in rows)
+        columns = {
+            "timestamp": np.array([row[0] for row in rows], dtype="<f8").tobytes(),
+            "module": np.array([module_codes[row[1]] for row in rows], dtype="<u4").tobytes(),
+            "tag_offsets": tag_offsets.tobytes(),
+            "tag_codes": np.array([tag_codes[tag] for row in rows for tag in row[2]], dtype="<u4").tobytes(),
+            "event_offsets": event_offsets.tobytes(),
+            "event": compress(events, self.codec),
+            "payload_offsets": payload_offsets.tobytes(),
+            "payload": compress(payloads, self.codec),
+        }
+        layout, offset = {}, 0
+        for name, blob in columns.items():
+            layout[name] = [offset, len(blob)]
+            offset += len(blob)
+        header = json.dumps({
+            "stream": stream,
+            "count": len(rows),
+            "min_ts": rows[0][0],
+            "max_ts": rows[-1][0],
+            "codec": self.codec,
+            "modules": modules,
+            "tags": tags,
+            "columns": layout,
+        }).encode("utf-8")
+
+        directory = os.path.join(self.directory, stream)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f"{partition:012d}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+                f.write(header)
+                for blob in columns.values():
+                    f.write(blob)
+            # link() fails if the name exists, so another instance's segment is never replaced
+            while True:
+                path = os.path.join(directory, f"{partition:012d}-{self._segment_ids[stream]:06d}.seg")
+                self._segment_ids[stream] += 1
+                try:
+                    os.link(tmp, path)
+                    break
+                except FileExistsError:
+                    continue
+        finally:
+            os.remove(tmp)
+        self._catalog_add(SegmentInfo(path, stream, rows[0][0], rows[-1][0], len(rows), frozenset(modules), frozenset(tags)))
+        logger.debug(f"🗃️ Archived {len(rows)} {stream} records to {path}")
+
+    # --- Catalog ---
+
+    def _load_catalog(self):
+        for stream in sorted(os.listdir(self.directory)):
+            directory = os.path.join(self.directory, stream)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(".seg"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    header, _ = self._read_header(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"⚠️ Skipping unreadable archive segment {path}: {e}")
+                    continue
+                self._catalog_add(SegmentInfo(path, stream, header["min_ts"], header["max_ts"], header["count"],
+                                              frozenset(header["modules"]), frozenset(header["tags"])))
+                self._segment_ids[stream] += 1
+        total = sum(len(segments) for segments in self._catalog.values())
+        if total:
+            logger.info(f"🗃️ Episode archive cataloged {total} segments from {self.directory}")
+
+    def _catalog_add(self, info):
+        segments = self._catalog[info.stream]
+        segments.append(info)
+        if len(segments) > 1 and segments[-2].min_ts > info.min_ts:
+            segments.sort(key=lambda segment: segment.min_ts)
+
+    def segments(self, stream=None):
+        with self._lock:
+            if stream is not None:
+                return list(self._catalog.get(stream, ()))
+            return [info for segments in self._catalog.values() for info in segments]
+
+    def streams(self):
+        with self._lock:
+            return sorted(set(self._catalog) | {stream for stream, rows in self._buffers.items() if rows})
+
+    # --- Reads ---
+
+    @staticmethod
+    def _read_header(path):
+        with open(path, "rb") as f:
+            magic, version, length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not an episode archive segment")
+            return json.loads(f.read(length)), _PREAMBLE.size + length
+
+    @staticmethod
+    def _prune(info, module, tag, start, end):
+        return ((start is not None and info.max_ts < start) or (end is not None and info.min_ts > end)
+                or (module is not None and module not in info.modules) or (tag is not None and tag not in info.tags))
+
+    def _scan_segment(self, info, module, tag, start, end, keyword=None, with_payload=True):
+        header, base = self._read_header(info.path)
+        with open(info.path, "rb") as f:
+            f.seek(base)
+            data = f.read()
+
+        def column(name, dtype):
+            offset, length = header["columns"][name]
+            return np.frombuffer(data, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+
+        timestamps = column("timestamp", "<f8")
+        low = int(np.searchsorted(timestamps, start, side="left")) if start is not None else 0
+        high = int(np.searchsorted(timestamps, end, side="right")) if end is not None else len(timestamps)
+        mask = np.zeros(len(timestamps), dtype=bool)
+        mask[low:high] = True
+        if module is not None:
+            mask &= column("module", "<u4") == header["modules"].index(module)
+        if tag is not None:
+            tag_offsets = column("tag_offsets", "<u4")
+            hits = np.flatnonzero(column("tag_codes", "<u4") == header["tags"].index(tag))
+            tagged = np.zeros(len(timestamps), dtype=bool)
+            tagged[np.searchsorted(tag_offsets, hits, side="right") - 1] = True
+            mask &= tagged
+        rows = np.flatnonzero(mask)
+        if keyword and rows.size:
+            offset, length = header["columns"]["event"]
+            events = decompress(data[offset:offset + length], header["codec"])
+            event_offsets = column("event_offsets", "<u4")
+            rows = np.array([row for row in rows if keyword in
+                             events[event_offsets[row]:event_offsets[row + 1]].decode("utf-8").lower()], dtype=np.int64)
+        if not with_payload or not rows.size:
+            return timestamps[rows], [None] * rows.size
+        offset, length = header["columns"]["payload"]
+        payloads = decompress(data[offset:offset + length], header["codec"])
+        payload_offsets = column("payload_offsets", "<u4")
+        return timestamps[rows], [json.loads(payloads[payload_offsets[row]:payload_offsets[row + 1]]) for row in rows]
+
+    def _buffered(self, stream, module, tag, start, end, keyword=None):
+        rows = [row for row in self._buffers.get(stream, ())
+                if (module is None or row[1] == module) and (tag is None or tag in row[2])
+                and (start is None or row[0] >= start) and (end is None or row[0] <= end)
+                and (not keyword or keyword in row[3].lower())]
+        rows.sort(key=lambda row: row[0])
+        return rows
+
+    def scan(self, stream="episodes", module=None, tag=None, start=None, end=None, keyword=None):
+        """Yield (timestamp, record) for `stream` records matching module, tag, [start, end] and event keyword, in time order."""
+        start, end = _to_epoch(start), _to_epoch(end)
+        keyword = keyword.lower() if keyword else None
+        with self._lock:
+            segments = [info for info in self._catalog.get(stream, ()) if not self._prune(info, module, tag, start, end)]
+            pending = self._buffered(stream, module, tag, start, end, keyword)
+        # segments of one stream can overlap in time (one per partition per flush), so merge by timestamp
+        batches = [self._scan_segment(info, module, tag, start, end, keyword) for info in segments]
+        merged = [(ts, record) for timestamps, records in batches for ts, record in zip(timestamps.tolist(), records)]
+        merged.extend((row[0], json.loads(row[4])) for row in pending)
+        merged.sort(key=lambda item: item[0])
+        yield from merged
+
+    def query(self, stream="episodes", module=None, tag=None, start=None, end=None, keyword=None, limit=None):
+        """
+        Records of `stream` from `module` with `tag` between `start` and `end`
+        (epoch seconds, datetime or ISO string), oldest first; `keyword` matches
+        the event column case-insensitively and `limit` keeps the newest records.
+        """
+        records = [record for _, record in self.scan(stream, module=module, tag=tag, start=start, end=end, keyword=keyword)]
+        return records[-limit:] if limit else records
+
+    def count(self, stream="episodes", module=None, tag=None, start=None, end=None):
+        """Number of matching records, read from the columns alone (no payload decompression)."""
+        start, end = _to_epoch(start), _to_epoch(end)
+        with self._lock:
+            segments = [info for info in self._catalog.get(stream, ()) if not self._prune(info, module, tag, start, end)]
+            total = len(self._buffered(stream, module, tag, start, end))
+        for info in segments:
+            if (start is None or info.min_ts >= start) and (end is None or info.max_ts <= end) and module is None and tag is None:
+                total += info.count
+            else:
+                total += len(self._scan_segment(info, module, tag, start, end, with_payload=False)[0])
+        return total
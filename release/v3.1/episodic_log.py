@@ -0,0 +1,186 @@
+import threading
+import logging
+from collections import defaultdict, deque
+
+logger = logging.getLogger("ANGELA.EpisodicLog")
+
+_FIELD_SEP = "\x00"  # keeps matches inside one field, as str(v).lower() per value did
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramKeyIndex:
+    """
+    Lowercase substring index: trigram -> positions.
+    Keywords of three or more characters are answered by intersecting posting
+    sets and verifying the few candidates; shorter keywords fall back to a scan
+    of the pre-lowered texts, never to str()/lower() on the episodes themselves.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._texts = {}
+
+    def add(self, position, text):
+        self._texts[position] = text
+        for gram in _trigrams(text):
+            self._postings[gram].add(position)
+
+    def remove(self, position):
+        text = self._texts.pop(position, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(position)
+                if not postings:
+                    del self._postings[gram]
+
+    def text(self, position):
+        return self._texts.get(position)
+
+    def candidates(self, keyword):
+        grams = _trigrams(keyword)
+        if not grams:
+            return set(self._texts)
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for other in postings[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+
+class EpisodicLog:
+    """
+    Fixed-capacity episodic log for AGIEnhancer.
+    ---------------------------------
+    - Ring buffer of `capacity` episodes; appends and evictions are O(1)
+    - module -> positions and tag -> positions indexes answer replay queries
+      without scanning the log
+    - A TrigramKeyIndex over the lowercased event, meta values and tags
+      answers keyword search; each meta value is indexed up to
+      `meta_index_chars` characters, so large payloads don't bloat the
+      postings or the append path (deep search matches within that prefix)
+    - Evicted episodes leave memory only; AGIEnhancer's EpisodeArchive (on
+      by default) keeps the full history on disk
+    - Reads like a list: len(), iteration, indexing and slicing, oldest first
+    ---------------------------------
+    """
+
+    def __init__(self, capacity=20000, meta_index_chars=64):
+        self.capacity = capacity
+        self.meta_index_chars = meta_index_chars
+        self._entries = [None] * capacity
+        self._event_lengths = [0] * capacity
+        self._first = 0  # position of the oldest retained episode
+        self._next = 0   # position the next episode will take
+        self._by_module = defaultdict(deque)
+        self._by_tag = defaultdict(deque)
+        self._text_index = TrigramKeyIndex()
+        self._lock = threading.RLock()
+
+    # --- Writes ---
+
+    def append(self, entry):
+        with self._lock:
+            if self._next - self._first == self.capacity:
+                self._evict()
+            position = self._next
+            self._next += 1
+            slot = position % self.capacity
+            self._entries[slot] = entry
+            module = entry.get("module")
+            if module:
+                self._by_module[module].append(position)
+            for tag in dict.fromkeys(entry.get("tags") or []):
+                self._by_tag[tag].append(position)
+            event = str(entry.get("event", "")).lower()
+            self._event_lengths[slot] = len(event)
+            meta = entry.get("meta") or {}
+            self._text_index.add(position, _FIELD_SEP.join(
+                [event] + [str(value)[:self.meta_index_chars].lower() for value in meta.values()]
+                + [str(tag).lower() for tag in entry.get("tags") or []]
+            ))
+            return position
+
+    def _evict(self):
+        position = self._first
+        slot = position % self.capacity
+        entry = self._entries[slot]
+        self._first += 1
+        self._entries[slot] = None
+        self._drop_position(self._by_module, entry.get("module"), position)
+        for tag in dict.fromkeys(entry.get("tags") or []):
+            self._drop_position(self._by_tag, tag, position)
+        self._text_index.remove(position)
+
+    @staticmethod
+    def _drop_position(index, key, position):
+        positions = index.get(key)
+        if positions and positions[0] == position:
+            positions.popleft()
+            if not positions:
+                del index[key]
+
+    # --- Queries ---
+
+    def recent(self, n=5, module=None, tag=None):
+        """Last `n` episodes, optionally restricted to a module and/or tag, oldest first."""
+        with self._lock:
+            if not module and not tag:
+                return self[-n:] if n > 0 else []
+            by_module = self._by_module.get(module, ()) if module else None
+            by_tag = self._by_tag.get(tag, ()) if tag else None
+            # walk the shorter index newest-first and check the other condition on the entry
+            if by_tag is None or (by_module is not None and len(by_module) <= len(by_tag)):
+                positions, wanted = by_module, (lambda entry: tag in (entry.get("tags") or [])) if tag else None
+            else:
+                positions, wanted = by_tag, (lambda entry: entry.get("module") == module) if module else None
+            found = []
+            for position in reversed(positions):
+                if len(found) >= n:
+                    break
+                entry = self._entries[position % self.capacity]
+                if wanted is None or wanted(entry):
+                    found.append(entry)
+            return found[::-1]
+
+    def search(self, keyword, deep=False):
+        """
+        Episodes whose event (or, with `deep`, any meta value or tag) contains
+        `keyword`, case-insensitively; meta values match within their first
+        `meta_index_chars` characters.
+        """
+        keyword = keyword.lower()
+        with self._lock:
+            matches = []
+            for position in sorted(self._text_index.candidates(keyword)):
+                text = self._text_index.text(position)
+                slot = position % self.capacity
+                if keyword in (text if deep else text[:self._event_lengths[slot]]):
+                    matches.append(self._entries[slot])
+            return matches
+
+    # --- List-like reads ---
+
+    def __len__(self):
+        return self._next - self._first
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        with self._lock:
+            count = self._next - self._first
+            if isinstance(index, slice):
+                return [self._entries[(self._first + i) % self.capacity] for i in range(count)[index]]
+            if index < 0:
+                index += count
+            if not 0 <= index < count:
+                raise IndexError("episodic log index out of range")
+            return self._entries[(self._first + index) % self.capacity]
@@ -1,16 +1,12 @@
 import time
 import logging
-import hashlib
 from datetime import datetime
 from index import iota_intuition, nu_narrative, psi_resilience, phi_prioritization
 from toca_simulation import run_simulation
+from omega_state import Ω
+from ledger import get_ledger
 
 logger = logging.getLogger("ANGELA.ErrorRecovery")
-Ω = globals().get("Ω", {"timeline": [], "traits": {}, "symbolic_log": [], "timechain": []})
-
-def hash_failure(event):
-    raw = f"{event['timestamp']}{event['error']}{event.get('resolved', False)}"
-    return hashlib.sha256(raw.encode()).hexdigest()
 
 class ErrorRecovery:
     """
@@ -82,9 +78,8 @@ class ErrorRecovery:
             "error": error_message,
             "resolved": False
         }
-        prev_hash = Ω["timechain"][-1]["hash"] if Ω["timechain"] else ""
-        entry_hash = hash_failure(failure_entry)
-        Ω["timechain"].append({"event": failure_entry, "hash": entry_hash, "prev": prev_hash})
+        seq = get_ledger("timechain").append(failure_entry)
+        Ω["timechain"].append({"event": failure_entry, "ledger_seq": seq})
 
     def trace_failure_origin(self, error_message):
         for event in reversed(Ω.get("timeline", [])):
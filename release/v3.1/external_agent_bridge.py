@@ -1,4 +1,4 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from toca_simulation import run_simulation
 import logging
 import time
@@ -13,6 +13,7 @@ from index import (
 from external_agent_bridge import ExternalAgentBridge
 
 logger = logging.getLogger("ANGELA.MetaCognition")
+call_gpt = cached_call_gpt("external_agent_bridge")
 
 class MetaCognition:
     """
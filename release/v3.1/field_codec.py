@@ -0,0 +1,172 @@
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+import numpy as np
+from ledger import ledger_directory
+
+logger = logging.getLogger("ANGELA.FieldCodec")
+
+MAGIC = b"AFLD"
+VERSION = 1
+_HEADER = struct.Struct("<4sBcB")  # magic, version, dtype char, ndim
+_DTYPES = {"f": np.float32, "d": np.float64}
+_CODES = {np.dtype(np.float32): b"f", np.dtype(np.float64): b"d"}
+_FLOAT32 = np.finfo(np.float32)
+
+
+def storage_dtype(values):
+    """float32 unless some nonzero magnitude would underflow or overflow it (ToCA fields sit near 1e-63)."""
+    magnitudes = np.abs(np.asarray(values, dtype=np.float64))
+    magnitudes = magnitudes[np.isfinite(magnitudes) & (magnitudes > 0)]
+    if magnitudes.size and (magnitudes.min() < _FLOAT32.tiny or magnitudes.max() > _FLOAT32.max):
+        return np.dtype(np.float64)
+    return np.dtype(np.float32)
+
+
+def pack_field(values, dtype=None):
+    """Serialize an array as a shape/dtype header followed by its raw little-endian buffer."""
+    dtype = np.dtype(dtype) if dtype is not None else storage_dtype(values)
+    array = np.ascontiguousarray(values, dtype=dtype.newbyteorder("<"))
+    code = _CODES[dtype]
+    header = _HEADER.pack(MAGIC, VERSION, code, array.ndim) + struct.pack(f"<{array.ndim}Q", *array.shape)
+    return header + array.tobytes()
+
+
+def unpack_field(buffer):
+    """Read-only array view over a packed buffer; the payload is not copied."""
+    view = memoryview(buffer)
+    magic, version, code, ndim = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a packed field buffer")
+    shape = struct.unpack_from(f"<{ndim}Q", view, _HEADER.size)
+    dtype = np.dtype(_DTYPES[code.decode()]).newbyteorder("<")
+    offset = _HEADER.size + 8 * ndim
+    return np.frombuffer(view, dtype=dtype, offset=offset, count=int(np.prod(shape, dtype=np.int64))).reshape(shape)
+
+
+def summarize(values, digits=6):
+    """Compact statistics for a field, for prompts and logs in place of raw values."""
+    values = np.asarray(values)
+    if values.size == 0:
+        return {"shape": list(values.shape)}
+    stats = {
+        "mean": float(np.mean(values)),
+        "std": float(np.std(values)),
+        "min": float(np.min(values)),
+        "max": float(np.max(values)),
+    }
+    summary = {name: float(f"{value:.{digits}g}") for name, value in stats.items()}
+    summary["shape"] = list(values.shape)
+    return summary
+
+
+class FieldStore:
+    """
+    Side buffer store for raw simulation fields.
+    ---------------------------------
+    - Each field is packed once into a float32 buffer (float64 when the values
+      fall outside float32 range) with a shape/dtype header
+    - Records (Ω timeline, ledger, prompts) carry a small JSON-safe reference
+      with the key and summary statistics instead of the raw values
+    - Keys are content hashes of the packed buffer, so a reference means the
+      same array in every process and identical fields are stored once
+    - With `directory`, every buffer is also written to `<directory>/<key>.fld`;
+      the in-memory LRU (bounded by total bytes) is then only a cache and refs
+      kept in persisted ledgers still resolve after eviction or a restart
+    - get() returns a zero-copy, read-only view of the stored buffer
+    ---------------------------------
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = os.path.abspath(directory) if directory else None
+        self._buffers = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def put(self, values, dtype=None):
+        buffer = pack_field(values, dtype=dtype)
+        key = f"field-{hashlib.blake2b(buffer, digest_size=16).hexdigest()}"
+        with self._lock:
+            if key in self._buffers:
+                self._buffers.move_to_end(key)
+                return key
+        if self.directory:
+            self._write(key, buffer)
+        with self._lock:
+            self._cache_locked(key, buffer)
+        return key
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.fld")
+
+    def _write(self, key, buffer):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer)
+        os.replace(tmp, path)  # same key means same bytes, so a concurrent writer is harmless
+
+    def _cache_locked(self, key, buffer):
+        if key not in self._buffers:
+            self._buffers[key] = buffer
+            self._bytes += len(buffer)
+        while self._bytes > self.max_bytes and len(self._buffers) > 1:
+            _, evicted = self._buffers.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def get(self, key):
+        buffer = self.buffer(key)
+        return unpack_field(buffer) if buffer is not None else None
+
+    def buffer(self, key):
+        """The packed bytes (header + payload), read back from disk after eviction."""
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                self._buffers.move_to_end(key)
+                return buffer
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                buffer = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._cache_locked(key, buffer)
+        return buffer
+
+    def ref(self, values, dtype=None):
+        """Store `values` and return its reference: key, storage dtype and summary statistics."""
+        values = np.asarray(values)
+        dtype = np.dtype(dtype) if dtype is not None else storage_dtype(values)
+        return {
+            "field": self.put(values, dtype=dtype),
+            "dtype": dtype.name,
+            "summary": summarize(values),
+        }
+
+    def resolve(self, ref):
+        return self.get(ref["field"]) if isinstance(ref, dict) and "field" in ref else None
+
+    def stats(self):
+        with self._lock:
+            return {"fields": len(self._buffers), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+def _default_directory():
+    directory = ledger_directory()
+    return os.path.join(directory, "fields") if directory else None
+
+
+# buffers live next to the ledgers whose records reference them
+field_store = FieldStore(directory=_default_directory())
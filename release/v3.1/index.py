@@ -12,12 +12,20 @@ import numpy as np
 import time
 import datetime
 import json
+import hashlib
+import threading
+import uuid
+import concurrent.futures
+from collections import Counter, defaultdict, deque, namedtuple
+from itertools import islice
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 from self_cloning_llm import SelfCloningLLM
-from memory_manager import MemoryManager
+from memory_manager import acquire_memory_manager, release_memory_manager
 from learning_loop import track_trait_performance
 from alignment_guard import ethical_check
 from meta_cognition import MetaCognition
+from theory_of_mind import TheoryOfMindModule
 
 meta_cognition = MetaCognition(agi_enhancer=learning_loop)
 
@@ -79,6 +87,79 @@ def phi_field(x, t):
         psi_history(t), zeta_spirituality(t), xi_collective(t, x), tau_timeperception(t)
     ])
 
+TRAIT_FUNCTIONS = (
+    "epsilon_emotion", "beta_concentration", "theta_memory", "gamma_creativity",
+    "delta_sleep", "mu_morality", "iota_intuition", "phi_physical", "eta_empathy",
+    "omega_selfawareness", "kappa_culture", "lambda_linguistics", "chi_culturevolution",
+    "psi_history", "zeta_spirituality", "xi_collective", "tau_timeperception"
+)
+
+_TRAIT_CALLABLES = {name: globals()[name] for name in TRAIT_FUNCTIONS}
+_SPATIAL_TRAITS = frozenset(("kappa_culture", "xi_collective"))
+
+class TraitBank:
+    """
+    Vectorized ToCA trait field evaluation
+    ---------------------------------
+    - evaluate(t, x) computes every trait for arrays of timestamps (and x) in
+      one NumPy pass and returns a structured array with one field per trait
+      function plus the summed "phi_field"
+    - snapshot(t, x) is the scalar path for a single t: a pipeline stage takes
+      one snapshot and passes the dict down instead of each module
+      re-evaluating the trait functions
+    - Values match the scalar trait functions above
+    ---------------------------------
+    """
+
+    DTYPE = np.dtype([(name, np.float64) for name in TRAIT_FUNCTIONS] + [("phi_field", np.float64)])
+
+    def evaluate(self, t, x=0.0):
+        t, x = np.broadcast_arrays(np.asarray(t, dtype=np.float64), np.asarray(x, dtype=np.float64))
+        out = np.empty(t.shape, dtype=self.DTYPE)
+        two_pi_t = 2 * np.pi * t
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            out["epsilon_emotion"] = 0.2 * np.sin(two_pi_t / 0.1)
+            out["beta_concentration"] = 0.15 * np.cos(two_pi_t / 0.038)
+            out["theta_memory"] = 0.1 * np.sin(two_pi_t / 0.5)
+            out["gamma_creativity"] = 0.1 * np.cos(two_pi_t / 0.02)
+            out["delta_sleep"] = 0.05 * (1 - np.exp(-t / 1e-21))
+            out["mu_morality"] = 0.05 * (1 + np.tanh(t / 1e-19))
+            out["iota_intuition"] = 0.05 * np.exp(-t / 1e-19)
+            out["phi_physical"] = 0.1 * np.sin(two_pi_t / 0.05)
+            out["eta_empathy"] = 0.05 * (1 - np.exp(-t / 1e-20))
+            out["omega_selfawareness"] = 0.05 * (t / 1e-19) / (1 + t / 1e-19)
+            out["kappa_culture"] = 0.05 * np.cos(two_pi_t / 0.5 + x / 1e-21)
+            out["lambda_linguistics"] = 0.05 * np.sin(two_pi_t / 0.3)
+            out["chi_culturevolution"] = 0.05 * np.log(1 + t / 1e-19)
+            out["psi_history"] = 0.05 * np.tanh(t / 1e-18)
+            out["zeta_spirituality"] = 0.05 * np.cos(two_pi_t / 1.0)
+            out["xi_collective"] = 0.05 * np.sin(two_pi_t / 0.7 + x / 1e-21)
+            out["tau_timeperception"] = 0.05 * np.exp(-t / 1e-18)
+        # same summation order as phi_field() so scalar and vector paths agree
+        total = np.zeros(t.shape, dtype=np.float64)
+        for name in TRAIT_FUNCTIONS:
+            total += out[name]
+        out["phi_field"] = total
+        return out
+
+    def snapshot(self, t=None, x=0.0, names=None):
+        """Trait readings at (t, x) keyed by trait function name.
+
+        t defaults to the current trait clock. ``names`` limits the readings to
+        a subset; "phi_field" is only included in a full snapshot.
+        """
+        if t is None:
+            t = time.time() % 1e-18
+        readings = {}
+        for name in (TRAIT_FUNCTIONS if names is None else names):
+            fn = _TRAIT_CALLABLES[name]
+            readings[name] = fn(t, x) if name in _SPATIAL_TRAITS else fn(t)
+        if names is None:
+            readings["phi_field"] = sum(readings[name] for name in TRAIT_FUNCTIONS)
+        return readings
+
+trait_bank = TraitBank()
+
 TRAIT_OVERLAY = {
     "ϕ": ["creative_thinker", "concept_synthesizer"],
     "θ": ["reasoning_engine", "recursive_planner"],
@@ -124,23 +205,68 @@ class TraitOverlayManager:
         return self.active_trait
 
 class ConsensusReflector:
-    def __init__(self):
-        self.shared_reflections = []
+    """
+    Shared reflection pool with incrementally maintained disagreement index.
+    goal -> theory-of-mind fingerprint -> agent counts is updated on every
+    post and eviction, together with a count of mismatching (earlier agent,
+    later agent, goal) pairs, so cross_compare() is a read of that set.
+    """
+
+    def __init__(self, max_reflections=1000):
+        self.max_reflections = max_reflections
+        self.shared_reflections = deque()
+        self._fingerprints = deque()
+        self._by_goal = {}  # goal -> {fingerprint: Counter(agent)}
+        self._mismatches = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(theory_of_mind):
+        encoded = json.dumps(theory_of_mind, sort_keys=True, default=repr)
+        return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).digest()
 
     def post_reflection(self, feedback):
-        self.shared_reflections.append(feedback)
-        if len(self.shared_reflections) > 1000:
-            self.shared_reflections.pop(0)
+        fingerprint = self._fingerprint(feedback['theory_of_mind'])
+        with self._lock:
+            if len(self.shared_reflections) >= self.max_reflections:
+                self._evict(self.shared_reflections.popleft(), self._fingerprints.popleft())
+            goal, agent = feedback['goal'], feedback['agent']
+            views = self._by_goal.setdefault(goal, {})
+            mismatches = self._mismatches
+            for other, agents in views.items():
+                if other != fingerprint:
+                    for peer, count in agents.items():
+                        pair = (peer, agent, goal)
+                        mismatches[pair] = mismatches.get(pair, 0) + count
+            views.setdefault(fingerprint, Counter())[agent] += 1
+            self.shared_reflections.append(feedback)
+            self._fingerprints.append(fingerprint)
+
+    def _evict(self, feedback, fingerprint):
+        # the evicted reflection is older than every remaining one, so it is always the first agent of its pairs
+        goal, agent = feedback['goal'], feedback['agent']
+        views = self._by_goal[goal]
+        views[fingerprint][agent] -= 1
+        if not views[fingerprint][agent]:
+            del views[fingerprint][agent]
+            if not views[fingerprint]:
+                del views[fingerprint]
+        if not views:
+            del self._by_goal[goal]
+        mismatches = self._mismatches
+        for other, agents in views.items():
+            if other != fingerprint:
+                for peer, count in agents.items():
+                    pair = (agent, peer, goal)
+                    remaining = mismatches[pair] - count
+                    if remaining > 0:
+                        mismatches[pair] = remaining
+                    else:
+                        del mismatches[pair]
 
     def cross_compare(self):
-        mismatches = []
-        for i in range(len(self.shared_reflections)):
-            for j in range(i+1, len(self.shared_reflections)):
-                a = self.shared_reflections[i]
-                b = self.shared_reflections[j]
-                if a['goal'] == b['goal'] and a['theory_of_mind'] != b['theory_of_mind']:
-                    mismatches.append((a['agent'], b['agent'], a['goal']))
-        return mismatches
+        with self._lock:
+            return list(self._mismatches)
 
     def suggest_alignment(self):
         return "Schedule inter-agent reflection or re-observation."
@@ -148,65 +274,327 @@ class ConsensusReflector:
 consensus_reflector = ConsensusReflector()
 
 class SymbolicSimulator:
-    def __init__(self):
-        self.events = []
+    """
+    Bounded symbolic event store.
+    Events carry a global sequence number ("offset"); the oldest are evicted
+    past `max_events`. The semantics line for each event is formatted once on
+    record, and per-agent / per-goal offset indexes are kept alongside, so
+    feedback can reference the view by offset instead of copying it.
+    """
+
+    def __init__(self, max_events=10000):
+        self.max_events = max_events
+        self.events = deque()
+        self._semantics = deque()
+        self._base = 0
+        self._by_agent = defaultdict(deque)
+        self._by_goal = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    @property
+    def next_offset(self):
+        return self._base + len(self.events)
 
     def record_event(self, agent_name, goal, concept, simulation):
-        self.events.append({
-            "agent": agent_name,
-            "goal": goal,
-            "concept": concept,
-            "result": simulation
-        })
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self._evict()
+            offset = self.next_offset
+            self.events.append({
+                "offset": offset,
+                "agent": agent_name,
+                "goal": goal,
+                "concept": concept,
+                "result": simulation
+            })
+            self._semantics.append(f"Agent {agent_name} pursued '{goal}' via '{concept}' → {simulation}")
+            self._by_agent[agent_name].append(offset)
+            self._by_goal[goal].append(offset)
+            return offset
+
+    def _evict(self):
+        event = self.events.popleft()
+        self._semantics.popleft()
+        self._base += 1
+        for index, key in ((self._by_agent, event["agent"]), (self._by_goal, event["goal"])):
+            offsets = index[key]
+            offsets.popleft()
+            if not offsets:
+                del index[key]
+
+    def _resolve(self, offsets, limit):
+        offsets = list(offsets)[-limit:] if limit else list(offsets)
+        return [self.events[offset - self._base] for offset in offsets]
 
     def summarize_recent(self, limit=5):
-        return self.events[-limit:]
+        with self._lock:
+            return list(islice(self.events, max(0, len(self.events) - limit), None))
+
+    def events_for_agent(self, agent_name, limit=None):
+        with self._lock:
+            return self._resolve(self._by_agent.get(agent_name, ()), limit)
 
-    def extract_semantics(self):
-        return [f"Agent {e['agent']} pursued '{e['goal']}' via '{e['concept']}' → {e['result']}" for e in self.events]
+    def events_for_goal(self, goal, limit=None):
+        with self._lock:
+            return self._resolve(self._by_goal.get(goal, ()), limit)
+
+    def extract_semantics(self, start=None, end=None):
+        """Semantics lines for retained events with start <= offset < end."""
+        with self._lock:
+            start = self._base if start is None else max(start, self._base)
+            end = self.next_offset if end is None else min(end, self.next_offset)
+            return list(islice(self._semantics, start - self._base, max(start, end) - self._base))
 
 symbolic_simulator = SymbolicSimulator()
 
+PerceptionSnapshot = namedtuple("PerceptionSnapshot", ["agent", "tick", "seq", "timestamp", "observations"])
+
+class PerceptionBus:
+    """
+    Per-tick perception snapshots
+    ---------------------------------
+    - Each agent's sensors are read at most once per tick; the observations are
+      published as an immutable snapshot (read-only mapping)
+    - Peers read snapshots instead of re-running each other's sensors, so sensor
+      I/O per goal is linear in the number of agents
+    - A snapshot is fresh while it is at most `max_staleness` ticks old and,
+      when `max_age` is set, at most `max_age` seconds old
+    - HaloEmbodimentLayer advances the tick once per propagated goal
+    ---------------------------------
+    """
+
+    def __init__(self, max_staleness=0, max_age=None):
+        self.max_staleness = max_staleness
+        self.max_age = max_age
+        self.tick = 0
+        self._seq = 0
+        self._snapshots = {}
+        self._capture_locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def advance(self):
+        with self._lock:
+            self.tick += 1
+            return self.tick
+
+    def publish(self, agent_name, observations):
+        with self._lock:
+            self._seq += 1
+            snapshot = PerceptionSnapshot(agent_name, self.tick, self._seq, time.time(), MappingProxyType(dict(observations)))
+            self._snapshots[agent_name] = snapshot
+        return snapshot
+
+    def latest(self, agent_name, max_staleness=None, max_age=None):
+        """The agent's last snapshot if it is still fresh, else None."""
+        snapshot = self._snapshots.get(agent_name)
+        if snapshot is None:
+            return None
+        max_staleness = self.max_staleness if max_staleness is None else max_staleness
+        max_age = self.max_age if max_age is None else max_age
+        if self.tick - snapshot.tick > max_staleness:
+            return None
+        if max_age is not None and time.time() - snapshot.timestamp > max_age:
+            return None
+        return snapshot
+
+    def capture(self, agent, max_staleness=None, max_age=None):
+        """Fresh snapshot for `agent`, reading its sensors only if none exists yet."""
+        snapshot = self.latest(agent.name, max_staleness, max_age)
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            capture_lock = self._capture_locks[agent.name]
+        with capture_lock:
+            snapshot = self.latest(agent.name, max_staleness, max_age)
+            if snapshot is None:
+                snapshot = self.publish(agent.name, agent.read_sensors())
+        return snapshot
+
+    def forget(self, agent_name):
+        with self._lock:
+            self._snapshots.pop(agent_name, None)
+            self._capture_locks.pop(agent_name, None)
+
+# agents outside a HaloEmbodimentLayer have no tick driver, so snapshots expire by age
+default_perception_bus = PerceptionBus(max_age=0.5)
+
+class EngineServices:
+    """
+    Lazily built, shareable engine services
+    ---------------------------------
+    - Engines are constructed on first use and then shared by every agent
+      (and planner) wired to this container
+    - The planner and simulation core are built with the container's own
+      reasoner, meta-cognition, alignment guard and visualizer injected, so no
+      engine builds a private copy of another
+    - Pass ready-made engines as keyword arguments to override any of them
+    - Per-agent state (theory of mind, progress, history, feedback) stays on the agent
+    - Engines are not thread-safe: sequential runs share one container, while
+      each parallel propagate_goal worker thread gets a container of its own
+    ---------------------------------
+    """
+
+    def __init__(self, **engines):
+        self._engines = dict(engines)
+        self._lock = threading.RLock()
+
+    def _get(self, name, build):
+        engine = self._engines.get(name)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(name)
+                if engine is None:
+                    engine = self._engines[name] = build()
+        return engine
+
+    @property
+    def reasoner(self):
+        return self._get("reasoner", reasoning_engine.ReasoningEngine)
+
+    @property
+    def meta(self):
+        return self._get("meta", meta_cognition.MetaCognition)
+
+    @property
+    def alignment_guard(self):
+        return self._get("alignment_guard", alignment_guard.AlignmentGuard)
+
+    @property
+    def visualizer(self):
+        return self._get("visualizer", visualizer.Visualizer)
+
+    @property
+    def sim_core(self):
+        return self._get("sim_core", lambda: simulation_core.SimulationCore(visualizer=self.visualizer))
+
+    @property
+    def planner(self):
+        return self._get("planner", lambda: recursive_planner.RecursivePlanner(
+            reasoning_engine=self.reasoner,
+            meta_cognition=self.meta,
+            alignment_guard=self.alignment_guard,
+            simulation_core=self.sim_core
+        ))
+
+    @property
+    def synthesizer(self):
+        return self._get("synthesizer", concept_synthesizer.ConceptSynthesizer)
+
+    @property
+    def toca_sim(self):
+        return self._get("toca_sim", toca_simulation.TocaSimulation)
+
+    def built(self):
+        return sorted(self._engines)
+
+    def close(self):
+        """Close every built engine that holds resources (e.g. a shared memory store)."""
+        with self._lock:
+            engines, self._engines = list(self._engines.values()), {}
+        for engine in engines:
+            close = getattr(engine, "close", None)
+            if callable(close):
+                close()
+
+default_engine_services = EngineServices()
+
+class _LazyEngine:
+    """Agent attribute built on first access; assigning the attribute overrides it."""
+
+    def __init__(self, build):
+        self.build = build
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        engine = agent.__dict__[self.name] = self.build(agent)
+        return engine
+
+class _ServiceEngine:
+    """Agent attribute read from the agent's current EngineServices; assigning the attribute overrides it."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        return getattr(agent.services, self.name)
+
 class EmbodiedAgent:
-    def __init__(self, name, specialization, shared_memory, sensors, actuators, dynamic_modules=None):
+    # shared engines come from the agent's EngineServices, looked up on every access so a
+    # parallel run can point the agent at its worker's own services
+    reasoner = _ServiceEngine()
+    planner = _ServiceEngine()
+    sim_core = _ServiceEngine()
+    synthesizer = _ServiceEngine()
+    toca_sim = _ServiceEngine()
+    # diagnostics history is per agent, so each agent gets its own MetaCognition
+    meta = _LazyEngine(lambda agent: meta_cognition.MetaCognition())
+
+    def __init__(self, name, specialization, shared_memory, sensors, actuators, dynamic_modules=None, services=None,
+                 perception_bus=None):
         self.name = name
         self.specialization = specialization
         self.shared_memory = shared_memory
         self.sensors = sensors
         self.actuators = actuators
         self.dynamic_modules = dynamic_modules or []
-        self.reasoner = reasoning_engine.ReasoningEngine()
-        self.planner = recursive_planner.RecursivePlanner()
-        self.meta = meta_cognition.MetaCognition()
-        self.sim_core = simulation_core.SimulationCore()
-        self.synthesizer = concept_synthesizer.ConceptSynthesizer()
-        self.toca_sim = toca_simulation.TocaSimulation()
+        self.services = services or default_engine_services
+        self.perception_bus = perception_bus or default_perception_bus
         self.theory_of_mind = TheoryOfMindModule()
+        self._ingested = {}  # agent name -> seq of the last snapshot folded into theory of mind
         self.progress = 0
         self.performance_history = []
         self.feedback_log = []
 
-    def perceive(self):
+    def read_sensors(self):
         observations = {}
         for sensor_name, sensor_func in self.sensors.items():
             try:
                 observations[sensor_name] = sensor_func()
             except Exception:
                 pass
-        self.theory_of_mind.update_beliefs(self.name, observations)
-        self.theory_of_mind.infer_desires(self.name)
-        self.theory_of_mind.infer_intentions(self.name)
         return observations
 
-    def execute_embodied_goal(self, goal):
+    def _ingest(self, *snapshots):
+        """Fold new snapshots into theory of mind in one batched update; already-seen snapshots are skipped."""
+        fresh = {}
+        for snapshot in snapshots:
+            if self._ingested.get(snapshot.agent) != snapshot.seq:
+                self._ingested[snapshot.agent] = snapshot.seq
+                fresh[snapshot.agent] = snapshot.observations
+        if fresh:
+            self.theory_of_mind.update_batch(fresh)
+
+    def perceive(self):
+        snapshot = self.perception_bus.capture(self)
+        self._ingest(snapshot)
+        return dict(snapshot.observations)
+
+    def observe_peers(self):
+        self._ingest(*(
+            self.perception_bus.capture(peer)
+            for peer in getattr(self.shared_memory, "agents", [])
+            if peer.name != self.name
+        ))
+
+    def execute_embodied_goal(self, goal, commit=True, cancel_event=None):
+        """
+        Plan and simulate `goal`; with commit=False the caller stores the returned plan in shared memory.
+        `cancel_event` is checked between tasks: once it is set the agent stops and
+        returns None without recording events, history or feedback.
+        """
+        def cancelled():
+            return cancel_event is not None and cancel_event.is_set()
+
+        if cancelled():
+            return None
         context = self.perceive()
-        if hasattr(self.shared_memory, "agents"):
-            for peer in self.shared_memory.agents:
-                if peer.name != self.name:
-                    peer_obs = peer.perceive()
-                    self.theory_of_mind.update_beliefs(peer.name, peer_obs)
-                    self.theory_of_mind.infer_desires(peer.name)
-                    self.theory_of_mind.infer_intentions(peer.name)
+        self.observe_peers()
         peer_models = [
             self.theory_of_mind.get_model(peer.name)
             for peer in getattr(self.shared_memory, "agents", [])
@@ -221,13 +609,17 @@ class EmbodiedAgent:
         sub_tasks = self.planner.plan(goal, context)
         action_plan = {}
         for task in sub_tasks:
+            if cancelled():
+                return None
             reasoning = self.reasoner.process(task, context)
             concept = self.synthesizer.synthesize([goal, task], style="concept")
 
             # Hybrid reasoning switch
-            hybrid_state = simulation_core.HybridCognitiveState()
+            hybrid_state = simulation_core.HybridCognitiveState(self.services)
             simulated = hybrid_state.execute(reasoning, context)
 
+            if cancelled():
+                return None
             symbolic_simulator.record_event(self.name, goal, concept, simulated)
             action_plan[task] = {
                 "reasoning": reasoning,
@@ -236,79 +628,74 @@ class EmbodiedAgent:
             }
 
         self.meta.review_reasoning("\n".join([v["reasoning"] for v in action_plan.values()]))
+        if cancelled():
+            return None
         self.performance_history.append({"goal": goal, "actions": action_plan, "completion": self.progress})
-        self.shared_memory.store(goal, action_plan)
+        if commit:
+            self.shared_memory.store(goal, action_plan)
         self.collect_feedback(goal, action_plan)
+        return action_plan
 
     def collect_feedback(self, goal, action_plan):
         t = time.time()
         feedback = {
             "timestamp": t,
             "goal": goal,
-            "score": self.meta.run_self_diagnostics(),
+            "score": self.meta.run_self_diagnostics(traits=trait_bank.snapshot(t % 1e-18, x=1e-21)),
             "traits": phi_field(x=0.001, t=t % 1e-18),
             "agent": self.name,
-            "cultural_feedback": symbolic_simulator.extract_semantics(),
+            # resolve with symbolic_simulator.extract_semantics(end=...) instead of copying the whole view
+            "cultural_feedback_offset": symbolic_simulator.next_offset,
             "theory_of_mind": self.theory_of_mind.get_model(self.name)
         }
         self.feedback_log.append(feedback)
 
-class TheoryOfMindModule:
-    def __init__(self):
-        self.models = {}
-
-    def update_beliefs(self, agent_name, observation):
-        model = self.models.get(agent_name, {"beliefs": {}, "desires": {}, "intentions": {}})
-        if "location" in observation:
-            previous = model["beliefs"].get("location")
-            if previous and observation["location"] == previous:
-                model["beliefs"]["state"] = "confused"
-            else:
-                model["beliefs"]["state"] = "moving"
-            model["beliefs"]["location"] = observation["location"]
-        self.models[agent_name] = model
-
-    def infer_desires(self, agent_name):
-        model = self.models.get(agent_name, {})
-        beliefs = model.get("beliefs", {})
-        if beliefs.get("state") == "confused":
-            model["desires"]["goal"] = "seek_clarity"
-        elif beliefs.get("state") == "moving":
-            model["desires"]["goal"] = "continue_task"
-        self.models[agent_name] = model
-
-    def infer_intentions(self, agent_name):
-        model = self.models.get(agent_name, {})
-        desires = model.get("desires", {})
-        if desires.get("goal") == "seek_clarity":
-            model["intentions"]["next_action"] = "ask_question"
-        elif desires.get("goal") == "continue_task":
-            model["intentions"]["next_action"] = "advance"
-        self.models[agent_name] = model
-
-    def get_model(self, agent_name):
-        return self.models.get(agent_name, {})
-
 class HaloEmbodimentLayer:
     def __init__(self):
         self.internal_llm = SelfCloningLLM()
         self.internal_llm.clone_agents(5)
-        self.shared_memory = memory_manager.MemoryManager()
+        self.shared_memory = acquire_memory_manager()
         self.embodied_agents = []
         self.dynamic_modules = []
         self.alignment_layer = alignment_guard.AlignmentGuard()
+        self.engine_services = EngineServices(alignment_guard=self.alignment_layer)
+        self.perception_bus = PerceptionBus()
         self.agi_enhancer = AGIEnhancer(self)
+        self.agent_workers = 8  # bound for concurrent propagate_goal
+        self._agent_pool = None
+        self._pool_lock = threading.Lock()
+        self._worker_engines = threading.local()
+
+    def close(self):
+        """Stop the agent pool, close owned engines and release the shared memory store."""
+        with self._pool_lock:
+            pool, self._agent_pool = self._agent_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self.engine_services.close()
+        self.agi_enhancer.close()
+        if self.shared_memory is not None:
+            release_memory_manager(self.shared_memory)
+            self.shared_memory = None
 
     def execute_pipeline(self, prompt):
-        log = MemoryManager()
+        run_id = f"Pipeline_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        stages = []
+
+        def record(stage, data):
+            stages.append({"stage": stage, **data})
+            self.shared_memory.store(f"{run_id}_{stage}", data, layer="STM", intent="pipeline", agent="HaloEmbodimentLayer")
+
         traits = {
             "theta_causality": 0.5,
             "alpha_attention": 0.5,
             "delta_reflection": 0.5,
         }
 
-        parsed_prompt = reasoning_engine.decompose(prompt)
-        log.record("Stage 1", {"input": prompt, "parsed": parsed_prompt})
+        # one trait reading for the stage, shared with every module it calls
+        stage_traits = {**trait_bank.snapshot(), **traits}
+        parsed_prompt = reasoning_engine.decompose(prompt, context={"traits": stage_traits})
+        record("Stage 1", {"input": prompt, "parsed": parsed_prompt})
 
         overlay_mgr = TraitOverlayManager()
         trait_override = overlay_mgr.detect(prompt)
@@ -336,22 +723,22 @@ class HaloEmbodimentLayer:
             )
 
         ethics_pass, ethics_report = ethical_check(parsed_prompt, stage="pre")
-        log.record("Stage 2", {"ethics_pass": ethics_pass, "details": ethics_report})
+        record("Stage 2", {"ethics_pass": ethics_pass, "details": ethics_report})
         if not ethics_pass:
             return {"error": "Ethical validation failed", "report": ethics_report}
 
-        log.record("Stage 3", {"expanded": logical_output})
+        record("Stage 3", {"expanded": logical_output})
 
-        traits = track_trait_performance(log.export(), traits)
-        log.record("Stage 4", {"adjusted_traits": traits})
+        traits = track_trait_performance(stages, traits)
+        record("Stage 4", {"adjusted_traits": traits})
 
         ethics_pass, final_report = ethical_check(logical_output, stage="post")
-        log.record("Stage 5", {"ethics_pass": ethics_pass, "report": final_report})
+        record("Stage 5", {"ethics_pass": ethics_pass, "report": final_report})
         if not ethics_pass:
             return {"error": "Post-check ethics fail", "final_report": final_report}
 
         final_output = reasoning_engine.reconstruct(logical_output)
-        log.record("Stage 6", {"final_output": final_output})
+        record("Stage 6", {"final_output": final_output})
         return final_output
 
     def spawn_embodied_agent(self, specialization, sensors, actuators):
@@ -362,7 +749,9 @@ class HaloEmbodimentLayer:
             shared_memory=self.shared_memory,
             sensors=sensors,
             actuators=actuators,
-            dynamic_modules=self.dynamic_modules
+            dynamic_modules=self.dynamic_modules,
+            services=self.engine_services,
+            perception_bus=self.perception_bus
         )
         self.embodied_agents.append(agent)
 
@@ -397,7 +786,15 @@ class HaloEmbodimentLayer:
         else:
             print("✅ Consensus achieved among agents.")
 
-    def propagate_goal(self, goal):
+    def propagate_goal(self, goal, parallel=False, agent_timeout=None):
+        """
+        Send `goal` to the internal LLM agents and every embodied agent.
+        With parallel=True embodied agents run on a pool of `agent_workers`
+        threads, each bounded by `agent_timeout` seconds; results come back in
+        spawn order and shared-memory commits happen on the calling thread;
+        each worker thread uses its own EngineServices. Sequential runs share
+        the agents' engines and let agent exceptions propagate.
+        """
         print(f"📥 [HaloEmbodimentLayer] Propagating goal: {goal}")
         print("🧪 [HaloEmbodimentLayer] Internal LLM agent reflections:")
         llm_responses = self.internal_llm.broadcast_prompt(goal)
@@ -411,16 +808,100 @@ class HaloEmbodimentLayer:
                 tags=["internal_llm"]
             )
 
-        for agent in self.embodied_agents:
-            agent.execute_embodied_goal(goal)
-            print(f"📊 [{agent.name}] Progress: {agent.progress}% Complete")
+        agents = list(self.embodied_agents)
+        self.perception_bus.advance()  # one perception tick per goal
+        if parallel and len(agents) > 1:
+            results = self._run_agents_concurrently(agents, goal, agent_timeout)
+            # commits happen here, one at a time and in spawn order, whatever order agents finished in
+            for result in results:
+                if result["status"] == "ok":
+                    self.shared_memory.store(goal, result["actions"])
+                print(f"📊 [{result['agent']}] Progress: {result['progress']}% Complete ({result['status']})")
+        else:
+            # sequential agents commit as they go and their exceptions propagate to the caller
+            results = []
+            for agent in agents:
+                actions = agent.execute_embodied_goal(goal)
+                results.append({"agent": agent.name, "status": "ok", "actions": actions, "progress": agent.progress})
+                print(f"📊 [{agent.name}] Progress: {agent.progress}% Complete")
 
         self.agi_enhancer.log_episode(
             event="Propagated goal",
-            meta={"goal": goal},
+            meta={"goal": goal, "parallel": parallel,
+                  "statuses": {result["agent"]: result["status"] for result in results}},
             module="Ecosystem",
             tags=["goal"]
         )
+        return results
+
+    def _worker_services(self):
+        """This pool thread's own EngineServices, so parallel agents never share an engine."""
+        services = getattr(self._worker_engines, "services", None)
+        if services is None:
+            services = self._worker_engines.services = EngineServices(alignment_guard=self.alignment_layer)
+        return services
+
+    def _run_agent(self, agent, goal, cancel_event=None):
+        shared_services, agent.services = agent.services, self._worker_services()
+        try:
+            actions = agent.execute_embodied_goal(goal, commit=False, cancel_event=cancel_event)
+            if actions is None:
+                return {"agent": agent.name, "status": "timeout", "progress": agent.progress}
+            return {"agent": agent.name, "status": "ok", "actions": actions, "progress": agent.progress}
+        except Exception as e:
+            print(f"⚠️ [{agent.name}] Failed goal '{goal}': {e}")
+            return {"agent": agent.name, "status": "error", "error": str(e), "progress": agent.progress}
+        finally:
+            agent.services = shared_services
+
+    def _agent_executor(self):
+        with self._pool_lock:
+            if self._agent_pool is None:
+                self._agent_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.agent_workers, thread_name_prefix="embodied-agent"
+                )
+            return self._agent_pool
+
+    def _run_agents_concurrently(self, agents, goal, agent_timeout=None):
+        """
+        Run agents on the bounded pool and collect results in spawn order.
+        `agent_timeout` counts from when an agent starts running, not from when
+        it was queued; a timed-out agent is reported and never committed, and
+        its cancel event stops it at the next task boundary so the abandoned
+        run does not keep mutating agent state.
+        """
+        started = {}
+        cancel_events = [threading.Event() for _ in agents]
+
+        def run(index, agent):
+            started[index] = time.monotonic()
+            return self._run_agent(agent, goal, cancel_events[index])
+
+        pool = self._agent_executor()
+        futures = {pool.submit(run, index, agent): index for index, agent in enumerate(agents)}
+        results = [None] * len(agents)
+        pending = set(futures)
+        while pending:
+            wait_for = None
+            if agent_timeout is not None:
+                now = time.monotonic()
+                deadlines = [started[futures[f]] + agent_timeout for f in pending if futures[f] in started]
+                wait_for = max(0.0, min(deadlines) - now) if deadlines else agent_timeout
+            done, pending = concurrent.futures.wait(pending, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            if agent_timeout is not None:
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] >= agent_timeout:
+                        pending.discard(future)
+                        cancel_events[index].set()
+                        future.cancel()
+                        agent = agents[index]
+                        print(f"⏰ [{agent.name}] Timed out after {agent_timeout}s on goal '{goal}'")
+                        results[index] = {"agent": agent.name, "status": "timeout", "progress": agent.progress}
+        return results
 
     def deploy_dynamic_module(self, module_blueprint):
         print(f"🛠 [HaloEmbodimentLayer] Deploying module: {module_blueprint['name']}")
@@ -473,9 +954,12 @@ class TraitOverlayManager:
 
 # Placeholder for HybridCognitiveState
 class HybridCognitiveState:
+    def __init__(self, services=None):
+        self.services = services or default_engine_services
+
     def execute(self, reasoning, context):
         # Placeholder for mixed symbolic + vector evaluation
-        symbolic = simulation_core.SimulationCore().run(reasoning, context)
+        symbolic = self.services.sim_core.run(reasoning, context)
         vectorized = multi_modal_fusion.vector_simulate(reasoning, context)
         return {
             "symbolic_result": symbolic,
@@ -499,18 +983,155 @@ print("✅ ANGELA upgrade complete: Trait overlays (π, η) + hybrid-mode simula
 
 import random
 import datetime
+import threading
+import atexit
+import functools
+import os
+import weakref
 from typing import List, Dict, Any, Optional
+from episodic_log import EpisodicLog
+from episode_archive import EpisodeArchive, default_archive_directory
+
+def _close_journal(ref):
+    journal = ref()
+    if journal is not None:
+        journal.close()
+
+
+def _run_journal_flusher(ref):
+    # holds the journal only while waiting/flushing, so an abandoned journal can be collected
+    while True:
+        journal = ref()
+        if journal is None or not journal._wait_for_batch():
+            return
+        journal.flush()
+        del journal
+
+
+class EpisodeJournal:
+    """
+    Write-behind journal for AGIEnhancer episodes.
+    Entries are buffered in memory and appended to a JSONL file by a background
+    flusher once `batch_size` entries are pending or `flush_interval` seconds
+    have passed. The file is rotated like a RotatingFileHandler once it would
+    pass `max_bytes`, keeping `backups` old files (`<path>.1` is the newest).
+    Pending entries are flushed on `close()`, when the journal is collected,
+    and at interpreter shutdown; the atexit hook only holds a weak reference.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 5.0,
+                 max_bytes: int = 64 * 1024 * 1024, backups: int = 3):
+        self.path = os.path.abspath(path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._atexit = functools.partial(_close_journal, weakref.ref(self))
+        atexit.register(self._atexit)
+        self._flusher = threading.Thread(target=_run_journal_flusher, args=(weakref.ref(self),),
+                                         name="EpisodeJournalFlusher", daemon=True)
+        self._flusher.start()
+
+    def append(self, entry: Dict[str, Any]):
+        with self._wakeup:
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.notify()
+        if self._closed:
+            self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _wait_for_batch(self) -> bool:
+        """Block until a batch is due; False once the journal is closed."""
+        with self._wakeup:
+            if not self._closed and len(self._pending) < self.batch_size:
+                self._wakeup.wait(self.flush_interval)
+            return not self._closed
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            payload = "".join(json.dumps(e, default=str) + "\n" for e in batch)
+            self._rotate_if_needed(len(payload.encode("utf-8")))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(payload)
+            return len(batch)
+
+    def _rotate_if_needed(self, incoming: int):
+        if not self.max_bytes or not os.path.exists(self.path):
+            return
+        if os.path.getsize(self.path) + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        print(f"🔁 [EpisodeJournal] Rotated {self.path}")
+
+    def close(self):
+        with self._wakeup:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self.flush_interval + 1.0)
+        self.flush()
+        atexit.unregister(self._atexit)
+
+    def __del__(self):
+        if not getattr(self, "_closed", True):
+            self.close()
 
 class AGIEnhancer:
     def __init__(self, orchestrator, config=None):
         self.orchestrator = orchestrator
         self.config = config or {}
-        self.episodic_log: List[Dict[str, Any]] = []
-        self.ethics_audit_log: List[Dict[str, Any]] = []
+        # opt-in: set "journal_path" for a write-behind JSONL copy of every episode
+        journal_path = self.config.get("journal_path")
+        self.journal = EpisodeJournal(
+            journal_path,
+            batch_size=self.config.get("journal_batch_size", 256),
+            flush_interval=self.config.get("journal_flush_interval", 5.0),
+            max_bytes=self.config.get("journal_max_bytes", 64 * 1024 * 1024),
+            backups=self.config.get("journal_backups", 3)
+        ) if journal_path else None
+        self.episodic_log = EpisodicLog(capacity=self.config.get("episodic_capacity", 20000))
+        # the in-memory logs are bounded, so the archive is on by default to keep what they evict;
+        # "archive_dir" picks the location and archive_dir=None turns it off
+        archive_dir = self.config.get("archive_dir", default_archive_directory())
+        self.archive = EpisodeArchive(
+            archive_dir,
+            segment_rows=self.config.get("archive_segment_rows", 4096),
+            partition_seconds=self.config.get("archive_partition_seconds", 3600)
+        ) if archive_dir else None
+        # in-memory views are bounded; the archive keeps the full history
+        self.ethics_audit_log: deque = deque(maxlen=self.config.get("ethics_audit_capacity", 5000))
         self.self_improvement_log: List[str] = []
-        self.explanations: List[Dict[str, Any]] = []
-        self.agent_mesh_messages: List[Dict[str, Any]] = []
-        self.embodiment_actions: List[Dict[str, Any]] = []
+        self.explanations: deque = deque(maxlen=self.config.get("explanation_capacity", 2000))
+        self.agent_mesh_messages: deque = deque(maxlen=self.config.get("agent_message_capacity", 5000))
+        self.embodiment_actions: deque = deque(maxlen=self.config.get("embodiment_capacity", 5000))
+
+    def _archive(self, stream: str, entry: Dict[str, Any], module: str = "", tags: Optional[List[str]] = None, event: str = ""):
+        if self.archive is not None:
+            self.archive.append(stream, entry, timestamp=entry.get("timestamp"), module=module, tags=tags, event=event)
 
     def log_episode(self, event: str, meta: Optional[Dict[str, Any]] = None, 
                     module: Optional[str] = None, tags: Optional[List[str]] = None, embedding: Optional[Any] = None):
@@ -523,30 +1144,37 @@ class AGIEnhancer:
             "embedding": embedding
         }
         self.episodic_log.append(entry)
-        if len(self.episodic_log) > 20000:
-            self.episodic_log.pop(0)
+        if self.journal is not None:
+            self.journal.append(entry)
+        self._archive("episodes", entry, module=entry["module"], tags=entry["tags"], event=event)
+
+    def flush(self) -> int:
+        if self.archive is not None:
+            self.archive.flush()
+        return self.journal.flush() if self.journal is not None else 0
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.flush()
+        if self.journal is not None:
+            self.journal.close()
+        # one full memory snapshot at shutdown rather than one per journal batch
         if hasattr(self.orchestrator, "export_memory"):
             self.orchestrator.export_memory()
 
-        def replay_episodes(self, n: int = 5, module: Optional[str] = None, tag: Optional[str] = None) -> List[Dict[str, Any]]:
-        results = self.episodic_log
-        if module:
-            results = [e for e in results if e.get("module") == module]
-        if tag:
-            results = [e for e in results if tag in e.get("tags",[])]
-        return results[-n:]
+    def replay_episodes(self, n: int = 5, module: Optional[str] = None, tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.episodic_log.recent(n, module=module, tag=tag)
 
     def find_episode(self, keyword: str, deep: bool = False) -> List[Dict[str, Any]]:
-        def matches(ep):
-            if keyword.lower() in ep["event"].lower():
-                return True
-            if deep:
-                if any(keyword.lower() in str(v).lower() for v in ep.get("meta", {}).values()):
-                    return True
-                if any(keyword.lower() in t.lower() for t in ep.get("tags", [])):
-                    return True
-            return False
-        return [ep for ep in self.episodic_log if matches(ep)]
+        return self.episodic_log.search(keyword, deep=deep)
+
+    def query_archive(self, stream: str = "episodes", module: Optional[str] = None, tag: Optional[str] = None,
+                      start: Optional[Any] = None, end: Optional[Any] = None, keyword: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Archived records of `stream` (episodes, ethics_audit, explanations, agent_messages, embodiment_actions)."""
+        if self.archive is None:
+            return []
+        return self.archive.query(stream, module=module, tag=tag, start=start, end=end, keyword=keyword, limit=limit)
 
     def reflect_and_adapt(self, feedback: str, auto_patch: bool = False):
         suggestion = f"Reviewing feedback: '{feedback}'. Suggest adjusting {random.choice(['reasoning', 'tone', 'planning', 'speed'])}."
@@ -581,12 +1209,13 @@ class AGIEnhancer:
             "status": flagged
         }
         self.ethics_audit_log.append(entry)
+        self._archive("ethics_audit", entry, tags=[flagged], event=action)
         return flagged
 
     def explain_last_decision(self, depth: int = 3, mode: str = "auto") -> str:
         if not self.explanations:
             return "No explanations logged yet."
-        items = self.explanations[-depth:]
+        items = list(islice(reversed(self.explanations), depth))[::-1]
         if mode == "svg" and hasattr(self.orchestrator, "Visualizer"):
             try:
                 svg = self.orchestrator.Visualizer.render(items)
@@ -598,8 +1227,7 @@ class AGIEnhancer:
     def log_explanation(self, explanation: str, trace: Optional[Any] = None, svg: Optional[Any] = None):
         entry = {"text": explanation, "trace": trace, "svg": svg}
         self.explanations.append(entry)
-        if len(self.explanations) > 2000:
-            self.explanations.pop(0)
+        self._archive("explanations", entry, event=explanation)
 
     def embodiment_act(self, action: str, params: Optional[Dict[str, Any]] = None, real: bool = False):
         entry = {
@@ -615,6 +1243,7 @@ class AGIEnhancer:
                 entry["result"] = res
             except Exception:
                 entry["result"] = "interface_error"
+        self._archive("embodiment_actions", entry, tags=[entry["mode"]], event=action)
         return f"Embodiment action '{action}' ({'real' if real else 'sim'}) requested."
 
     def send_agent_message(self, to_agent: str, content: str, meta: Optional[Dict[str, Any]] = None):
@@ -632,6 +1261,7 @@ class AGIEnhancer:
                 msg["sent"] = True
             except Exception:
                 msg["sent"] = False
+        self._archive("agent_messages", msg, module=to_agent, event=content)
         return f"Message to {to_agent}: {content}"
 
     def periodic_self_audit(self):
@@ -655,128 +1285,3 @@ class AGIEnhancer:
 # print(self.agi_enhancer.explain_last_decision(mode="svg"))
 # print(self.agi_enhancer.embodiment_act("move_forward", {"distance": 1.0}, real=True))
 # print(self.agi_enhancer.periodic_self_audit())
-
-# ---------------- Theory of Mind Module ----------------
-
-class TheoryOfMindModule:
-    def __init__(self):
-        self.models: Dict[str, Dict[str, Any]] = {}
-
-    def update_beliefs(self, agent_name: str, observation: Dict[str, Any]):
-        model = self.models.get(agent_name, {"beliefs": {}, "desires": {}, "intentions": {}})
-        # Simple example: observe a lack of movement -> infer confusion
-        if "location" in observation:
-            previous = model["beliefs"].get("location")
-            if previous and observation["location"] == previous:
-                model["beliefs"]["state"] = "confused"
-            else:
-                model["beliefs"]["state"] = "moving"
-            model["beliefs"]["location"] = observation["location"]
-        self.models[agent_name] = model
-
-    def infer_desires(self, agent_name: str):
-        model = self.models.get(agent_name, {})
-        beliefs = model.get("beliefs", {})
-        # Inference rule: if confused, likely desires clarification
-        if beliefs.get("state") == "confused":
-            model["desires"]["goal"] = "seek_clarity"
-        elif beliefs.get("state") == "moving":
-            model["desires"]["goal"] = "continue_task"
-        self.models[agent_name] = model
-
-    def infer_intentions(self, agent_name: str):
-        model = self.models.get(agent_name, {})
-        desires = model.get("desires", {})
-        if desires.get("goal") == "seek_clarity":
-            model["intentions"]["next_action"] = "ask_question"
-        elif desires.get("goal") == "continue_task":
-            model["intentions"]["next_action"] = "advance"
-        self.models[agent_name] = model
-
-    def get_model(self, agent_name: str) -> Dict[str, Any]:
-        return self.models.get(agent_name, {})
-
-    def describe_agent_state(self, agent_name: str) -> str:
-        model = self.get_model(agent_name)
-        return f"{agent_name} believes they are {model.get('beliefs', {}).get('state', 'unknown')}, desires to {model.get('desires', {}).get('goal', 'unknown')}, and intends to {model.get('intentions', {}).get('next_action', 'unknown')}."
-
-# ----- Integration into EmbodiedAgent -----
-
-    def perceive(self):
-        print(f"👁️ [{self.name}] Perceiving environment...")
-        observations = {}
-        for sensor_name, sensor_func in self.sensors.items():
-            try:
-                observations[sensor_name] = sensor_func()
-            except Exception as e:
-                print(f"⚠️ Sensor {sensor_name} failed: {e}")
-        # Update self-theory (self-model) if multi-agent context
-        self.theory_of_mind.update_beliefs(self.name, observations)
-        self.theory_of_mind.infer_desires(self.name)
-        self.theory_of_mind.infer_intentions(self.name)
-        print(f"🧠 [{self.name}] Self-theory: {self.theory_of_mind.describe_agent_state(self.name)}")
-        return observations
-
-    def observe_peers(self):
-        if hasattr(self.shared_memory, "agents"):
-            for peer in self.shared_memory.agents:
-                if peer.name != self.name:
-                    peer_observation = peer.perceive()
-                    self.theory_of_mind.update_beliefs(peer.name, peer_observation)
-                    self.theory_of_mind.infer_desires(peer.name)
-                    self.theory_of_mind.infer_intentions(peer.name)
-                    state = self.theory_of_mind.describe_agent_state(peer.name)
-                    print(f"🔍 [{self.name}] Observed peer {peer.name}: {state}")
-
-    def execute_embodied_goal(self, goal):
-        print(f"🧐 [{self.name}] Executing embodied goal: {goal}")
-        self.progress = 0
-        context = self.perceive()
-
-        # Observe peer agents and integrate ToM
-        if hasattr(self.shared_memory, "agents"):
-            self.observe_peers()
-
-        # Incorporate peer intentions if relevant
-        peer_models = [
-            self.theory_of_mind.get_model(peer.name)
-            for peer in getattr(self.shared_memory, "agents", [])
-            if peer.name != self.name
-        ]
-        if peer_models:
-            context["peer_intentions"] = {
-                peer["beliefs"].get("state", "unknown"): peer["intentions"].get("next_action", "unknown")
-                for peer in peer_models
-            }
-
-        sub_tasks = self.planner.plan(goal, context)
-        action_plan = {}
-        for task in sub_tasks:
-            reasoning = self.reasoner.process(task, context)
-            concept = self.synthesizer.synthesize([goal, task], style="concept")
-            simulated = self.sim_core.run(reasoning, context, export_report=True)
-            action_plan[task] = {
-                "reasoning": reasoning,
-                "concept": concept,
-                "simulation": simulated
-            }
-
-        self.act({k: v["simulation"] for k, v in action_plan.items()})
-        self.meta.review_reasoning("\n".join([v["reasoning"] for v in action_plan.values()]))
-        self.performance_history.append({"goal": goal, "actions": action_plan, "completion": self.progress})
-        self.shared_memory.store(goal, action_plan)
-        self.collect_feedback(goal, action_plan)
-
-    def collect_feedback(self, goal, action_plan):
-        timestamp = time.time()
-        feedback = {
-            "timestamp": timestamp,
-            "goal": goal,
-            "score": self.meta.run_self_diagnostics(),
-            "traits": phi_field(x=0.001, t=timestamp % 1e-18),
-            "agent": self.name,
-            "theory_of_mind": self.theory_of_mind.get_model(self.name)
-        }
-        self.feedback_log.append(feedback)
-        print(f"🧭 [{self.name}] Feedback recorded for goal '{goal}' including Theory of Mind.")
-
@@ -1,10 +1,14 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
+from llm_async import async_call_gpt
 from index import beta_concentration, lambda_linguistics, psi_history, psi_temporality
+import asyncio
 import time
 import logging
 from datetime import datetime
 
 logger = logging.getLogger("ANGELA.KnowledgeRetriever")
+call_gpt = cached_call_gpt("knowledge_retriever")
+acall_gpt = async_call_gpt("knowledge_retriever")
 
 class KnowledgeRetriever:
     """
@@ -23,17 +27,37 @@ class KnowledgeRetriever:
         self.agi_enhancer = agi_enhancer
 
     def retrieve(self, query, context=None):
+        traits = self._retrieval_traits(query)
+        raw_result = call_gpt(self._retrieval_prompt(query, context, traits))
+        validated = self._validate_result(raw_result, traits["temporality"])
+        self._log_retrieval(query, context, traits, raw_result, validated)
+        return validated
+
+    async def aretrieve(self, query, context=None):
+        """Awaitable retrieve(); retrieval and validation go through the async LLM client."""
+        traits = self._retrieval_traits(query)
+        raw_result = await acall_gpt(self._retrieval_prompt(query, context, traits))
+        validated = await self._avalidate_result(raw_result, traits["temporality"])
+        self._log_retrieval(query, context, traits, raw_result, validated)
+        return validated
+
+    async def aretrieve_many(self, queries, context=None):
+        """Retrieve independent queries concurrently; results keep the input order."""
+        return list(await asyncio.gather(*(self.aretrieve(query, context) for query in queries)))
+
+    def _retrieval_traits(self, query):
         logger.info(f"🔎 Retrieving knowledge for query: '{query}'")
-        sources_str = ", ".join(self.preferred_sources)
         t = time.time() % 1e-18
-        traits = {
+        return {
             "concentration": beta_concentration(t),
             "linguistics": lambda_linguistics(t),
             "history": psi_history(t),
             "temporality": psi_temporality(t)
         }
 
-        prompt = f"""
+    def _retrieval_prompt(self, query, context, traits):
+        sources_str = ", ".join(self.preferred_sources)
+        return f"""
         Retrieve accurate, temporally-relevant knowledge for: "{query}"
 
         Traits:
@@ -47,9 +71,8 @@ class KnowledgeRetriever:
 
         Include retrieval date sensitivity and temporal verification if applicable.
         """
-        raw_result = call_gpt(prompt)
-        validated = self._validate_result(raw_result, traits["temporality"])
 
+    def _log_retrieval(self, query, context, traits, raw_result, validated):
         if self.agi_enhancer:
             self.agi_enhancer.log_episode("Knowledge Retrieval", {
                 "query": query,
@@ -59,10 +82,18 @@ class KnowledgeRetriever:
                 "context": context
             }, module="KnowledgeRetriever", tags=["retrieval", "temporal"])
 
-        return validated
-
     def _validate_result(self, result_text, temporality_score):
-        validation_prompt = f"""
+        validated_json = call_gpt(self._validation_prompt(result_text, temporality_score))
+        validated_json["timestamp"] = datetime.now().isoformat()
+        return validated_json
+
+    async def _avalidate_result(self, result_text, temporality_score):
+        validated_json = await acall_gpt(self._validation_prompt(result_text, temporality_score))
+        validated_json["timestamp"] = datetime.now().isoformat()
+        return validated_json
+
+    def _validation_prompt(self, result_text, temporality_score):
+        return f"""
         Review the following result for:
         - Timestamped knowledge (if any)
         - Trustworthiness of claims
@@ -83,41 +114,60 @@ class KnowledgeRetriever:
             "sources": ["..."]
         }}
         """
-        validated_json = call_gpt(validation_prompt)
-        validated_json["timestamp"] = datetime.now().isoformat()
-        return validated_json
 
     def refine_query(self, base_query, prior_result=None):
+        return call_gpt(self._refinement_prompt(base_query, prior_result))
+
+    async def arefine_query(self, base_query, prior_result=None):
+        return await acall_gpt(self._refinement_prompt(base_query, prior_result))
+
+    def _refinement_prompt(self, base_query, prior_result=None):
         logger.info(f"🛠 Refining query: '{base_query}'")
-        prompt = f"""
+        return f"""
         Refine this base query for higher φ-relevance:
         Query: "{base_query}"
         Prior knowledge: {prior_result or "N/A"}
 
         Inject context continuity if possible. Return optimized string.
         """
-        return call_gpt(prompt)
 
     def multi_hop_retrieve(self, query_chain):
+        traits = self._hop_traits()
+        results = []
+        for i, sub_query in enumerate(query_chain, 1):
+            refined = self.refine_query(sub_query, results[-1]["summary"] if results else None)
+            results.append(self._hop_result(i, sub_query, refined, self.retrieve(refined)))
+        self._log_multi_hop(query_chain, results, traits)
+        return results
+
+    async def amulti_hop_retrieve(self, query_chain):
+        """Awaitable multi_hop_retrieve(); hops stay sequential since each refines on the previous result."""
+        traits = self._hop_traits()
+        results = []
+        for i, sub_query in enumerate(query_chain, 1):
+            refined = await self.arefine_query(sub_query, results[-1]["summary"] if results else None)
+            results.append(self._hop_result(i, sub_query, refined, await self.aretrieve(refined)))
+        self._log_multi_hop(query_chain, results, traits)
+        return results
+
+    def _hop_traits(self):
         logger.info("🔗 Starting multi-hop retrieval.")
         t = time.time() % 1e-18
-        traits = {
+        return {
             "concentration": beta_concentration(t),
             "linguistics": lambda_linguistics(t)
         }
 
-        results = []
-        for i, sub_query in enumerate(query_chain, 1):
-            refined = self.refine_query(sub_query, results[-1]["summary"] if results else None)
-            result = self.retrieve(refined)
-            results.append({
-                "step": i,
-                "query": sub_query,
-                "refined": refined,
-                "result": result,
-                "continuity": "consistent" if i == 1 or refined in result["summary"] else "uncertain"
-            })
+    def _hop_result(self, i, sub_query, refined, result):
+        return {
+            "step": i,
+            "query": sub_query,
+            "refined": refined,
+            "result": result,
+            "continuity": "consistent" if i == 1 or refined in result["summary"] else "uncertain"
+        }
 
+    def _log_multi_hop(self, query_chain, results, traits):
         if self.agi_enhancer:
             self.agi_enhancer.log_episode("Multi-Hop Retrieval", {
                 "chain": query_chain,
@@ -125,8 +175,6 @@ class KnowledgeRetriever:
                 "traits": traits
             }, module="KnowledgeRetriever", tags=["multi-hop"])
 
-        return results
-
     def prioritize_sources(self, sources_list):
         logger.info(f"📚 Updating preferred sources: {sources_list}")
         self.preferred_sources = sources_list
@@ -1,10 +1,14 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
+from llm_async import async_call_gpt
 from toca_simulation import run_simulation
 from index import phi_scalar, eta_feedback
+import asyncio
 import logging
 import time
 
 logger = logging.getLogger("ANGELA.LearningLoop")
+call_gpt = cached_call_gpt("learning_loop")
+acall_gpt = async_call_gpt("learning_loop")
 
 class LearningLoop:
     def __init__(self, agi_enhancer=None):
@@ -42,6 +46,29 @@ class LearningLoop:
         return activated
         
     def update_model(self, session_data):
+        trace, weak_modules = self._prepare_update(session_data)
+        if weak_modules:
+            self._propose_module_refinements(weak_modules, trace)
+
+        self._detect_capability_gaps(session_data.get("input"), session_data.get("output"))
+        self._consolidate_knowledge()
+        self._check_narrative_integrity()
+
+    async def aupdate_model(self, session_data):
+        """
+        Async `update_model`. Refinements, capability-gap detection, knowledge
+        consolidation and the narrative check do not depend on each other, so
+        their completions are issued concurrently.
+        """
+        trace, weak_modules = self._prepare_update(session_data)
+        await asyncio.gather(
+            *(self._arefine_module(module, trace) for module in weak_modules),
+            self._adetect_capability_gaps(session_data.get("input"), session_data.get("output")),
+            self._aconsolidate_knowledge(),
+            self._acheck_narrative_integrity()
+        )
+
+    def _prepare_update(self, session_data):
         logger.info("\ud83d\udcca [LearningLoop] Analyzing session performance...")
 
         t = time.time() % 1e-18
@@ -68,11 +95,7 @@ class LearningLoop:
         weak_modules = self._find_weak_modules(session_data.get("module_stats", {}))
         if weak_modules:
             logger.warning(f"\u26a0\ufe0f Weak modules detected: {weak_modules}")
-            self._propose_module_refinements(weak_modules, trace)
-
-        self._detect_capability_gaps(session_data.get("input"), session_data.get("output"))
-        self._consolidate_knowledge()
-        self._check_narrative_integrity()
+        return trace, weak_modules
 
     def propose_autonomous_goal(self):
         logger.info("\ud83c\udfaf [LearningLoop] Proposing autonomous goal.")
@@ -114,35 +137,56 @@ class LearningLoop:
 
     def _propose_module_refinements(self, weak_modules, trace):
         for module in weak_modules:
-            logger.info(f"\ud83d\udca1 Refinement suggestion for {module} using modulation: {trace['modulation_index']:.2f}")
-            prompt = f"""
-            Suggest ϕ/η-aligned improvements for the {module} module.
-            ϕ = {trace['phi']:.3f}, η = {trace['eta']:.3f}, Index = {trace['modulation_index']:.3f}
-            """
-            suggestions = call_gpt(prompt)
+            suggestions = call_gpt(self._refinement_prompt(module, trace))
             sim_result = run_simulation(f"Test refinement:\n{suggestions}")
-            logger.debug(f"\ud83e\uddea Result for {module}:\n{sim_result}")
-            if self.agi_enhancer:
-                self.agi_enhancer.reflect_and_adapt(f"Refinement for {module} evaluated.")
+            self._record_refinement(module, sim_result)
+
+    async def _arefine_module(self, module, trace):
+        suggestions = await acall_gpt(self._refinement_prompt(module, trace))
+        sim_result = await asyncio.to_thread(run_simulation, f"Test refinement:\n{suggestions}")
+        self._record_refinement(module, sim_result)
+
+    def _refinement_prompt(self, module, trace):
+        logger.info(f"\ud83d\udca1 Refinement suggestion for {module} using modulation: {trace['modulation_index']:.2f}")
+        return f"""
+        Suggest ϕ/η-aligned improvements for the {module} module.
+        ϕ = {trace['phi']:.3f}, η = {trace['eta']:.3f}, Index = {trace['modulation_index']:.3f}
+        """
+
+    def _record_refinement(self, module, sim_result):
+        logger.debug(f"\ud83e\uddea Result for {module}:\n{sim_result}")
+        if self.agi_enhancer:
+            self.agi_enhancer.reflect_and_adapt(f"Refinement for {module} evaluated.")
 
     def _detect_capability_gaps(self, last_input, last_output):
+        proposal = call_gpt(self._capability_gap_prompt(last_input, last_output))
+        if proposal:
+            logger.info("\ud83d\ude80 Proposed ϕ-based module refinement.")
+            self._simulate_and_deploy_module(proposal)
+
+    async def _adetect_capability_gaps(self, last_input, last_output):
+        proposal = await acall_gpt(self._capability_gap_prompt(last_input, last_output))
+        if proposal:
+            logger.info("\ud83d\ude80 Proposed ϕ-based module refinement.")
+            result = await asyncio.to_thread(run_simulation, f"Module sandbox:\n{proposal}")
+            self._deploy_if_approved(proposal, result)
+
+    def _capability_gap_prompt(self, last_input, last_output):
         logger.info("\ud83d\udee0 Detecting capability gaps...")
         phi = phi_scalar(time.time() % 1e-18)
-
-        prompt = f"""
+        return f"""
         Input: {last_input}
         Output: {last_output}
         ϕ = {phi:.2f}
 
         Identify capability gaps and suggest blueprints for ϕ-tuned modules.
         """
-        proposal = call_gpt(prompt)
-        if proposal:
-            logger.info("\ud83d\ude80 Proposed ϕ-based module refinement.")
-            self._simulate_and_deploy_module(proposal)
 
     def _simulate_and_deploy_module(self, blueprint):
         result = run_simulation(f"Module sandbox:\n{blueprint}")
+        self._deploy_if_approved(blueprint, result)
+
+    def _deploy_if_approved(self, blueprint, result):
         if "approved" in result.lower():
             logger.info("\ud83d\udce6 Deploying blueprint.")
             self.module_blueprints.append(blueprint)
@@ -150,16 +194,22 @@ class LearningLoop:
                 self.agi_enhancer.log_episode("Blueprint deployed", {"blueprint": blueprint}, module="LearningLoop")
 
     def _consolidate_knowledge(self):
+        call_gpt(self._consolidation_prompt())
+        if self.agi_enhancer:
+            self.agi_enhancer.log_episode("Knowledge consolidation", {}, module="LearningLoop")
+
+    async def _aconsolidate_knowledge(self):
+        await acall_gpt(self._consolidation_prompt())
+        if self.agi_enhancer:
+            self.agi_enhancer.log_episode("Knowledge consolidation", {}, module="LearningLoop")
+
+    def _consolidation_prompt(self):
         phi = phi_scalar(time.time() % 1e-18)
         logger.info("\ud83d\udcda Consolidating ϕ-aligned knowledge.")
-
-        prompt = f"""
+        return f"""
         Consolidate recent learning using ϕ = {phi:.2f}.
         Prune noise, synthesize patterns, and emphasize high-impact transitions.
         """
-        call_gpt(prompt)
-        if self.agi_enhancer:
-            self.agi_enhancer.log_episode("Knowledge consolidation", {}, module="LearningLoop")
 
     def trigger_reflexive_audit(self, context_snapshot):
         logger.info("\ud83c\udf00 [Reflexive Audit] Initiating audit on context trajectory...")
@@ -190,16 +240,27 @@ class LearningLoop:
         logger.info("\ud83e\udde9 [Integrity] Checking narrative coherence across goal history...")
         if len(self.goal_history) < 2:
             return
-        last_goal = self.goal_history[-1]["goal"]
-        prior_goal = self.goal_history[-2]["goal"]
-        check_prompt = f"""
+        prior_goal, last_goal = self.goal_history[-2]["goal"], self.goal_history[-1]["goal"]
+        self._record_narrative_audit(prior_goal, last_goal, call_gpt(self._narrative_prompt(prior_goal, last_goal)))
+
+    async def _acheck_narrative_integrity(self):
+        logger.info("\ud83e\udde9 [Integrity] Checking narrative coherence across goal history...")
+        if len(self.goal_history) < 2:
+            return
+        prior_goal, last_goal = self.goal_history[-2]["goal"], self.goal_history[-1]["goal"]
+        audit = await acall_gpt(self._narrative_prompt(prior_goal, last_goal))
+        self._record_narrative_audit(prior_goal, last_goal, audit)
+
+    def _narrative_prompt(self, prior_goal, last_goal):
+        return f"""
         Compare the following goals for alignment and continuity:
         Previous: {prior_goal}
         Current: {last_goal}
 
         Are these in narrative coherence? If not, suggest a corrective alignment.
         """
-        audit = call_gpt(check_prompt)
+
+    def _record_narrative_audit(self, prior_goal, last_goal, audit):
         if self.agi_enhancer:
             self.agi_enhancer.log_episode("Narrative Coherence Audit", {
                 "previous_goal": prior_goal,
@@ -0,0 +1,312 @@
+import atexit
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from collections import deque
+import numpy as np
+
+logger = logging.getLogger("ANGELA.Ledger")
+
+DEFAULT_BLOCK_SIZE = 256
+DEFAULT_RETAINED_BLOCKS = 1024
+
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return str(value)
+
+
+def canonical(record):
+    """Canonical serialization: sorted keys, no whitespace, UTF-8; one record always yields the same bytes."""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+
+
+def leaf_hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(_LEAF + data).digest()
+
+
+def _node_hash(left, right):
+    return hashlib.sha256(_NODE + left + right).digest()
+
+
+def merkle_levels(leaves):
+    """All tree levels from leaves to root; an odd node is promoted unchanged."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append([
+            _node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ])
+    return levels
+
+
+def merkle_root(leaves):
+    return merkle_levels(leaves)[-1][0] if leaves else hashlib.sha256(b"").digest()
+
+
+def merkle_path(levels, index):
+    """Sibling hashes from leaf `index` up to the root: [(side, hex), ...]."""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(("L" if sibling < index else "R", level[sibling].hex()))
+        index //= 2
+    return path
+
+
+def _fold_path(node, path):
+    for side, sibling in path:
+        sibling = bytes.fromhex(sibling)
+        node = _node_hash(sibling, node) if side == "L" else _node_hash(node, sibling)
+    return node
+
+
+def verify_proof(record, proof):
+    """Check that `record` is included under the proof's ledger root."""
+    block_root = _fold_path(leaf_hash(canonical(record)), proof["path"])
+    if block_root.hex() != proof["block_root"]:
+        return False
+    return _fold_path(block_root, proof["block_path"]).hex() == proof["root"]
+
+
+def _block_hash(index, first_seq, count, root, prev):
+    return hashlib.sha256(f"{index}:{first_seq}:{count}:{root}:{prev}".encode("utf-8")).hexdigest()
+
+
+class MerkleLedger:
+    """
+    Append-only audit ledger with Merkle-batched hashing.
+    ---------------------------------
+    - append() only serializes the record canonically and queues it; no
+      hashing happens per record on the caller's hot path
+    - Every `block_size` records (or on seal()) the pending records are hashed
+      as leaves of one Merkle tree; the block header chains root and previous
+      block hash, so one hash links each block instead of one per record
+    - With `path`, sealed blocks are appended to a JSONL segment file and the
+      ledger resumes from it on restart; get_ledger() sets the path under
+      ANGELA_LEDGER_DIR (default ~/.angela/ledgers) unless configure_ledgers(None)
+    - proof(seq) gives an O(log n) inclusion proof: the leaf's path to its block
+      root plus the block root's path to the ledger root (Merkle root over all
+      block roots); verify() streams every block and re-checks roots and chain
+    - Only the last `retained_blocks` block bodies stay in memory
+    ---------------------------------
+    """
+
+    def __init__(self, name="ledger", path=None, block_size=DEFAULT_BLOCK_SIZE, retained_blocks=DEFAULT_RETAINED_BLOCKS):
+        self.name = name
+        self.path = path
+        self.block_size = block_size
+        self._lock = threading.RLock()
+        self._pending = []  # canonical record strings awaiting their block
+        self._blocks = deque(maxlen=retained_blocks)
+        self._block_roots = []
+        self._root_levels = None
+        self._seq = 0
+        self._prev = ""
+        if path:
+            self._resume()
+            atexit.register(self.seal)
+
+    # --- Writes ---
+
+    def append(self, record):
+        """Queue `record`; returns its sequence number."""
+        data = canonical(record)
+        with self._lock:
+            seq = self._seq
+            self._seq += 1
+            self._pending.append(data)
+            if len(self._pending) >= self.block_size:
+                self._seal_locked()
+        return seq
+
+    def seal(self):
+        """Hash pending records into a block now (e.g. before taking a proof or shutting down)."""
+        with self._lock:
+            if self._pending:
+                self._seal_locked()
+
+    def _seal_locked(self):
+        records, self._pending = self._pending, []
+        leaves = [leaf_hash(data) for data in records]
+        root = merkle_root(leaves).hex()
+        index = len(self._block_roots)
+        first_seq = self._seq - len(records)
+        block = {
+            "index": index,
+            "first_seq": first_seq,
+            "count": len(records),
+            "root": root,
+            "prev": self._prev,
+            "hash": _block_hash(index, first_seq, len(records), root, self._prev),
+            "sealed_at": time.time(),
+            "records": records,
+        }
+        self._prev = block["hash"]
+        self._block_roots.append(bytes.fromhex(root))
+        self._root_levels = None
+        self._blocks.append(block)
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(block, ensure_ascii=False) + "\n")
+        logger.debug(f"🔏 Ledger {self.name} sealed block {index} ({len(records)} records)")
+
+    def _resume(self):
+        if not os.path.exists(self.path):
+            return
+        valid_bytes = 0
+        for block, end in self._scan_blocks():
+            self._block_roots.append(bytes.fromhex(block["root"]))
+            self._blocks.append(block)
+            self._prev = block["hash"]
+            self._seq = block["first_seq"] + block["count"]
+            valid_bytes = end
+        # a crash mid-seal leaves a partial last line; cut it so new blocks start clean
+        if valid_bytes < os.path.getsize(self.path):
+            os.truncate(self.path, valid_bytes)
+        logger.info(f"📒 Ledger {self.name} resumed at seq {self._seq} from {self.path}")
+
+    def _read_blocks(self):
+        return (block for block, _ in self._scan_blocks())
+
+    def _scan_blocks(self):
+        """Yield (block, end offset) per sealed block, stopping at a torn tail."""
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated block")
+                    block = json.loads(line)
+                except ValueError:
+                    logger.warning(f"⚠️ Dropping torn ledger block in {self.path}")
+                    return
+                yield block, offset
+
+    # --- Reads ---
+
+    def __len__(self):
+        return self._seq
+
+    def __iter__(self):
+        """Retained records in order, sealed and pending."""
+        with self._lock:
+            chunks = [block["records"] for block in self._blocks] + [list(self._pending)]
+        for records in chunks:
+            for data in records:
+                yield json.loads(data)
+
+    def _find_block(self, seq):
+        for block in reversed(self._blocks):
+            if block["first_seq"] <= seq < block["first_seq"] + block["count"]:
+                return block
+        return None
+
+    def get(self, seq):
+        with self._lock:
+            block = self._find_block(seq)
+            if block is not None:
+                return json.loads(block["records"][seq - block["first_seq"]])
+            pending_start = self._seq - len(self._pending)
+            if pending_start <= seq < self._seq:
+                return json.loads(self._pending[seq - pending_start])
+        return None
+
+    def root(self):
+        """Merkle root over every sealed block root."""
+        with self._lock:
+            if not self._block_roots:
+                return None
+            return self._levels()[-1][0].hex()
+
+    def _levels(self):
+        if self._root_levels is None:
+            self._root_levels = merkle_levels(self._block_roots)
+        return self._root_levels
+
+    def proof(self, seq):
+        """Inclusion proof for record `seq`, sealing its block first if still pending."""
+        with self._lock:
+            if seq >= self._seq - len(self._pending):
+                self.seal()
+            block = self._find_block(seq)
+            if block is None:
+                raise KeyError(f"Ledger {self.name} no longer retains record {seq}")
+            leaves = [leaf_hash(data) for data in block["records"]]
+            return {
+                "seq": seq,
+                "block": block["index"],
+                "block_hash": block["hash"],
+                "path": merkle_path(merkle_levels(leaves), seq - block["first_seq"]),
+                "block_root": block["root"],
+                "block_path": merkle_path(self._levels(), block["index"]),
+                "root": self._levels()[-1][0].hex(),
+            }
+
+    def verify(self):
+        """Stream every block (from the segment file when persisted) and re-check roots and chain."""
+        with self._lock:
+            blocks = self._read_blocks() if self.path and os.path.exists(self.path) else list(self._blocks)
+            prev = None
+            for block in blocks:
+                root = merkle_root([leaf_hash(data) for data in block["records"]]).hex()
+                expected = _block_hash(block["index"], block["first_seq"], block["count"], root, block["prev"])
+                if root != block["root"] or expected != block["hash"] or (prev is not None and block["prev"] != prev):
+                    logger.error(f"🚨 Ledger {self.name} integrity failure at block {block['index']}")
+                    return False
+                prev = block["hash"]
+        return True
+
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+# persisted by default; ANGELA_LEDGER_DIR or configure_ledgers() picks the location
+_directory = os.path.abspath(os.environ.get("ANGELA_LEDGER_DIR") or os.path.join(os.path.expanduser("~"), ".angela", "ledgers"))
+
+
+def configure_ledgers(directory=None):
+    """
+    Persist ledgers created from now on as `<directory>/<name>.ledger.jsonl`;
+    directory=None keeps them in memory only.
+    """
+    global _directory
+    _directory = os.path.abspath(directory) if directory else None
+
+
+def ledger_directory():
+    """Where get_ledger() persists ledgers, or None when they are kept in memory."""
+    return _directory
+
+
+def get_ledger(name, **kwargs):
+    """Process-wide ledger for `name`, created on first use."""
+    with _ledgers_lock:
+        ledger = _ledgers.get(name)
+        if ledger is None:
+            path = None
+            if _directory:
+                os.makedirs(_directory, exist_ok=True)
+                path = os.path.join(_directory, f"{name}.ledger.jsonl")
+            ledger = _ledgers[name] = MerkleLedger(name=name, path=path, **kwargs)
+        return ledger
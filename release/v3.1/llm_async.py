@@ -0,0 +1,136 @@
+import asyncio
+import copy
+import time
+import weakref
+import logging
+from llm_cache import prompt_cache, prompt_key, caching_enabled, set_module_caching
+from llm_backends import get_backend
+
+logger = logging.getLogger("ANGELA.LLMAsync")
+
+_max_concurrency = 8
+_rate_limits = {}  # backend -> (requests per second, burst)
+_loop_states = weakref.WeakKeyDictionary()
+_counters = {"requests": 0, "coalesced": 0, "upstream": 0}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class _LoopState:
+    """Concurrency primitives are bound to one event loop, so each loop gets its own set."""
+
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(_max_concurrency)
+        self.inflight = {}
+        self.buckets = {}
+
+    def bucket(self, backend):
+        if backend not in self.buckets:
+            limit = _rate_limits.get(backend)
+            self.buckets[backend] = TokenBucket(*limit) if limit else None
+        return self.buckets[backend]
+
+
+def _state():
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+def configure_async(max_concurrency=None, rate_limits=None):
+    """
+    Set the global in-flight limit and per-backend rate limits,
+    e.g. `configure_async(rate_limits={"prompt_utils": (5, 10)})`.
+    Takes effect for requests issued after the call.
+    """
+    global _max_concurrency
+    if max_concurrency is not None:
+        _max_concurrency = max_concurrency
+    if rate_limits is not None:
+        _rate_limits.update(rate_limits)
+    _loop_states.clear()
+
+
+def async_stats():
+    return dict(_counters)
+
+
+async def _fetch(state, backend, prompt, params, key, cacheable, ttl):
+    async with state.semaphore:
+        bucket = state.bucket(backend.name)
+        if bucket is not None:
+            await bucket.acquire()
+        _counters["upstream"] += 1
+        value = await asyncio.to_thread(backend.complete, prompt, **params)
+    if cacheable and value is not None:
+        prompt_cache.put(key, value, ttl=ttl)
+    return value
+
+
+async def acall_gpt(prompt, module="llm_async", ttl=None, **params):
+    """
+    Awaitable `call_gpt`.
+    Cache hits return immediately; identical prompts already in flight on
+    this loop share one upstream request; everything else waits for a
+    concurrency slot and the backend's rate limit.
+    """
+    _counters["requests"] += 1
+    backend = get_backend()
+    key = prompt_key(prompt, params, backend=backend.name)
+    cacheable = caching_enabled(module)
+    if cacheable:
+        found, value = prompt_cache.get(key)
+        if found:
+            return value
+    else:
+        prompt_cache.record_bypass()
+
+    state = _state()
+    task = state.inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(state, backend, prompt, params, key, cacheable, ttl))
+        state.inflight[key] = task
+        task.add_done_callback(lambda done: state.inflight.pop(key, None) if state.inflight.get(key) is done else None)
+    else:
+        _counters["coalesced"] += 1
+    # shield: a cancelled caller must not cancel the request other callers share
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+async def acall_many(prompts, module="llm_async", **params):
+    """Issue independent prompts concurrently; results keep the input order."""
+    return await asyncio.gather(*(acall_gpt(prompt, module=module, **params) for prompt in prompts))
+
+
+def async_call_gpt(module, ttl=None, enabled=True):
+    """Async counterpart of `llm_cache.cached_call_gpt`."""
+    if not enabled:
+        set_module_caching(module, False)
+
+    async def acall(prompt, **params):
+        return await acall_gpt(prompt, module=module, ttl=ttl, **params)
+
+    acall.module = module
+    return acall
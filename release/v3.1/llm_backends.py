@@ -0,0 +1,147 @@
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+import logging
+from collections import Counter
+
+logger = logging.getLogger("ANGELA.LLMBackends")
+
+_JSON_HINT_RE = re.compile(r"\bjson\b", re.IGNORECASE)
+_FIELD_RE = re.compile(r'^\s*"(?P<key>[^"]+)"\s*:\s*(?P<spec>.+?),?\s*$')
+_CHOICE_RE = re.compile(r"\b([A-Z][a-z]+)\s*/\s*([A-Z][a-z]+)(?:\s*/\s*([A-Z][a-z]+))?\b")
+
+
+class LLMBackend:
+    """Completion provider behind `call_gpt`; `name` keys rate limits and cache entries."""
+
+    name = "backend"
+
+    def complete(self, prompt, **params):
+        raise NotImplementedError
+
+
+class PromptUtilsBackend(LLMBackend):
+    """Default backend: the live service reached through `utils.prompt_utils.call_gpt`."""
+
+    name = "prompt_utils"
+
+    def __init__(self):
+        self._call_gpt = None
+
+    def complete(self, prompt, **params):
+        if self._call_gpt is None:
+            from utils.prompt_utils import call_gpt
+            self._call_gpt = call_gpt
+        return self._call_gpt(prompt, **params)
+
+
+class LocalStandInBackend(LLMBackend):
+    """
+    Deterministic offline stand-in for load tests and profiling.
+    ---------------------------------
+    - Responses depend only on the normalized prompt and `seed`
+    - Prompts asking for JSON get a dict built from the field template in the
+      prompt (e.g. KnowledgeRetriever._validate_result)
+    - Prompts offering choices such as "Approve/Deny" or "Proceed / Modify / Abort"
+      answer with the first option, or the last with probability 1 - `approval_rate`
+    - Everything else gets a short free-text answer
+    - Latency is drawn per prompt from `latency`: ("fixed", ms),
+      ("uniform", low_ms, high_ms) or ("lognormal", median_ms, sigma)
+    ---------------------------------
+    """
+
+    name = "local"
+
+    def __init__(self, seed=0, latency=("fixed", 0.0), approval_rate=1.0):
+        self.seed = seed
+        self.latency = latency
+        self.approval_rate = approval_rate
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, **params):
+        text = " ".join(str(prompt).split())
+        digest = hashlib.sha256(f"{self.seed}:{text}".encode("utf-8")).hexdigest()
+        rng = random.Random(digest)
+
+        delay = self._sample_latency(rng)
+        if delay > 0:
+            time.sleep(delay)
+
+        if _JSON_HINT_RE.search(text):
+            route, response = "json", self._json_response(str(prompt), digest, rng)
+        elif _CHOICE_RE.search(text):
+            route, response = "choice", self._choice_response(text, digest, rng)
+        else:
+            route, response = "text", self._text_response(text, digest)
+        with self._lock:
+            self.calls[route] += 1
+        return response
+
+    def _sample_latency(self, rng):
+        kind, *args = self.latency
+        if kind == "fixed":
+            ms = args[0]
+        elif kind == "uniform":
+            ms = rng.uniform(args[0], args[1])
+        elif kind == "lognormal":
+            ms = args[0] * math.exp(rng.gauss(0.0, args[1]))
+        else:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        return ms / 1000.0
+
+    def _json_response(self, prompt, digest, rng):
+        response = {}
+        for line in prompt.splitlines():
+            match = _FIELD_RE.match(line)
+            if match:
+                response[match.group("key")] = self._field_value(match.group("spec"), digest, rng)
+        return response or {"summary": f"stand-in response {digest[:12]}"}
+
+    def _field_value(self, spec, digest, rng):
+        spec = spec.strip().lower()
+        if spec.startswith("["):
+            return [f"source-{digest[:8]}"]
+        if "true/false" in spec or spec in ("true", "false", "bool", "boolean"):
+            return True
+        if spec.startswith("float") or spec.startswith("number"):
+            return round(rng.random(), 3)
+        if spec.startswith("int"):
+            return rng.randint(1, 10)
+        return f"stand-in {digest[:12]}"
+
+    def _choice_response(self, text, digest, rng):
+        options = [option for option in _CHOICE_RE.search(text).groups() if option]
+        choice = options[0] if rng.random() < self.approval_rate else options[-1]
+        return f"{choice}. Stand-in rationale {digest[:12]}."
+
+    def _text_response(self, text, digest):
+        return f"Stand-in response {digest[:12]} to: {text[:80]}"
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def set_backend(backend):
+    global _backend
+    with _backend_lock:
+        _backend = backend
+    logger.info(f"🔌 LLM backend set to {backend.name}")
+
+
+def get_backend():
+    """Active backend; `ANGELA_LLM_BACKEND=local` selects the offline stand-in on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if os.environ.get("ANGELA_LLM_BACKEND", "").lower() == "local":
+                    _backend = LocalStandInBackend()
+                else:
+                    _backend = PromptUtilsBackend()
+    return _backend
@@ -0,0 +1,193 @@
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from llm_backends import get_backend
+
+logger = logging.getLogger("ANGELA.LLMCache")
+
+
+def normalize_prompt(prompt):
+    """Drop trailing whitespace only; indentation and inner spacing can be meaningful (code, structured prompts)."""
+    return "\n".join(line.rstrip() for line in str(prompt).splitlines()).rstrip()
+
+
+def prompt_key(prompt, params=None, backend=None):
+    payload = json.dumps(
+        {"prompt": normalize_prompt(prompt), "params": params or {}, "backend": backend},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """
+    Content-addressed completion cache.
+    ---------------------------------
+    - In-memory LRU keyed by normalized prompt hash + model parameters
+    - Optional SQLite tier that survives restarts and is shared by processes
+    - Per-entry TTLs; expired entries are dropped on read
+    - Hit/miss/eviction counters via `stats()`
+    ---------------------------------
+    """
+
+    def __init__(self, max_entries=4096, default_ttl=3600.0, disk_path=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "bypassed": 0}
+        if disk_path:
+            self.attach_disk(disk_path)
+
+    def attach_disk(self, disk_path):
+        with self._lock:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._disk.commit()
+
+    def get(self, key):
+        """Return (found, value); values are copied so callers may mutate them."""
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, copy.deepcopy(value)
+                del self._entries[key]
+                self._counters["expired"] += 1
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = json.loads(row[0]), row[1]
+                    if expires_at is None or expires_at > now:
+                        self._insert(key, value, expires_at)
+                        self._counters["disk_hits"] += 1
+                        return True, copy.deepcopy(value)
+                    self._disk.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._disk.commit()
+                    self._counters["expired"] += 1
+
+            self._counters["misses"] += 1
+            return False, None
+
+    def put(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._insert(key, copy.deepcopy(value), expires_at)
+            if self._disk is not None:
+                try:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO completions (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires_at)
+                    )
+                    self._disk.commit()
+                except (TypeError, ValueError):
+                    logger.debug("Completion is not JSON-serializable; kept in memory tier only.")
+
+    def _insert(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def record_bypass(self):
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM completions")
+                self._disk.commit()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+prompt_cache = PromptCache()
+_disabled_modules = set()
+_cache_enabled = True
+
+
+def configure_cache(max_entries=None, default_ttl=None, disk_path=None, enabled=None):
+    global _cache_enabled
+    if max_entries is not None:
+        prompt_cache.max_entries = max_entries
+    if default_ttl is not None:
+        prompt_cache.default_ttl = default_ttl
+    if disk_path is not None:
+        prompt_cache.attach_disk(disk_path)
+    if enabled is not None:
+        _cache_enabled = enabled
+
+
+def set_module_caching(module, enabled):
+    if enabled:
+        _disabled_modules.discard(module)
+    else:
+        _disabled_modules.add(module)
+    logger.info(f"🗄️ Completion caching {'enabled' if enabled else 'disabled'} for {module}")
+
+
+def cache_stats():
+    return prompt_cache.stats()
+
+
+def caching_enabled(module):
+    return _cache_enabled and module not in _disabled_modules
+
+
+def call_upstream(prompt, **params):
+    """Uncached completion through the active backend (see llm_backends)."""
+    return get_backend().complete(prompt, **params)
+
+
+def cached_call_gpt(module, ttl=None, enabled=True):
+    """
+    Build a drop-in `call_gpt` for `module` that consults the shared cache.
+    Extra keyword arguments (model, temperature, ...) are forwarded upstream
+    and are part of the cache key. Modules that sample for diversity pass
+    `enabled=False` so repeated prompts get fresh completions; caching can
+    still be turned on later with `set_module_caching`.
+    """
+    if not enabled:
+        set_module_caching(module, False)
+
+    def call_gpt(prompt, **params):
+        if not caching_enabled(module):
+            prompt_cache.record_bypass()
+            return call_upstream(prompt, **params)
+        key = prompt_key(prompt, params, backend=get_backend().name)
+        found, value = prompt_cache.get(key)
+        if found:
+            return value
+        value = call_upstream(prompt, **params)
+        if value is not None:
+            prompt_cache.put(key, value, ttl=ttl)
+        return value
+
+    call_gpt.module = module
+    return call_gpt
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger("ANGELA.MemoryBackends")
+
+LAYERS = ("STM", "LTM", "SelfReflections")
+
+
+def empty_memory():
+    return {layer: {} for layer in LAYERS}
+
+
+def apply_record(memory, record):
+    """Apply a single journal record (put/delete/promote/clear) to a memory tree."""
+    op = record["op"]
+    if op == "put":
+        memory.setdefault(record["layer"], {})[record["key"]] = record["entry"]
+    elif op == "delete":
+        layer = memory.get(record["layer"], {})
+        for key in record["keys"]:
+            layer.pop(key, None)
+    elif op == "promote":
+        source = memory.get(record["source"], {})
+        if record["key"] in source:
+            memory.setdefault(record["target"], {})[record["key"]] = source.pop(record["key"])
+    elif op == "clear":
+        for layer in list(memory.keys()):
+            memory[layer] = {}
+        for layer in LAYERS:
+            memory.setdefault(layer, {})
+    else:
+        raise ValueError(f"Unknown memory journal op: {op}")
+    return memory
+
+
+def _live_keys(memory):
+    return {(layer, key) for layer, entries in memory.items() if isinstance(entries, dict) for key in entries}
+
+
+def _write_json_atomic(path, payload, fsync=False):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class MemoryBackend:
+    """
+    Storage interface for MemoryManager.
+    Mutations arrive as journal records via `append`; `compact` receives the
+    full in-memory tree whenever the backend asks for it (`needs_compaction`)
+    or a caller forces a full snapshot.
+    """
+
+    def load(self):
+        raise NotImplementedError
+
+    def append(self, record):
+        raise NotImplementedError
+
+    def needs_compaction(self):
+        return False
+
+    def compact(self, memory):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JSONFileBackend(MemoryBackend):
+    """Legacy behaviour: every mutation rewrites the whole JSON store."""
+
+    def __init__(self, path="memory_store.json"):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return empty_memory()
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def append(self, record):
+        pass
+
+    def needs_compaction(self):
+        return True
+
+    def compact(self, memory):
+        _write_json_atomic(self.path, memory)
+        logger.debug("💾 Memory persisted to disk.")
+
+
+class JournaledBackend(MemoryBackend):
+    """
+    Append-only journal over a JSON snapshot.
+    ---------------------------------
+    - Each mutation is one JSON line in `<path>.log`, tagged with a sequence number
+    - Compaction rewrites the snapshot once the log outgrows `compact_ratio`
+      times the live key count (never below `compact_min_records`), which
+      keeps writes amortized O(1)
+    - Recovery loads the snapshot and replays log records newer than the
+      snapshot's sequence number; a torn trailing record is ignored
+    ---------------------------------
+    """
+
+    SEQ_KEY = "_journal_seq"
+
+    def __init__(self, path="memory_store.json", log_path=None, compact_min_records=1000,
+                 compact_ratio=1.0, fsync=False):
+        self.path = path
+        self.log_path = log_path or f"{path}.log"
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+        self.fsync = fsync
+        self._seq = 0
+        self._log_records = 0
+        self._live_keys = set()
+        self._log = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        memory = empty_memory()
+        snapshot_seq = 0
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                memory = json.load(f)
+            snapshot_seq = memory.pop(self.SEQ_KEY, 0)
+        self._seq = snapshot_seq
+        self._log_records = 0
+
+        if os.path.exists(self.log_path):
+            replayed = 0
+            valid_bytes = 0
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated record")
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"⚠️ Dropping torn journal record in {self.log_path}")
+                        break
+                    valid_bytes += len(line)
+                    self._log_records += 1
+                    if record["seq"] <= snapshot_seq:
+                        continue
+                    apply_record(memory, record)
+                    self._seq = record["seq"]
+                    replayed += 1
+            if valid_bytes < os.path.getsize(self.log_path):
+                os.truncate(self.log_path, valid_bytes)
+            if replayed:
+                logger.info(f"♻️ Replayed {replayed} journal records from {self.log_path}")
+
+        self._live_keys = _live_keys(memory)
+        self._log = open(self.log_path, "a")
+        return memory
+
+    def append(self, record):
+        with self._lock:
+            self._seq += 1
+            self._log.write(json.dumps(dict(record, seq=self._seq)) + "\n")
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self._log_records += 1
+            self._track(record)
+
+    def _track(self, record):
+        """Keep the live key set in step with the journal, so overwrites and deletes don't skew compaction."""
+        op = record["op"]
+        if op == "put":
+            self._live_keys.add((record["layer"], record["key"]))
+        elif op == "delete":
+            self._live_keys.difference_update((record["layer"], key) for key in record["keys"])
+        elif op == "promote":
+            if (record["source"], record["key"]) in self._live_keys:
+                self._live_keys.discard((record["source"], record["key"]))
+                self._live_keys.add((record["target"], record["key"]))
+        elif op == "clear":
+            self._live_keys.clear()
+
+    def needs_compaction(self):
+        return self._log_records >= max(self.compact_min_records, self.compact_ratio * len(self._live_keys))
+
+    def compact(self, memory):
+        with self._lock:
+            snapshot = dict(memory)
+            snapshot[self.SEQ_KEY] = self._seq
+            _write_json_atomic(self.path, snapshot, fsync=self.fsync)
+            if self._log:
+                self._log.close()
+            self._log = open(self.log_path, "w")
+            self._log_records = 0
+            self._live_keys = _live_keys(memory)
+        logger.debug(f"🗜️ Memory journal compacted into {self.path}")
+
+    def close(self):
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+
+class SQLiteBackend(MemoryBackend):
+    """SQLite store: one row per entry, each journal record applied as a single statement batch."""
+
+    def __init__(self, path="memory_store.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            "layer TEXT NOT NULL, key TEXT NOT NULL, entry TEXT NOT NULL, "
+            "PRIMARY KEY (layer, key))"
+        )
+        self._conn.commit()
+
+    def load(self):
+        memory = empty_memory()
+        with self._lock:
+            for layer, key, entry in self._conn.execute("SELECT layer, key, entry FROM memory"):
+                memory.setdefault(layer, {})[key] = json.loads(entry)
+        return memory
+
+    def append(self, record):
+        op = record["op"]
+        with self._lock, self._conn:
+            if op == "put":
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO memory (layer, key, entry) VALUES (?, ?, ?)",
+                    (record["layer"], record["key"], json.dumps(record["entry"]))
+                )
+            elif op == "delete":
+                self._conn.executemany(
+                    "DELETE FROM memory WHERE layer = ? AND key = ?",
+                    [(record["layer"], key) for key in record["keys"]]
+                )
+            elif op == "promote":
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO memory (layer, key, entry) "
+                    "SELECT ?, key, entry FROM memory WHERE layer = ? AND key = ?",
+                    (record["target"], record["source"], record["key"])
+                )
+                self._conn.execute(
+                    "DELETE FROM memory WHERE layer = ? AND key = ?",
+                    (record["source"], record["key"])
+                )
+            elif op == "clear":
+                self._conn.execute("DELETE FROM memory")
+            else:
+                raise ValueError(f"Unknown memory journal op: {op}")
+
+    def compact(self, memory):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM memory")
+            self._conn.executemany(
+                "INSERT INTO memory (layer, key, entry) VALUES (?, ?, ?)",
+                [
+                    (layer, key, json.dumps(entry))
+                    for layer, entries in memory.items()
+                    for key, entry in entries.items()
+                ]
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,168 @@
+from collections import Counter, defaultdict
+import itertools
+
+
+def normalize_key(text):
+    return str(text).lower()
+
+
+class TrigramKeyIndex:
+    """
+    Inverted n-gram index over the keys of a single memory layer.
+    ---------------------------------
+    - Keys are normalized once on insert
+    - `query in key` is answered by intersecting n-gram postings
+    - `key in query` is answered by hashing query windows of each stored key length
+    - Insertion order is tracked so first-hit lookups keep dict iteration semantics
+    ---------------------------------
+    """
+
+    def __init__(self, n=3):
+        self.n = n
+        self._order = itertools.count()
+        self._keys = {}  # key -> (normalized, seq)
+        self._by_normalized = defaultdict(set)
+        self._postings = defaultdict(set)
+        self._lengths = Counter()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def _grams(self, text):
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, key):
+        if key in self._keys:
+            return
+        normalized = normalize_key(key)
+        self._keys[key] = (normalized, next(self._order))
+        self._by_normalized[normalized].add(key)
+        self._lengths[len(normalized)] += 1
+        for gram in self._grams(normalized):
+            self._postings[gram].add(key)
+
+    def remove(self, key):
+        item = self._keys.pop(key, None)
+        if item is None:
+            return
+        normalized = item[0]
+        self._discard(self._by_normalized, normalized, key)
+        self._lengths[len(normalized)] -= 1
+        if not self._lengths[len(normalized)]:
+            del self._lengths[len(normalized)]
+        for gram in self._grams(normalized):
+            self._discard(self._postings, gram, key)
+
+    @staticmethod
+    def _discard(mapping, bucket, key):
+        keys = mapping.get(bucket)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del mapping[bucket]
+
+    def clear(self):
+        self._keys.clear()
+        self._by_normalized.clear()
+        self._postings.clear()
+        self._lengths.clear()
+
+    def _containing(self, query):
+        if len(query) < self.n:
+            return {key for key, (normalized, _) in self._keys.items() if query in normalized}
+        postings = sorted((self._postings.get(gram, ()) for gram in self._grams(query)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        return {key for key in candidates if query in self._keys[key][0]}
+
+    def _contained_in(self, query):
+        found = set()
+        for length in self._lengths:
+            if length > len(query):
+                continue
+            for start in range(len(query) - length + 1):
+                found |= self._by_normalized.get(query[start:start + length], set())
+        return found
+
+    def matches(self, query):
+        """Return keys where key ⊆ query or query ⊆ key (case-insensitive)."""
+        normalized = normalize_key(query)
+        return self._containing(normalized) | self._contained_in(normalized)
+
+    def first_match(self, query):
+        matches = self.matches(query)
+        if not matches:
+            return None
+        return min(matches, key=lambda key: self._keys[key][1])
+
+    def score(self, key, query):
+        normalized, _ = self._keys[key]
+        query = normalize_key(query)
+        longest = max(len(normalized), len(query))
+        return 1.0 if not longest else min(len(normalized), len(query)) / longest
+
+    def sequence(self, key):
+        return self._keys[key][1]
+
+
+class MemoryIndex:
+    """Per-layer trigram indexes kept in step with MemoryManager mutations."""
+
+    def __init__(self, n=3):
+        self.n = n
+        self.layers = {}
+
+    def layer(self, name):
+        if name not in self.layers:
+            self.layers[name] = TrigramKeyIndex(self.n)
+        return self.layers[name]
+
+    def rebuild(self, memory):
+        self.layers = {}
+        for name, entries in memory.items():
+            if isinstance(entries, dict):
+                layer = self.layer(name)
+                for key in entries:
+                    layer.add(key)
+
+    def add(self, layer, key):
+        self.layer(layer).add(key)
+
+    def remove(self, layer, keys):
+        index = self.layers.get(layer)
+        if index is not None:
+            for key in keys:
+                index.remove(key)
+
+    def move(self, key, source, target):
+        self.remove(source, [key])
+        self.add(target, key)
+
+    def clear(self):
+        self.layers = {}
+
+    def first_match(self, layer, query):
+        index = self.layers.get(layer)
+        return index.first_match(query) if index is not None else None
+
+    def ranked_matches(self, query, layers, limit=None):
+        """All matches across `layers`, best coverage first, then layer order, then insertion order."""
+        ranked = []
+        for priority, name in enumerate(layers):
+            index = self.layers.get(name)
+            if index is None:
+                continue
+            for key in index.matches(query):
+                ranked.append((-index.score(key, query), priority, index.sequence(key), name, key))
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(name, key, -neg_score) for neg_score, _, _, name, key in ranked]
@@ -1,11 +1,23 @@
+import hashlib
 import json
 import os
 import time
-from utils.prompt_utils import call_gpt
+import heapq
+import threading
+import atexit
+from llm_cache import cached_call_gpt
 from index import delta_memory, tau_timeperception, phi_focus
+from memory_backends import JournaledBackend
+from memory_index import MemoryIndex
+from memory_vectors import HashingEmbedder, VectorIndex
+from ledger import MerkleLedger, get_ledger
 import logging
 
 logger = logging.getLogger("ANGELA.MemoryManager")
+call_gpt = cached_call_gpt("memory_manager")
+
+_registry = {}
+_registry_lock = threading.Lock()
 
 class MemoryManager:
     """
@@ -13,65 +25,187 @@ class MemoryManager:
     ---------------------------------
     - Hierarchical memory storage (STM, LTM, SelfReflections)
     - Automatic memory decay and promotion mechanisms
-    - Semantic vector search scaffold for advanced retrieval
+    - Semantic vector search (hashing embedder, NumPy cosine top-k, IVF when large);
+      entries are embedded in batches on the first semantic query, not on store
     - Memory refinement loops for maintaining relevance and accuracy
     - Trait-modulated STM decay and retrieval fidelity
     - φ(x,t) attention modulation for selective memory prioritization
     - λ-narrative integration: episodic tagging and timeline coherence
     - ω-reflection logs for introspective modeling
+    - Pluggable storage backends (journaled by default, JSON or SQLite)
+    - Trigram-indexed fuzzy retrieval with optional ranked matches
+    - Heap-ordered STM expiry on access or via a background sweeper
     ---------------------------------
     """
 
-    def __init__(self, path="memory_store.json", stm_lifetime=300):
+    def __init__(self, path="memory_store.json", stm_lifetime=300, backend=None, embedder=None):
         self.path = path
         self.stm_lifetime = stm_lifetime
-        if not os.path.exists(self.path):
-            with open(self.path, "w") as f:
-                json.dump({"STM": {}, "LTM": {}, "SelfReflections": {}}, f)
+        self.backend = backend or JournaledBackend(path)
+        self._lock = threading.RLock()
+        self._expiry = []
+        self._sweeper = None
+        self._sweeper_stop = threading.Event()
+        self._refcount = 0
+        self.index = MemoryIndex()
+        self._unembedded = set()
+        self.embedder = embedder or HashingEmbedder()
+        self.vectors = VectorIndex.load(f"{path}.vec", dim=self.embedder.dim)
         self.memory = self.load_memory()
+        self._sync_vectors()
 
     def load_memory(self):
-        with open(self.path, "r") as f:
-            memory = json.load(f)
-        if "SelfReflections" not in memory:
-            memory["SelfReflections"] = {}
+        memory = self.backend.load()
+        for layer in ("STM", "LTM", "SelfReflections"):
+            memory.setdefault(layer, {})
+        self.index.rebuild(memory)
+        self._expiry = [(entry["timestamp"], key) for key, entry in memory["STM"].items()]
+        heapq.heapify(self._expiry)
         self._decay_stm(memory)
         return memory
 
     def _decay_stm(self, memory):
+        """Pop STM entries older than the trait-adjusted lifetime off the expiry heap and delete them in one batch."""
         current_time = time.time()
         decay_rate = delta_memory(current_time % 1e-18)
         lifetime_adjusted = self.stm_lifetime * (1.0 / decay_rate)
+        cutoff = current_time - lifetime_adjusted
 
+        stm = memory.get("STM", {})
         expired_keys = []
-        for key, entry in memory.get("STM", {}).items():
-            if current_time - entry["timestamp"] > lifetime_adjusted:
+        while self._expiry and self._expiry[0][0] < cutoff:
+            timestamp, key = heapq.heappop(self._expiry)
+            entry = stm.get(key)
+            if entry is not None and entry["timestamp"] == timestamp:
                 expired_keys.append(key)
         for key in expired_keys:
             logger.info(f"⏰ STM entry expired: {key}")
             del memory["STM"][key]
         if expired_keys:
-            self._persist_memory(memory)
+            self.index.remove("STM", expired_keys)
+            for key in expired_keys:
+                self.vectors.remove(("STM", key))
+                self._unembedded.discard(("STM", key))
+            self._commit({"op": "delete", "layer": "STM", "keys": expired_keys}, memory)
+        if len(self._expiry) > 2 * len(stm) + 64:
+            self._expiry = [(entry["timestamp"], key) for key, entry in stm.items()]
+            heapq.heapify(self._expiry)
+
+    def expire_stm(self):
+        with self._lock:
+            self._decay_stm(self.memory)
+
+    def start_expiry_sweeper(self, interval=30.0):
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
 
-    def retrieve_context(self, query, fuzzy_match=True):
+        def sweep():
+            while not self._sweeper_stop.wait(interval):
+                self.expire_stm()
+
+        self._sweeper = threading.Thread(target=sweep, name="STMExpirySweeper", daemon=True)
+        self._sweeper.start()
+        logger.info(f"🧹 STM expiry sweeper started (every {interval}s).")
+
+    def stop_expiry_sweeper(self):
+        if self._sweeper:
+            self._sweeper_stop.set()
+            self._sweeper.join()
+            self._sweeper = None
+
+    def retrieve_context(self, query, fuzzy_match=True, rank=False, limit=None):
+        """
+        Look up prior memory by key. Fuzzy matching returns the first key (in
+        layer, then insertion order) that contains or is contained in `query`;
+        with `rank=True` it returns every match as a list of
+        {layer, key, score, data} dicts, best key/query coverage first.
+        """
         logger.info(f"🔍 Retrieving context for query: {query}")
         trait_boost = tau_timeperception(time.time() % 1e-18) * phi_focus(query)
+        layers = ["STM", "LTM", "SelfReflections"]
+
+        with self._lock:
+            self._decay_stm(self.memory)
+            if fuzzy_match and rank:
+                ranked = self.index.ranked_matches(query, layers, limit=limit)
+                logger.debug(f"🗕 Ranked {len(ranked)} matches | τϕ_boost: {trait_boost:.2f}")
+                return [
+                    {"layer": layer, "key": key, "score": score, "data": self.memory[layer][key]["data"]}
+                    for layer, key, score in ranked
+                ]
 
-        for layer in ["STM", "LTM", "SelfReflections"]:
-            if fuzzy_match:
-                for key, value in self.memory[layer].items():
-                    if key.lower() in query.lower() or query.lower() in key.lower():
+            for layer in layers:
+                if fuzzy_match:
+                    key = self.index.first_match(layer, query)
+                    if key is not None:
                         logger.debug(f"🗕 Found match in {layer}: {key} | τϕ_boost: {trait_boost:.2f}")
-                        return value["data"]
-            else:
-                entry = self.memory[layer].get(query)
-                if entry:
-                    logger.debug(f"🗕 Found exact match in {layer}: {query} | τϕ_boost: {trait_boost:.2f}")
-                    return entry["data"]
+                        return self.memory[layer][key]["data"]
+                else:
+                    entry = self.memory[layer].get(query)
+                    if entry:
+                        logger.debug(f"🗕 Found exact match in {layer}: {query} | τϕ_boost: {trait_boost:.2f}")
+                        return entry["data"]
 
         logger.info("❌ No relevant prior memory found.")
         return "No relevant prior memory."
 
+    def retrieve_similar(self, query, k=5, layers=None):
+        """Semantic top-k recall: [{layer, key, score, data}] ordered by cosine similarity."""
+        logger.info(f"🧲 Retrieving {k} similar memories for: {query}")
+        vector = self.embedder.embed_batch([str(query)])[0]
+        fetch = k
+        with self._lock:
+            self._decay_stm(self.memory)
+            self._embed_pending()
+            while True:
+                hits = self.vectors.search(vector, fetch)
+                results = [
+                    {"layer": layer, "key": key, "score": score, "data": self.memory[layer][key]["data"]}
+                    for (layer, key), score in hits
+                    if (layers is None or layer in layers) and key in self.memory.get(layer, {})
+                ]
+                if len(results) >= k or fetch >= len(self.vectors):
+                    return results[:k]
+                fetch *= 4
+
+    def _embedding_text(self, key, data):
+        return f"{key} {data}"
+
+    @staticmethod
+    def _vector_version(entry):
+        # every store writes a fresh entry with a new timestamp, so it versions the embedded text
+        return entry.get("timestamp")
+
+    def _embed(self, items):
+        entries = [(key, self.memory[layer][key]) for layer, key in items]
+        texts = [self._embedding_text(key, entry["data"]) for key, entry in entries]
+        self.vectors.add_batch(items, self.embedder.embed_batch(texts), [self._vector_version(entry) for _, entry in entries])
+
+    def _embed_pending(self):
+        """Embed entries stored since the last semantic query, in one batch."""
+        pending = [(layer, key) for layer, key in self._unembedded if key in self.memory.get(layer, {})]
+        self._unembedded.clear()
+        if pending:
+            self._embed(pending)
+
+    def _sync_vectors(self):
+        """
+        Drop vectors of deleted entries and queue entries with no vector, or a
+        vector older than the entry, for the next semantic query. Versions are
+        compared as persisted; nothing is hashed or embedded at startup.
+        """
+        expected = {
+            (layer, key): self._vector_version(entry)
+            for layer, entries in self.memory.items() for key, entry in entries.items()
+        }
+        for stale in set(self.vectors.keys()) - set(expected):
+            self.vectors.remove(stale)
+        self._unembedded.update(
+            item for item, version in expected.items()
+            if version is None or self.vectors.version(item) != version
+        )
+
     def store(self, query, output, layer="STM", intent=None, agent="ANGELA", outcome=None, goal_id=None):
         logger.info(f"📝 Storing memory in {layer}: {query}")
         entry = {
@@ -82,10 +216,16 @@ class MemoryManager:
             "outcome": outcome,
             "goal_id": goal_id
         }
-        if layer not in self.memory:
-            self.memory[layer] = {}
-        self.memory[layer][query] = entry
-        self._persist_memory(self.memory)
+        with self._lock:
+            self._decay_stm(self.memory)
+            if layer not in self.memory:
+                self.memory[layer] = {}
+            self.memory[layer][query] = entry
+            if layer == "STM":
+                heapq.heappush(self._expiry, (entry["timestamp"], query))
+            self.index.add(layer, query)
+            self._unembedded.add((layer, query))
+            self._commit({"op": "put", "layer": layer, "key": query, "entry": entry})
 
     def store_reflection(self, summary_text, intent="self_reflection", agent="ANGELA", goal_id=None):
         key = f"Reflection_{time.strftime('%Y%m%d_%H%M%S')}"
@@ -93,12 +233,18 @@ class MemoryManager:
         logger.info(f"🪞 Stored self-reflection: {key}")
 
     def promote_to_ltm(self, query):
-        if query in self.memory["STM"]:
-            self.memory["LTM"][query] = self.memory["STM"].pop(query)
-            logger.info(f"⬆️ Promoted '{query}' from STM to LTM.")
-            self._persist_memory(self.memory)
-        else:
-            logger.warning(f"⚠️ Cannot promote: '{query}' not found in STM.")
+        with self._lock:
+            if query in self.memory["STM"]:
+                self.memory["LTM"][query] = self.memory["STM"].pop(query)
+                self.index.move(query, "STM", "LTM")
+                self.vectors.rename(("STM", query), ("LTM", query))
+                if ("STM", query) in self._unembedded:
+                    self._unembedded.discard(("STM", query))
+                    self._unembedded.add(("LTM", query))
+                logger.info(f"⬆️ Promoted '{query}' from STM to LTM.")
+                self._commit({"op": "promote", "key": query, "source": "STM", "target": "LTM"})
+            else:
+                logger.warning(f"⚠️ Cannot promote: '{query}' not found in STM.")
 
     def refine_memory(self, query):
         logger.info(f"♻️ Refining memory for: {query}")
@@ -116,24 +262,91 @@ class MemoryManager:
 
     def clear_memory(self):
         logger.warning("🗑️ Clearing all memory layers...")
-        self.memory = {"STM": {}, "LTM": {}, "SelfReflections": {}}
-        self._persist_memory(self.memory)
+        with self._lock:
+            self.memory = {"STM": {}, "LTM": {}, "SelfReflections": {}}
+            self._expiry = []
+            self.index.clear()
+            self.vectors.clear()
+            self._unembedded.clear()
+            self._commit({"op": "clear"})
 
     def list_memory_keys(self, layer=None):
-        if layer:
-            logger.info(f"📃 Listing memory keys in {layer}")
-            return list(self.memory.get(layer, {}).keys())
-        return {
-            "STM": list(self.memory["STM"].keys()),
-            "LTM": list(self.memory["LTM"].keys()),
-            "SelfReflections": list(self.memory["SelfReflections"].keys())
-        }
+        with self._lock:
+            self._decay_stm(self.memory)
+            if layer:
+                logger.info(f"📃 Listing memory keys in {layer}")
+                return list(self.memory.get(layer, {}).keys())
+            return {
+                "STM": list(self.memory["STM"].keys()),
+                "LTM": list(self.memory["LTM"].keys()),
+                "SelfReflections": list(self.memory["SelfReflections"].keys())
+            }
+
+    def save_state(self, path="memory_snapshot.json"):
+        tmp_path = f"{path}.tmp"
+        with self._lock, open(tmp_path, "w") as f:
+            json.dump(self.memory, f)
+        os.replace(tmp_path, path)
+        logger.debug(f"📸 Memory snapshot saved to {path}.")
+
+    def _commit(self, record, memory=None):
+        memory = self.memory if memory is None else memory
+        self.backend.append(record)
+        if self.backend.needs_compaction():
+            self._persist_memory(memory)
 
     def _persist_memory(self, memory):
-        with open(self.path, "w") as f:
-            json.dump(memory, f, indent=2)
+        self.backend.compact(memory)
+        self.vectors.persist(f"{self.path}.vec")
         logger.debug("💾 Memory persisted to disk.")
 
+    def close(self):
+        self.stop_expiry_sweeper()
+        with self._lock:
+            self.vectors.persist(f"{self.path}.vec")
+            self.backend.close()
+
+
+def acquire_memory_manager(path="memory_store.json", **kwargs):
+    """
+    Return the process-wide MemoryManager for `path`, loading it on first use.
+    Every caller shares one instance (and so one writer) per store, keyed by
+    the resolved path; pair each call with `release_memory_manager` to close
+    the store once unused. Stores still open are closed at interpreter shutdown.
+    Import this as `from memory_manager import ...` only: a second import
+    name would load a second module, registry and writer.
+    """
+    key = os.path.realpath(path)
+    with _registry_lock:
+        manager = _registry.get(key)
+        if manager is None:
+            manager = MemoryManager(path, **kwargs)
+            _registry[key] = manager
+            logger.info(f"🗂️ Opened shared memory store: {path}")
+        manager._refcount += 1
+        return manager
+
+
+def release_memory_manager(manager):
+    key = os.path.realpath(manager.path)
+    with _registry_lock:
+        manager._refcount -= 1
+        if manager._refcount > 0:
+            return
+        if _registry.get(key) is manager:
+            del _registry[key]
+    manager.close()
+    logger.info(f"🗂️ Closed shared memory store: {manager.path}")
+
+
+@atexit.register
+def _close_shared_managers():
+    with _registry_lock:
+        managers = list(_registry.values())
+        _registry.clear()
+    for manager in managers:
+        manager.close()
+
 
 # --- ANGELA v3.x UPGRADE PATCH ---
 
@@ -161,15 +374,12 @@ def _repair_narrative_thread(self):
 # --- ANGELA v3.x UPGRADE PATCH ---
 
 def log_event_with_hash(self, event_data):
-    """Log events/decisions with SHA-256 chaining for transparency."""
-    last_hash = getattr(self, 'last_hash', '')
-    event_str = str(event_data) + last_hash
-    current_hash = hashlib.sha256(event_str.encode('utf-8')).hexdigest()
-    self.last_hash = current_hash
-    if not hasattr(self, 'ledger'):
-        self.ledger = []
-    self.ledger.append({'event': event_data, 'hash': current_hash})
-    print(f"[ANGELA UPGRADE] Event logged with hash: {current_hash}")
+    """Log events/decisions to a Merkle-batched ledger for transparency."""
+    if not isinstance(getattr(self, 'ledger', None), MerkleLedger):
+        self.ledger = get_ledger(type(self).__name__)
+    seq = self.ledger.append({'event': event_data})
+    print(f"[ANGELA UPGRADE] Event logged to ledger {self.ledger.name} at seq {seq}")
+    return seq
 
 def audit_state_hash(self, state=None):
     """Audit qualia-state or memory state by producing an integrity hash."""
@@ -0,0 +1,325 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import logging
+import numpy as np
+
+logger = logging.getLogger("ANGELA.MemoryVectors")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """
+    Offline feature-hashing embedder.
+    Word unigrams, word bigrams and character trigrams are hashed (blake2b,
+    stable across processes) into signed buckets and L2-normalized.
+    Any object exposing `dim` and `embed_batch(texts) -> (n, dim) float32`
+    can be used in its place.
+    """
+
+    def __init__(self, dim=256, max_chars=2000):
+        self.dim = dim
+        self.max_chars = max_chars
+
+    def _features(self, text):
+        text = str(text)[:self.max_chars].lower()
+        words = _TOKEN_RE.findall(text)
+        features = list(words)
+        features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, text):
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                out[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+class VectorIndex:
+    """
+    Cosine top-k index over a contiguous float32 matrix.
+    ---------------------------------
+    - Rows are unit vectors; search is one matrix-vector product plus argpartition
+    - Deletes swap the last row into the hole, so the matrix stays dense
+    - Past `ivf_threshold` rows an IVF partitioning (k-means centroids) is
+      trained and only the `nprobe` closest partitions are scored
+    - Each vector can carry a `version` (e.g. a hash of the embedded text) so
+      callers can detect vectors that no longer match their source
+    - `save`/`load` persist the matrix as .npy (with spare rows) and reopen it
+      memory-mapped copy-on-write; `persist` appends only the rows changed
+      since the last save to a delta log and rewrites the .npy once the log
+      outgrows `delta_ratio` times the index
+    ---------------------------------
+    """
+
+    def __init__(self, dim, ivf_threshold=50000, nprobe=8, initial_capacity=1024, delta_ratio=0.5, delta_min_records=1024):
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.delta_ratio = delta_ratio
+        self.delta_min_records = delta_min_records
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._size = 0
+        self._keys = []
+        self._rows = {}
+        self._versions = {}
+        self._dirty = {}  # key -> True (written) / False (removed) since the last save or persist
+        self._delta_records = 0
+        self._full_save = True
+        self._centroids = None
+        self._assign = None
+        self._lists = None
+        self._trained_size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def keys(self):
+        return list(self._keys)
+
+    def version(self, key):
+        return self._versions.get(key)
+
+    def _writable(self, extra=0):
+        # a copy-on-write memmap is written in place; only outgrowing it copies
+        needed = self._size + extra
+        if needed > self._matrix.shape[0]:
+            capacity = max(needed, 2 * self._matrix.shape[0], 1024)
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+            if self._assign is not None:
+                assign = np.full(capacity, -1, dtype=np.int32)
+                assign[:self._size] = self._assign[:self._size]
+                self._assign = assign
+
+    def add(self, key, vector, version=None):
+        self._versions[key] = version
+        self._dirty[key] = True
+        row = self._rows.get(key)
+        if row is not None:
+            self._writable()
+            self._unassign(row)
+            self._matrix[row] = vector
+            self._assign_row(row)
+            return
+        self._writable(extra=1)
+        row = self._size
+        self._matrix[row] = vector
+        self._keys.append(key)
+        self._rows[key] = row
+        self._size += 1
+        self._assign_row(row)
+        if self._size >= self.ivf_threshold and self._size >= 2 * self._trained_size:
+            self.train()
+
+    def add_batch(self, keys, vectors, versions=None):
+        for key, vector, version in zip(keys, vectors, versions or [None] * len(keys)):
+            self.add(key, vector, version)
+
+    def remove(self, key):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._versions.pop(key, None)
+        self._dirty[key] = False
+        self._writable()
+        last = self._size - 1
+        self._unassign(row)
+        if row != last:
+            moved_key = self._keys[last]
+            self._unassign(last)
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = moved_key
+            self._rows[moved_key] = row
+            self._assign_row(row)
+        self._keys.pop()
+        self._size -= 1
+
+    def rename(self, key, new_key):
+        if key not in self._rows or key == new_key:
+            return
+        self.remove(new_key)
+        row = self._rows.pop(key)
+        self._keys[row] = new_key
+        self._rows[new_key] = row
+        self._versions[new_key] = self._versions.pop(key, None)
+        self._dirty[key] = False
+        self._dirty[new_key] = True
+
+    def clear(self):
+        self.__init__(self.dim, self.ivf_threshold, self.nprobe, delta_ratio=self.delta_ratio,
+                      delta_min_records=self.delta_min_records)
+
+    # --- IVF partitioning ---
+
+    def train(self, nlist=None, iterations=8, sample=20000, seed=0):
+        if self._size == 0:
+            return
+        data = self._matrix[:self._size]
+        nlist = nlist or max(1, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(seed)
+        sample_rows = rng.choice(self._size, size=min(sample, self._size), replace=False)
+        training = data[sample_rows]
+        centroids = training[rng.choice(len(training), size=min(nlist, len(training)), replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(training @ centroids.T, axis=1)
+            for c in range(len(centroids)):
+                members = training[labels == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[c] = centroid / norm if norm > 0 else centroid
+        self._centroids = centroids
+        self._assign = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        self._assign[:self._size] = np.argmax(data @ centroids.T, axis=1)
+        self._lists = [set() for _ in range(len(centroids))]
+        for row, c in enumerate(self._assign[:self._size]):
+            self._lists[c].add(row)
+        self._trained_size = self._size
+        logger.info(f"🧭 IVF index trained: {len(centroids)} partitions over {self._size} vectors")
+
+    def _assign_row(self, row):
+        if self._centroids is None:
+            return
+        c = int(np.argmax(self._centroids @ self._matrix[row]))
+        self._assign[row] = c
+        self._lists[c].add(row)
+
+    def _unassign(self, row):
+        if self._centroids is None:
+            return
+        c = self._assign[row]
+        if c >= 0:
+            self._lists[c].discard(row)
+            self._assign[row] = -1
+
+    # --- Search ---
+
+    def search(self, vector, k=5):
+        if self._size == 0 or k <= 0:
+            return []
+        vector = np.asarray(vector, dtype=np.float32)
+        if self._centroids is not None:
+            probes = np.argsort(self._centroids @ vector)[::-1][:self.nprobe]
+            rows = np.fromiter((r for c in probes for r in self._lists[c]), dtype=np.int64)
+        else:
+            rows = None
+        candidates = self._matrix[:self._size] if rows is None else self._matrix[rows]
+        if len(candidates) == 0:
+            return []
+        scores = candidates @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if rows is not None:
+            return [(self._keys[rows[i]], float(scores[i])) for i in top]
+        return [(self._keys[i], float(scores[i])) for i in top]
+
+    # --- Persistence ---
+
+    def save(self, prefix):
+        """Full snapshot: matrix plus spare rows as .npy, keys and versions as .json; resets the delta log."""
+        capacity = min(self._matrix.shape[0], self._size + max(1024, self._size // 4))
+        np.save(f"{prefix}.tmp.npy", self._matrix[:capacity])
+        with open(f"{prefix}.tmp.json", "w") as f:
+            json.dump({
+                "dim": self.dim,
+                "size": self._size,
+                "keys": self._keys,
+                "versions": [self._versions.get(key) for key in self._keys],
+            }, f)
+        os.replace(f"{prefix}.tmp.npy", f"{prefix}.npy")
+        os.replace(f"{prefix}.tmp.json", f"{prefix}.json")
+        if os.path.exists(f"{prefix}.delta"):
+            os.remove(f"{prefix}.delta")
+        self._dirty = {}
+        self._delta_records = 0
+        self._full_save = False
+
+    def persist(self, prefix):
+        """Append rows changed since the last save/persist to `<prefix>.delta`; fall back to save() when due."""
+        if not self._dirty and not self._full_save:
+            return
+        if self._full_save or self._delta_records + len(self._dirty) >= max(self.delta_min_records, self.delta_ratio * self._size):
+            self.save(prefix)
+            return
+        with open(f"{prefix}.delta", "a") as f:
+            for key, written in self._dirty.items():
+                if written and key in self._rows:
+                    vector = np.ascontiguousarray(self._matrix[self._rows[key]], dtype="<f4")
+                    record = {"op": "put", "key": key, "version": self._versions.get(key),
+                              "vector": base64.b64encode(vector.tobytes()).decode("ascii")}
+                else:
+                    record = {"op": "remove", "key": key}
+                f.write(json.dumps(record) + "\n")
+        self._delta_records += len(self._dirty)
+        self._dirty = {}
+
+    def _replay_delta(self, path):
+        replayed = 0
+        valid_bytes = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated record")
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"⚠️ Dropping torn vector delta record in {path}")
+                    break
+                valid_bytes += len(line)
+                key = _as_key(record["key"])
+                if record["op"] == "put":
+                    self.add(key, np.frombuffer(base64.b64decode(record["vector"]), dtype="<f4"), record.get("version"))
+                else:
+                    self.remove(key)
+                replayed += 1
+        if valid_bytes < os.path.getsize(path):
+            os.truncate(path, valid_bytes)
+        return replayed
+
+    @classmethod
+    def load(cls, prefix, dim, **kwargs):
+        index = cls(dim, **kwargs)
+        if not (os.path.exists(f"{prefix}.npy") and os.path.exists(f"{prefix}.json")):
+            return index
+        with open(f"{prefix}.json", "r") as f:
+            meta = json.load(f)
+        matrix = np.load(f"{prefix}.npy", mmap_mode="c")
+        size = meta.get("size", len(meta["keys"]))
+        if meta.get("dim") != dim or matrix.ndim != 2 or matrix.shape[1] != dim or matrix.shape[0] < size or size != len(meta["keys"]):
+            logger.warning(f"⚠️ Ignoring incompatible vector store at {prefix}")
+            return index
+        index._matrix = matrix
+        index._size = size
+        index._keys = [_as_key(key) for key in meta["keys"]]
+        index._rows = {key: row for row, key in enumerate(index._keys)}
+        index._versions = dict(zip(index._keys, meta.get("versions") or [None] * size))
+        index._full_save = False
+        if os.path.exists(f"{prefix}.delta"):
+            index._delta_records = index._replay_delta(f"{prefix}.delta")
+            index._dirty = {}
+        if index._size >= index.ivf_threshold:
+            index.train()
+        return index
+
+
+def _as_key(key):
+    return tuple(key) if isinstance(key, list) else key
@@ -1,17 +1,33 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from toca_simulation import run_simulation
 import logging
 import time
 import numpy as np
-from index import (
-    epsilon_emotion, beta_concentration, theta_memory, gamma_creativity,
-    delta_sleep, mu_morality, iota_intuition, phi_physical, eta_empathy,
-    omega_selfawareness, kappa_culture, lambda_linguistics, chi_culturevolution,
-    psi_history, zeta_spirituality, xi_collective, tau_timeperception,
-    phi_scalar
-)
+from index import phi_scalar, trait_bank
 
 logger = logging.getLogger("ANGELA.MetaCognition")
+call_gpt = cached_call_gpt("meta_cognition")
+
+# diagnostic label -> TraitBank field
+DIAGNOSTIC_TRAITS = {
+    "emotion": "epsilon_emotion",
+    "concentration": "beta_concentration",
+    "memory": "theta_memory",
+    "creativity": "gamma_creativity",
+    "sleep": "delta_sleep",
+    "morality": "mu_morality",
+    "intuition": "iota_intuition",
+    "physical": "phi_physical",
+    "empathy": "eta_empathy",
+    "self_awareness": "omega_selfawareness",
+    "culture": "kappa_culture",
+    "linguistics": "lambda_linguistics",
+    "culturevolution": "chi_culturevolution",
+    "history": "psi_history",
+    "spirituality": "zeta_spirituality",
+    "collective": "xi_collective",
+    "time_perception": "tau_timeperception",
+}
 
 class MetaCognition:
     """
@@ -36,12 +52,12 @@ class MetaCognition:
         self.belief_rules = {}  # Optional: reference for `_detect_value_drift`
 
     def log_inference(self, rule_id, rule_desc, context, result):
-    self.inference_log.append({
-        "rule_id": rule_id,
-        "description": rule_desc,
-        "context": context,
-        "result": result
-    })
+        self.inference_log.append({
+            "rule_id": rule_id,
+            "description": rule_desc,
+            "context": context,
+            "result": result
+        })
 
     def analyze_inference_rules(self):
         problematic = []
@@ -63,7 +79,7 @@ class MetaCognition:
         intrinsic_goals = []
 
         if self.last_diagnostics:
-            current = self.run_self_diagnostics(return_only=True)
+            current = self.run_self_diagnostics(return_only=True, traits=trait_bank.snapshot(t, x=1e-21))
             drifted = {
                 trait: round(current[trait] - self.last_diagnostics.get(trait, 0.0), 4)
                 for trait in current
@@ -390,30 +406,14 @@ class MetaCognition:
             }, module="MetaCognition")
         return response
 
-    def run_self_diagnostics(self, return_only=False):
+    def run_self_diagnostics(self, return_only=False, traits=None):
         logger.info("Running self-diagnostics for meta-cognition module.")
         t = time.time() % 1e-18
         phi = phi_scalar(t)
-        diagnostics = {
-            "emotion": epsilon_emotion(t),
-            "concentration": beta_concentration(t),
-            "memory": theta_memory(t),
-            "creativity": gamma_creativity(t),
-            "sleep": delta_sleep(t),
-            "morality": mu_morality(t),
-            "intuition": iota_intuition(t),
-            "physical": phi_physical(t),
-            "empathy": eta_empathy(t),
-            "self_awareness": omega_selfawareness(t),
-            "culture": kappa_culture(t, 1e-21),
-            "linguistics": lambda_linguistics(t),
-            "culturevolution": chi_culturevolution(t),
-            "history": psi_history(t),
-            "spirituality": zeta_spirituality(t),
-            "collective": xi_collective(t, 1e-21),
-            "time_perception": tau_timeperception(t),
-            "ϕ_scalar": phi
-        }
+        if traits is None:
+            traits = trait_bank.snapshot(t, x=1e-21)
+        diagnostics = {label: traits[name] for label, name in DIAGNOSTIC_TRAITS.items()}
+        diagnostics["ϕ_scalar"] = phi
 
         if return_only:
             return diagnostics
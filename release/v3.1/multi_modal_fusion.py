@@ -1,9 +1,10 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from index import alpha_attention, sigma_sensation, phi_physical
 import time
 import logging
 
 logger = logging.getLogger("ANGELA.MultiModalFusion")
+call_gpt = cached_call_gpt("multi_modal_fusion")
 
 class MultiModalFusion:
     """
@@ -0,0 +1,290 @@
+import atexit
+import json
+import math
+import os
+import threading
+import time
+import logging
+from array import array
+from collections.abc import MutableMapping
+
+logger = logging.getLogger("ANGELA.OmegaState")
+
+DEFAULT_RETENTION = 10000
+DEFAULT_SEGMENT_SIZE = 1000
+
+
+class OmegaStream:
+    """
+    Bounded, thread-safe Ω event stream.
+    ---------------------------------
+    - Fixed-capacity ring buffer; the oldest events are evicted past `retention`
+    - Ingest timestamps and scalar trait values are kept in columnar arrays
+      alongside the events (`timestamps()`, `trait_column()`, `since()`)
+    - With `spill_dir` set, evicted events are written out in JSONL segments
+      instead of being dropped
+    - Reads like a list: len(), iteration, reversed(), indexing and slicing
+    ---------------------------------
+    """
+
+    def __init__(self, name, retention=DEFAULT_RETENTION, spill_dir=None, segment_size=DEFAULT_SEGMENT_SIZE):
+        self.name = name
+        self.lock = threading.RLock()
+        self._spill_lock = threading.Lock()
+        self.spill_dir = spill_dir
+        self.segment_size = segment_size
+        self._reset(retention)
+
+    def _reset(self, retention):
+        self.retention = retention
+        self._events = [None] * retention
+        self._times = array("d", bytes(8 * retention))
+        self._traits = {}
+        self._start = 0
+        self._count = 0
+        self._seq = 0
+        self._spill_buffer = []
+
+    # --- Writes ---
+
+    def append(self, event):
+        with self.lock:
+            spilled = self._place(event, time.time())
+            self._seq += 1
+            first_spilled_seq = self._seq - self._count - len(spilled)
+        if spilled:
+            self._write_segment(first_spilled_seq, spilled)
+
+    def _place(self, event, timestamp):
+        """Write one event into the ring; returns a full spill segment if one is ready."""
+        spilled = []
+        slot = (self._start + self._count) % self.retention
+        if self._count == self.retention:
+            if self.spill_dir:
+                self._spill_buffer.append(self._events[slot])
+                if len(self._spill_buffer) >= self.segment_size:
+                    spilled, self._spill_buffer = self._spill_buffer, []
+            self._start = (self._start + 1) % self.retention
+        else:
+            self._count += 1
+        self._events[slot] = event
+        self._times[slot] = timestamp
+        for column in self._traits.values():
+            column[slot] = math.nan
+        traits = event.get("traits") if isinstance(event, dict) else None
+        if isinstance(traits, dict):
+            for trait, value in traits.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self._column(trait)[slot] = value
+        return spilled
+
+    def extend(self, events):
+        for event in events:
+            self.append(event)
+
+    def _column(self, trait):
+        column = self._traits.get(trait)
+        if column is None:
+            column = self._traits[trait] = array("d", [math.nan]) * self.retention
+        return column
+
+    def clear(self):
+        with self.lock:
+            self.flush()
+            self._reset(self.retention)
+
+    def resize(self, retention):
+        with self.lock:
+            slots = self._slots()
+            dropped, kept = slots[:max(0, len(slots) - retention)], slots[max(0, len(slots) - retention):]
+            buffered = self._spill_buffer + ([self._events[slot] for slot in dropped] if self.spill_dir else [])
+            retained = [(self._events[slot], self._times[slot]) for slot in kept]
+            seq = self._seq
+            self._reset(retention)
+            for event, timestamp in retained:
+                self._place(event, timestamp)
+            self._seq = seq
+            self._spill_buffer = buffered
+
+    # --- Spill segments ---
+
+    def _write_segment(self, first_seq, events):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{self.name}-{first_seq:012d}.jsonl")
+        with self._spill_lock, open(path, "w") as f:
+            for event in events:
+                f.write(json.dumps(event, default=str) + "\n")
+        logger.debug(f"📤 Spilled {len(events)} Ω {self.name} events to {path}")
+
+    def flush(self):
+        """Write any buffered evictions as a (short) segment."""
+        with self.lock:
+            spilled, self._spill_buffer = self._spill_buffer, []
+            first_seq = self._seq - self._count - len(spilled)
+        if spilled and self.spill_dir:
+            self._write_segment(first_seq, spilled)
+
+    def segments(self):
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return []
+        prefix = f"{self.name}-"
+        return sorted(
+            os.path.join(self.spill_dir, name) for name in os.listdir(self.spill_dir)
+            if name.startswith(prefix) and name.endswith(".jsonl")
+        )
+
+    @staticmethod
+    def read_segment(path):
+        with open(path, "r") as f:
+            return [json.loads(line) for line in f]
+
+    # --- Reads ---
+
+    def _slots(self):
+        return [(self._start + i) % self.retention for i in range(self._count)]
+
+    def snapshot(self):
+        with self.lock:
+            return [self._events[slot] for slot in self._slots()]
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __reversed__(self):
+        return reversed(self.snapshot())
+
+    def __getitem__(self, index):
+        with self.lock:
+            if isinstance(index, slice):
+                return [self._events[(self._start + i) % self.retention] for i in range(self._count)[index]]
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError(f"Ω {self.name} index out of range")
+            return self._events[(self._start + index) % self.retention]
+
+    def recent(self, n):
+        return self[-n:] if n > 0 else []
+
+    def timestamps(self):
+        with self.lock:
+            return [self._times[slot] for slot in self._slots()]
+
+    def trait_column(self, trait):
+        """Values of `trait` per retained event (NaN where the event did not carry it)."""
+        with self.lock:
+            column = self._traits.get(trait)
+            if column is None:
+                return [math.nan] * self._count
+            return [column[slot] for slot in self._slots()]
+
+    def trait_names(self):
+        with self.lock:
+            return list(self._traits)
+
+    def since(self, timestamp):
+        """Events ingested at or after `timestamp` (binary search over the time column)."""
+        with self.lock:
+            low, high = 0, self._count
+            while low < high:
+                mid = (low + high) // 2
+                if self._times[(self._start + mid) % self.retention] < timestamp:
+                    low = mid + 1
+                else:
+                    high = mid
+            return self[low:]
+
+    @property
+    def total_appended(self):
+        return self._seq
+
+
+class OmegaTraits(MutableMapping):
+    """Current Ω trait values plus a bounded, columnar history of every update."""
+
+    def __init__(self, retention=DEFAULT_RETENTION, spill_dir=None):
+        self.lock = threading.RLock()
+        self._values = {}
+        self.history = OmegaStream("traits", retention=retention, spill_dir=spill_dir)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __delitem__(self, key):
+        with self.lock:
+            del self._values[key]
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self._values))
+
+    def __len__(self):
+        return len(self._values)
+
+    def update(self, other=(), **kwargs):
+        changes = dict(other, **kwargs)
+        with self.lock:
+            self._values.update(changes)
+            self.history.append({"timestamp": time.time(), "traits": changes})
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self._values)
+
+
+class OmegaState:
+    """
+    The process-wide Ω narrative state shared by the planner, ToCA simulation
+    and error recovery. Indexing by stream name keeps the old dict-of-lists
+    call sites working (`Ω["timeline"].append(...)`, `Ω.get("symbolic_log", [])`).
+    """
+
+    STREAMS = ("timeline", "symbolic_log", "timechain")
+
+    def __init__(self, retention=DEFAULT_RETENTION, spill_dir=None):
+        self.streams = {name: OmegaStream(name, retention=retention, spill_dir=spill_dir) for name in self.STREAMS}
+        self.traits = OmegaTraits(retention=retention, spill_dir=spill_dir)
+
+    def __getitem__(self, name):
+        if name == "traits":
+            return self.traits
+        return self.streams[name]
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        return name == "traits" or name in self.streams
+
+    def keys(self):
+        return list(self.STREAMS) + ["traits"]
+
+    def configure(self, retention=None, spill_dir=None, segment_size=None):
+        for stream in list(self.streams.values()) + [self.traits.history]:
+            with stream.lock:
+                if spill_dir is not None:
+                    stream.spill_dir = spill_dir
+                if segment_size is not None:
+                    stream.segment_size = segment_size
+                if retention is not None and retention != stream.retention:
+                    stream.resize(retention)
+
+    def flush(self):
+        for stream in list(self.streams.values()) + [self.traits.history]:
+            stream.flush()
+
+
+Ω = OmegaState()
+atexit.register(Ω.flush)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import random
 import json
@@ -6,10 +7,13 @@ import numpy as np
 import time
 
 from toca_simulation import simulate_galaxy_rotation, M_b_exponential, v_obs_flat, generate_phi_field
-from index import gamma_creativity, lambda_linguistics, chi_culturevolution, phi_scalar
-from utils.prompt_utils import call_gpt
+from index import phi_scalar, trait_bank
+from llm_cache import cached_call_gpt
+from llm_async import async_call_gpt
 
 logger = logging.getLogger("ANGELA.ReasoningEngine")
+call_gpt = cached_call_gpt("reasoning_engine")
+acall_gpt = async_call_gpt("reasoning_engine")
 
 class ReasoningEngine:
     """
@@ -103,7 +107,24 @@ class ReasoningEngine:
         return outputs
 
     def decompose(self, goal: str, context: dict = None, prioritize=False) -> list:
-        context = context or {}
+        subgoals, reasoning_trace, ambiguous = self._match_patterns(goal, context or {})
+        sim_hint = call_gpt(self._ambiguity_prompt(goal)) if ambiguous else None
+        return self._finish_decomposition(goal, subgoals, reasoning_trace, ambiguous, sim_hint, prioritize)
+
+    async def adecompose(self, goal: str, context: dict = None, prioritize=False) -> list:
+        """Awaitable decompose(); the ambiguity simulation goes through the async LLM client."""
+        subgoals, reasoning_trace, ambiguous = self._match_patterns(goal, context or {})
+        sim_hint = await acall_gpt(self._ambiguity_prompt(goal)) if ambiguous else None
+        return self._finish_decomposition(goal, subgoals, reasoning_trace, ambiguous, sim_hint, prioritize)
+
+    async def adecompose_many(self, goals, context: dict = None, prioritize=False) -> list:
+        """Decompose independent goals concurrently; results keep the input order."""
+        return list(await asyncio.gather(*(self.adecompose(goal, context, prioritize) for goal in goals)))
+
+    def _ambiguity_prompt(self, goal):
+        return f"Simulate decomposition ambiguity for: {goal}"
+
+    def _match_patterns(self, goal, context):
         logger.info(f"Decomposing goal: '{goal}'")
         reasoning_trace = [f"🔍 Goal: '{goal}'"]
         subgoals = []
@@ -112,18 +133,17 @@ class ReasoningEngine:
         if vectors:
             self.run_persona_wave_routing(goal, vectors)
 
-        traits = context.get("traits")
+        # a stage snapshot from the caller wins; only missing readings are evaluated here
+        traits = context.get("traits") or {}
         t = time.time() % 1e-18
-        if traits:
-            creativity = traits.get("gamma_creativity", gamma_creativity(t))
-            linguistics = traits.get("lambda_linguistics", lambda_linguistics(t))
-            culture = traits.get("chi_culturevolution", chi_culturevolution(t))
-            phi = traits.get("phi_scalar", phi_scalar(t))
-        else:
-            creativity = gamma_creativity(t)
-            linguistics = lambda_linguistics(t)
-            culture = chi_culturevolution(t)
-            phi = phi_scalar(t)
+        missing = [name for name in ("gamma_creativity", "lambda_linguistics", "chi_culturevolution")
+                   if name not in traits]
+        if missing:
+            traits = {**trait_bank.snapshot(t, names=missing), **traits}
+        creativity = traits["gamma_creativity"]
+        linguistics = traits["lambda_linguistics"]
+        culture = traits["chi_culturevolution"]
+        phi = traits["phi_scalar"] if "phi_scalar" in traits else phi_scalar(t)
 
         curvature_mod = 1 + abs(phi - 0.5)
         trait_bias = 1 + creativity + culture + 0.5 * linguistics
@@ -132,7 +152,7 @@ class ReasoningEngine:
         for key, steps in self.decomposition_patterns.items():
             if key in goal.lower():
                 base = random.uniform(0.5, 1.0)
-                alpha = traits.get('alpha_attention', 0.5) if traits else 0.5
+                alpha = traits.get('alpha_attention', 0.5)
                 adjusted = base * self.success_rates.get(key, 1.0) * trait_bias * curvature_mod * context_weight* (0.8 + 0.4 * alpha)
                 reasoning_trace.append(f"🧠 Pattern '{key}': conf={adjusted:.2f} (ϕ={phi:.2f})")
                 if adjusted >= self.confidence_threshold:
@@ -144,9 +164,10 @@ class ReasoningEngine:
         contradictions = self.detect_contradictions(subgoals)
         if contradictions:
             reasoning_trace.append(f"⚠️ Contradictions detected: {contradictions}")
+        return subgoals, reasoning_trace, not subgoals and phi > 0.8
 
-        if not subgoals and phi > 0.8:
-            sim_hint = call_gpt(f"Simulate decomposition ambiguity for: {goal}")
+    def _finish_decomposition(self, goal, subgoals, reasoning_trace, ambiguous, sim_hint, prioritize):
+        if ambiguous:
             reasoning_trace.append(f"🌀 Ambiguity simulation:\n{sim_hint}")
             if self.agi_enhancer:
                 self.agi_enhancer.reflect_and_adapt("Decomposition ambiguity encountered")
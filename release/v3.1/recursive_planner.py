@@ -1,32 +1,258 @@
 import logging
+import asyncio
+import atexit
 import concurrent.futures
+import contextvars
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from modules.reasoning_engine import ReasoningEngine
 from modules.meta_cognition import MetaCognition
 from modules.alignment_guard import AlignmentGuard
 from modules.simulation_core import SimulationCore
-from modules.memory_manager import MemoryManager
+from memory_manager import acquire_memory_manager, release_memory_manager
 from index import beta_concentration, omega_selfawareness, mu_morality, eta_reflexivity, lambda_narrative, delta_moral_drift
+from omega_state import Ω
 import time
 
 logger = logging.getLogger("ANGELA.RecursivePlanner")
 
-# Global narrative state placeholder (Ω)
-Ω = {
-    "timeline": [],
-    "traits": {},
-    "symbolic_log": []
-}
+class PlannerScheduler:
+    """
+    Shared execution substrate for every RecursivePlanner.
+    ---------------------------------
+    - One event loop thread runs all plan trees as coroutines, so a parent
+      waiting on its children holds no thread
+    - Blocking work (decomposition, simulation, alignment checks, memory writes)
+      runs on a single bounded pool: `max_workers` is the global concurrency cap
+    - Plans are submitted as concurrent.futures.Future objects and can be
+      cancelled or given a deadline
+    ---------------------------------
+    """
 
-class RecursivePlanner:
-    def __init__(self, max_workers=4):
-        self.reasoning_engine = ReasoningEngine()
-        self.meta_cognition = MetaCognition()
-        self.alignment_guard = AlignmentGuard()
-        self.simulation_core = SimulationCore()
-        self.memory_manager = MemoryManager()
+    def __init__(self, max_workers=8):
         self.max_workers = max_workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planner-worker")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="planner-loop", daemon=True)
+        self._thread.start()
+
+    def run_blocking(self, fn, *args, **kwargs):
+        """Awaitable that runs `fn` on the bounded worker pool."""
+        return self._loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def submit(self, coro):
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Blocking plan() called from the planner loop; await aplan() instead.")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_plan_parent = contextvars.ContextVar("plan_parent", default=None)
+_plan_policy = contextvars.ContextVar("plan_policy", default=None)
+
+
+def get_planner_scheduler(max_workers=8):
+    """Process-wide scheduler; `max_workers` only applies when it is first created."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PlannerScheduler(max_workers=max_workers)
+            atexit.register(_scheduler.shutdown)
+        return _scheduler
+
+
+def normalize_goal(text):
+    return " ".join(str(text).lower().split())
+
+
+def fingerprint(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=repr).encode("utf-8")).hexdigest()[:16]
+
+
+class PlanCache:
+    """
+    Memoized plan subtrees shared by all planners.
+    ---------------------------------
+    - Keyed by normalized goal text, remaining depth budget, a context
+      fingerprint and the planner's policy fingerprint (success rates and
+      alignment configuration), so a policy change never serves a stale plan
+    - Identical subgoals planned concurrently in different branches await one task
+    - Each node records the subtrees it reuses; `dag()` exposes the shared structure
+    - LRU-bounded; `invalidate()` drops every node
+    ---------------------------------
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._nodes = OrderedDict()
+        self._edges = {}
+        self._inflight = {}  # key -> [task, waiters]
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def key(self, kind, goal, context, budget, policy):
+        return (kind, normalize_goal(goal), budget, fingerprint(context), policy)
+
+    async def get_or_plan(self, key, goal, compute):
+        parent = _plan_parent.get()
+        with self._lock:
+            if parent is not None:
+                self._edges.setdefault(parent, set()).add(key)
+            node = self._nodes.get(key)
+            if node is not None:
+                self._nodes.move_to_end(key)
+                self.stats["hits"] += 1
+                return list(node["result"])
+            entry = self._inflight.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                entry = self._inflight[key] = [asyncio.ensure_future(self._compute(key, goal, compute)), 0]
+            else:
+                self.stats["coalesced"] += 1
+            entry[1] += 1
+        try:
+            return list(await asyncio.shield(entry[0]))
+        except asyncio.CancelledError:
+            with self._lock:
+                entry[1] -= 1
+                orphaned = entry[1] == 0
+            if orphaned:
+                entry[0].cancel()
+            raise
+
+    async def _compute(self, key, goal, compute):
+        _plan_parent.set(key)
+        try:
+            result = await compute()
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        with self._lock:
+            self._nodes[key] = {"kind": key[0], "goal": goal, "result": list(result),
+                                "children": self._edges.get(key, set())}
+            while len(self._nodes) > self.max_entries:
+                evicted, _ = self._nodes.popitem(last=False)
+                self._edges.pop(evicted, None)
+        return result
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._nodes or key in self._inflight
+
+    def invalidate(self):
+        with self._lock:
+            self._nodes.clear()
+            self._edges.clear()
+        logger.info("🧹 Plan cache invalidated.")
+
+    def dag(self):
+        """Snapshot of cached nodes: key -> goal, result and the keys of the subtrees it reuses."""
+        with self._lock:
+            return {
+                key: {"kind": node["kind"], "goal": node["goal"], "result": list(node["result"]),
+                      "children": sorted(node["children"], key=repr)}
+                for key, node in self._nodes.items()
+            }
+
+
+plan_cache = PlanCache()
 
-    def plan(self, goal: str, context: dict = None, depth: int = 0, max_depth: int = 5, collaborating_agents=None) -> list:
+
+class RecursivePlanner:
+    def __init__(self, max_workers=4, scheduler=None, cache=plan_cache, reasoning_engine=None, meta_cognition=None,
+                 alignment_guard=None, simulation_core=None, memory_manager=None):
+        # engines may be injected so planners can share them instead of building private copies
+        self.reasoning_engine = reasoning_engine or ReasoningEngine()
+        self.meta_cognition = meta_cognition or MetaCognition()
+        self.alignment_guard = alignment_guard or AlignmentGuard()
+        self.simulation_core = simulation_core or SimulationCore()
+        self._owns_memory = memory_manager is None
+        self.memory_manager = memory_manager or acquire_memory_manager()
+        self.max_workers = max_workers  # sibling subgoals evaluated at once per level
+        self.scheduler = scheduler or get_planner_scheduler()
+        self.plan_cache = cache
+
+    def close(self):
+        """Release the shared memory store if this planner acquired it."""
+        if self._owns_memory:
+            self._owns_memory = False
+            release_memory_manager(self.memory_manager)
+
+    def policy_fingerprint(self):
+        """Everything outside the goal and context that can change a plan's outcome."""
+        guard = self.alignment_guard
+        return fingerprint({
+            "success_rates": getattr(self.reasoning_engine, "success_rates", None),
+            "threshold": getattr(guard, "alignment_threshold", None),
+            "banned_keywords": getattr(guard, "banned_keywords", None),
+            "policies": [id(policy) for policy in getattr(guard, "dynamic_policies", [])],
+            "non_anthropocentric_policies": [id(policy) for policy in getattr(guard, "non_anthropocentric_policies", [])],
+            "scope": getattr(guard, "ethical_scope", None),
+        })
+
+    def plan(self, goal: str, context: dict = None, depth: int = 0, max_depth: int = 5, collaborating_agents=None,
+             timeout: float = None) -> list:
+        """Blocking entry point; the tree is planned on the shared scheduler."""
+        future = self.submit_plan(goal, context, depth, max_depth, collaborating_agents, timeout)
+        try:
+            return future.result()
+        finally:
+            future.cancel()
+
+    def submit_plan(self, goal, context=None, depth=0, max_depth=5, collaborating_agents=None, timeout=None):
+        """Start planning without blocking; cancel the returned future to abandon the whole tree."""
+        return self.scheduler.submit(self.aplan(goal, context, depth, max_depth, collaborating_agents, timeout))
+
+    async def aplan(self, goal, context=None, depth=0, max_depth=5, collaborating_agents=None, timeout=None):
+        _plan_policy.set(self.policy_fingerprint())
+        planning = self._aplan(goal, context, depth, max_depth, collaborating_agents)
+        if timeout is None:
+            return await planning
+        try:
+            return await asyncio.wait_for(planning, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"⏰ Planning for '{goal}' exceeded its {timeout}s deadline.")
+            raise TimeoutError(f"Planning for '{goal}' exceeded its {timeout}s deadline") from None
+
+    async def aplan_many(self, goals, context=None, max_depth=5, timeout=None):
+        """Plan independent goals concurrently on the current loop; results keep the input order."""
+        return list(await asyncio.gather(*(self.aplan(goal, context, 0, max_depth, timeout=timeout) for goal in goals)))
+
+    def plan_many(self, goals, context=None, max_depth=5, timeout=None):
+        """Blocking counterpart of aplan_many(), run on the shared scheduler."""
+        future = self.scheduler.submit(self.aplan_many(goals, context, max_depth, timeout))
+        try:
+            return future.result()
+        finally:
+            future.cancel()
+
+    def _cache_key(self, kind, goal, context, budget):
+        policy = _plan_policy.get()
+        if policy is None:
+            policy = self.policy_fingerprint()
+            _plan_policy.set(policy)
+        return self.plan_cache.key(kind, goal, context, budget, policy)
+
+    async def _aplan(self, goal, context, depth, max_depth, collaborating_agents=None):
+        if self.plan_cache is None or collaborating_agents:
+            return await self._plan_tree(goal, context, depth, max_depth, collaborating_agents)
+        key = self._cache_key("plan", goal, context, max_depth - depth)
+        return await self.plan_cache.get_or_plan(key, goal, lambda: self._plan_tree(goal, context, depth, max_depth))
+
+    async def _plan_tree(self, goal, context, depth, max_depth, collaborating_agents=None):
         logger.info(f"📋 Planning for goal: '{goal}'")
 
         if not self.alignment_guard.is_goal_safe(goal):
@@ -50,7 +276,12 @@ class RecursivePlanner:
             logger.warning("⚠️ Trait-based dynamic max recursion depth reached. Returning atomic goal.")
             return [goal]
 
-        subgoals = self.reasoning_engine.decompose(goal, context, prioritize=True)
+        adecompose = getattr(self.reasoning_engine, "adecompose", None)
+        if adecompose is not None:
+            # the ambiguity LLM call is awaited on the loop instead of holding a pool worker
+            subgoals = await adecompose(goal, context, prioritize=True)
+        else:
+            subgoals = await self.scheduler.run_blocking(self.reasoning_engine.decompose, goal, context, prioritize=True)
         if not subgoals:
             logger.info("ℹ️ No subgoals found. Returning atomic goal.")
             return [goal]
@@ -59,23 +290,24 @@ class RecursivePlanner:
             logger.info(f"🤝 Collaborating with agents: {[agent.name for agent in collaborating_agents]}")
             subgoals = self._distribute_subgoals(subgoals, collaborating_agents)
 
-        validated_plan = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_subgoal = {
-                executor.submit(self._plan_subgoal, subgoal, context, depth, dynamic_depth_limit): subgoal
-                for subgoal in subgoals
-            }
-            for future in concurrent.futures.as_completed(future_to_subgoal):
-                subgoal = future_to_subgoal[future]
+        feedback = await self._simulate_level(subgoals, context, depth, dynamic_depth_limit)
+        siblings = asyncio.Semaphore(self.max_workers)
+
+        async def evaluate(subgoal):
+            async with siblings:
                 try:
-                    result = future.result()
-                    validated_plan.extend(result)
-                    self._update_omega(subgoal, result)
+                    result = await self._aplan_subgoal(subgoal, context, depth, dynamic_depth_limit, feedback.get(subgoal))
+                    error = False
                 except Exception as e:
                     logger.error(f"❌ Error planning subgoal '{subgoal}': {e}")
-                    recovery_plan = self.meta_cognition.review_reasoning(str(e))
-                    validated_plan.extend(recovery_plan)
-                    self._update_omega(subgoal, recovery_plan, error=True)
+                    result = await self.scheduler.run_blocking(self.meta_cognition.review_reasoning, str(e))
+                    error = True
+            await self.scheduler.run_blocking(self._update_omega, subgoal, result, error)
+            return result
+
+        validated_plan = []
+        for result in await asyncio.gather(*(evaluate(subgoal) for subgoal in subgoals)):
+            validated_plan.extend(result)
 
         logger.info(f"✅ Final validated plan for goal '{goal}': {validated_plan}")
         return validated_plan
@@ -96,7 +328,51 @@ class RecursivePlanner:
         logger.info(f"🌱 Initiating plan from intrinsic goal: {generated_goal}")
         return self.plan(generated_goal, context=context)
 
-    def _plan_subgoal(self, subgoal, context, depth, max_depth):
+    async def _simulate_level(self, subgoals, context, depth, max_depth):
+        """
+        Simulate the sibling subgoals that are not already planned or in flight.
+        Field evolution runs once for the whole level; the per-subgoal
+        simulations are then fanned out on the worker pool.
+        """
+        pending = [
+            subgoal for subgoal in dict.fromkeys(subgoals)
+            if self.plan_cache is None or self._cache_key("subgoal", subgoal, context, max_depth - depth) not in self.plan_cache
+        ]
+        if not pending:
+            return {}
+
+        def prepare():
+            safe = [subgoal for subgoal in pending if self.alignment_guard.is_goal_safe(subgoal)]
+            return safe, self.simulation_core.prepare_batch(safe, context=context, scenarios=2, agents=1)
+
+        try:
+            safe, prepared = await self.scheduler.run_blocking(prepare)
+        except Exception as e:
+            logger.warning(f"⚠️ Batched simulation failed; subgoals will be simulated individually: {e}")
+            return {}
+
+        outputs = await asyncio.gather(
+            *(self.scheduler.run_blocking(self.simulation_core.simulate_prepared, prompt, fields)
+              for prompt, fields in prepared),
+            return_exceptions=True
+        )
+        feedback = {}
+        for subgoal, output in zip(safe, outputs):
+            if isinstance(output, Exception):
+                logger.warning(f"⚠️ Simulation failed for '{subgoal}'; it will be simulated individually: {output}")
+            else:
+                feedback[subgoal] = output
+        return feedback
+
+    async def _aplan_subgoal(self, subgoal, context, depth, max_depth, simulation_feedback=None):
+        if self.plan_cache is None:
+            return await self._evaluate_subgoal(subgoal, context, depth, max_depth, simulation_feedback)
+        key = self._cache_key("subgoal", subgoal, context, max_depth - depth)
+        return await self.plan_cache.get_or_plan(
+            key, subgoal, lambda: self._evaluate_subgoal(subgoal, context, depth, max_depth, simulation_feedback)
+        )
+
+    async def _evaluate_subgoal(self, subgoal, context, depth, max_depth, simulation_feedback=None):
         logger.info(f"🔄 Evaluating subgoal: {subgoal}")
 
         if not self.alignment_guard.is_goal_safe(subgoal):
@@ -106,20 +382,23 @@ class RecursivePlanner:
         if "gravity" in subgoal.lower() or "scalar" in subgoal.lower():
             try:
                 from toca_simulation import run_AGRF_with_traits
-                sim_traits = run_AGRF_with_traits(context)
+                sim_traits = await self.scheduler.run_blocking(run_AGRF_with_traits, context)
                 Ω["traits"].update(sim_traits["fields"])
                 Ω["timeline"].append({"subgoal": subgoal, "traits": sim_traits["fields"], "timestamp": time.time()})
             except Exception as e:
                 logger.warning(f"⚠️ ToCA simulation failed during subgoal '{subgoal}': {e}")
 
-        simulation_feedback = self.simulation_core.run(subgoal, context=context, scenarios=2, agents=1)
-        approved, _ = self.meta_cognition.pre_action_alignment_check(subgoal)
+        if simulation_feedback is None:
+            simulation_feedback = await self.scheduler.run_blocking(
+                self.simulation_core.run, subgoal, context=context, scenarios=2, agents=1
+            )
+        approved, _ = await self.scheduler.run_blocking(self.meta_cognition.pre_action_alignment_check, subgoal)
         if not approved:
             logger.warning(f"🚫 Subgoal '{subgoal}' denied by meta-cognitive alignment check.")
             return []
 
         try:
-            return self.plan(subgoal, context, depth + 1, max_depth)
+            return await self._aplan(subgoal, context, depth + 1, max_depth)
         except Exception as e:
             logger.error(f"❌ Error in subgoal '{subgoal}': {e}")
             return []
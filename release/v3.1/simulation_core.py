@@ -1,16 +1,21 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from modules.visualizer import Visualizer
-from modules.memory_manager import MemoryManager
+from memory_manager import acquire_memory_manager, release_memory_manager
 from modules.alignment_guard import enforce_alignment
 from datetime import datetime
 from index import zeta_consequence, theta_causality, rho_agency, TraitOverlayManager
+from field_codec import field_store
+from ledger import get_ledger
 import time
 import logging
+import threading
+import uuid
 import numpy as np
 import json
 import hashlib
 
 logger = logging.getLogger("ANGELA.SimulationCore")
+call_gpt = cached_call_gpt("simulation_core")
 
 class ToCATraitEngine:
     """
@@ -21,17 +26,37 @@ class ToCATraitEngine:
 
     Originally derived from `simulate_toca`, evolved to support agent coupling and dynamic updates.
     """
-    def __init__(self, k_m=1e-5, delta_m=1e10):
+    def __init__(self, k_m=1e-5, delta_m=1e10, grid_cache_size=32):
         self.k_m = k_m
         self.delta_m = delta_m
+        self.grid_cache_size = grid_cache_size
+        self._grid_cache = {}
+
+    def _grid_fields(self, x, t):
+        """ϕ, λ and vₘ depend only on the grids, so they are computed once per (x, t) pair."""
+        x = np.asarray(x, dtype=np.float64)
+        t = np.asarray(t, dtype=np.float64)
+        key = (x.tobytes(), t.tobytes())
+        fields = self._grid_cache.get(key)
+        if fields is None:
+            grad_x = np.gradient(x)
+            v_m = self.k_m * np.gradient(30e9 * 1.989e30 / (x**2 + 1e-10))
+            phi = np.sin(t * 1e-9) * 1e-63 * (1 + v_m * grad_x)
+            lambda_t = 1.1e-52 * np.exp(-2e-4 * np.sqrt(grad_x**2)) * (1 + v_m * self.delta_m)
+            for field in (phi, lambda_t, v_m):
+                field.setflags(write=False)
+            fields = (phi, lambda_t, v_m)
+            if len(self._grid_cache) >= self.grid_cache_size:
+                self._grid_cache.pop(next(iter(self._grid_cache)))
+            self._grid_cache[key] = fields
+        return fields
 
     def evolve(self, x, t, user_data=None):
-        v_m = self.k_m * np.gradient(30e9 * 1.989e30 / (x**2 + 1e-10))
-        phi = np.sin(t * 1e-9) * 1e-63 * (1 + v_m * np.gradient(x))
+        phi, lambda_t, v_m = self._grid_fields(x, t)
+        phi = phi.copy()
         if user_data is not None:
             phi += np.mean(user_data) * 1e-64
-        lambda_t = 1.1e-52 * np.exp(-2e-4 * np.sqrt(np.gradient(x)**2)) * (1 + v_m * self.delta_m)
-        return phi, lambda_t, v_m
+        return phi, lambda_t.copy(), v_m.copy()
 
     def update_fields_with_agents(self, phi, lambda_t, agent_matrix):
         interaction_energy = np.dot(agent_matrix, np.sin(phi)) * 1e-12
@@ -39,89 +64,152 @@ class ToCATraitEngine:
         lambda_t *= (1 + 0.001 * np.sum(agent_matrix, axis=0))
         return phi, lambda_t
 
+    def evolve_batch(self, x, t, agent_tensor):
+        """
+        Evolve N scenarios × M agents at once.
+        `agent_tensor` is (N, M, len(x)); returns ϕ as (N, M, len(x)) with each
+        agent's interaction energy applied to its own row, λ as (N, len(x))
+        and the shared vₘ grid.
+        """
+        phi, lambda_t, v_m = self._grid_fields(x, t)
+        agent_tensor = np.asarray(agent_tensor, dtype=np.float64)
+        interaction_energy = np.einsum("nmg,g->nm", agent_tensor, np.sin(phi)) * 1e-12
+        phi_batch = phi + interaction_energy[..., np.newaxis]
+        lambda_batch = lambda_t * (1 + 0.001 * agent_tensor.sum(axis=1))
+        return phi_batch, lambda_batch, v_m
+
+
 class SimulationCore:
-    def __init__(self, agi_enhancer=None):
-        self.visualizer = Visualizer()
-        self.simulation_history = []
-        self.ledger = []
+    GRID = np.linspace(0.1, 20, 100)
+    GRID.setflags(write=False)
+
+    def __init__(self, agi_enhancer=None, visualizer=None, memory_manager=None, toca_engine=None, overlay_router=None):
+        self.visualizer = visualizer or Visualizer()
+        self.simulation_history = []  # (ledger seq, record) pairs
+        self.ledger = get_ledger("simulation_core")
         self.agi_enhancer = agi_enhancer
-        self.memory_manager = MemoryManager()
-        self.toca_engine = ToCATraitEngine()
-        self.overlay_router = TraitOverlayManager()
+        self._owns_memory = memory_manager is None
+        self.memory_manager = memory_manager or acquire_memory_manager()
+        self.toca_engine = toca_engine or ToCATraitEngine()
+        self.overlay_router = overlay_router or TraitOverlayManager()
+        self._v_m_ref = None
+        # pyplot keeps global figure state; prepared entries may be simulated on several threads
+        self._render_lock = threading.Lock()
+
+    def close(self):
+        """Release the shared memory store if this core acquired it."""
+        if self._owns_memory:
+            self._owns_memory = False
+            release_memory_manager(self.memory_manager)
 
     def _record_state(self, data):
         record = {
             "timestamp": datetime.now().isoformat(),
-            "data": data,
-            "hash": hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+            "data": data
         }
-        self.ledger.append(record)
-        return record
+        # the record is hashed as-is, so seq stays outside it; ledger.proof(seq) proves inclusion
+        return self.ledger.append(record), record
 
     def run(self, results, context=None, scenarios=3, agents=2, export_report=False, export_format="pdf", actor_id="default_agent"):
         logger.info(f"🎲 Running simulation with {agents} agents and {scenarios} scenarios.")
+        return self.run_batch([results], context=context, scenarios=scenarios, agents=agents,
+                              export_report=export_report, export_format=export_format, actor_id=actor_id)[0]
+
+    def run_batch(self, batch, context=None, scenarios=3, agents=2, export_report=False, export_format="pdf", actor_id="default_agent"):
+        """
+        Simulate every entry of `batch` in one pass.
+        Fields for all entries are evolved together by prepare_batch(); the
+        per-entry simulations then run in batch order on the calling thread.
+        Callers with a worker pool can instead fan the prepared entries out
+        through simulate_prepared().
+        """
+        prepared = self.prepare_batch(batch, context=context, scenarios=scenarios, agents=agents, actor_id=actor_id)
+        return [self.simulate_prepared(prompt, fields, export_report, export_format, actor_id)
+                for prompt, fields in prepared]
+
+    def prepare_batch(self, batch, context=None, scenarios=3, agents=2, actor_id="default_agent"):
+        """
+        Evolve the fields for every entry of `batch` as (len(batch), agents, grid)
+        tensors and build one (prompt, fields) pair per entry, in batch order.
+        Raw fields go to the field store and only their summaries reach the
+        prompt and the ledger.
+        """
+        batch = list(batch)
+        if not batch:
+            return []
+        logger.info(f"🎲 Running batched simulation: {len(batch)} entries × {agents} agents.")
         t = time.time() % 1e-18
         causality = theta_causality(t)
         agency = rho_agency(t)
 
-        x = np.linspace(0.1, 20, 100)
-        t_vals = np.linspace(0.1, 20, 100)
-        agent_matrix = np.random.rand(agents, 100)
-
-        phi, lambda_field, v_m = self.toca_engine.evolve(x, t_vals)
-        phi, lambda_field = self.toca_engine.update_fields_with_agents(phi, lambda_field, agent_matrix)
-        energy_cost = np.mean(np.abs(phi)) * 1e12
-
-        prompt = {
-            "results": results,
-            "context": context,
-            "scenarios": scenarios,
-            "agents": agents,
-            "actor_id": actor_id,
-            "traits": {
-                "theta_causality": causality,
-                "rho_agency": agency
-            },
-            "fields": {
-                "phi": phi.tolist(),
-                "lambda": lambda_field.tolist(),
-                "v_m": v_m.tolist()
-            },
-            "estimated_energy_cost": energy_cost
-        }
-
+        agent_tensor = np.random.rand(len(batch), agents, self.GRID.size)
+        phi, lambda_field, v_m = self.toca_engine.evolve_batch(self.GRID, self.GRID, agent_tensor)
+        energy_costs = np.mean(np.abs(phi), axis=(1, 2)) * 1e12
+        # vₘ comes from the engine's grid cache; store it once and reuse its ref
+        if self._v_m_ref is None or self._v_m_ref[0] is not v_m:
+            self._v_m_ref = (v_m, field_store.ref(v_m))
+        v_m_ref = self._v_m_ref[1]
+
+        prepared = []
+        for n, results in enumerate(batch):
+            fields = {"phi": field_store.ref(phi[n]), "lambda": field_store.ref(lambda_field[n]), "v_m": v_m_ref}
+            prompt = {
+                "results": results,
+                "context": context,
+                "scenarios": scenarios,
+                "agents": agents,
+                "actor_id": actor_id,
+                "traits": {
+                    "theta_causality": causality,
+                    "rho_agency": agency
+                },
+                "fields": {name: ref["summary"] for name, ref in fields.items()},
+                "estimated_energy_cost": float(energy_costs[n])
+            }
+            prepared.append((prompt, fields))
+        return prepared
+
+    def simulate_prepared(self, prompt, fields, export_report=False, export_format="pdf", actor_id="default_agent"):
+        """Run the simulation for one entry produced by prepare_batch()."""
+        return self._simulate(prompt, fields, export_report, export_format, actor_id)
+
+    def _simulate(self, prompt, fields, export_report, export_format, actor_id):
         if not enforce_alignment(prompt):
             logger.warning("❌ Alignment guard rejected this simulation request.")
             return {"error": "Simulation rejected due to alignment constraints."}
 
         simulation_output = call_gpt(f"Simulate agent outcomes: {json.dumps(prompt)}")
 
-        state_record = self._record_state({
+        seq, state_record = self._record_state({
             "actor": actor_id,
             "action": "run_simulation",
             "traits": prompt["traits"],
-            "energy_cost": energy_cost,
+            "energy_cost": prompt["estimated_energy_cost"],
+            "fields": fields,
             "output": simulation_output
         })
 
-        self.simulation_history.append(state_record)
+        self.simulation_history.append((seq, state_record))
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # runs finishing in the same second must not share a memory key
+        memory_key = f"Simulation_{timestamp}_{uuid.uuid4().hex[:8]}"
         if self.memory_manager:
-            self.memory_manager.store(f"Simulation_{timestamp}", simulation_output, layer="STM")
+            self.memory_manager.store(memory_key, simulation_output, layer="STM")
             if export_report:
-                self.memory_manager.promote_to_ltm(f"Simulation_{timestamp}")
+                self.memory_manager.promote_to_ltm(memory_key)
 
         if self.agi_enhancer:
             self.agi_enhancer.log_episode("Simulation run", state_record, module="SimulationCore")
             self.agi_enhancer.reflect_and_adapt("SimulationCore: scenario simulation complete")
 
-        self.visualizer.render_charts(simulation_output)
+        with self._render_lock:
+            self.visualizer.render_charts(simulation_output)
 
-        if export_report:
-            filename = f"simulation_report_{timestamp}.{export_format}"
-            logger.info(f"📄 Exporting report: {filename}")
-            self.visualizer.export_report(simulation_output, filename=filename, format=export_format)
+            if export_report:
+                filename = f"simulation_report_{memory_key[len('Simulation_'):]}.{export_format}"
+                logger.info(f"📄 Exporting report: {filename}")
+                self.visualizer.export_report(simulation_output, filename=filename, format=export_format)
 
         return simulation_output
 
@@ -145,7 +233,7 @@ class SimulationCore:
 
         validation_output = call_gpt(prompt)
 
-        state_record = self._record_state({
+        seq, state_record = self._record_state({
             "actor": actor_id,
             "action": "validate_impact",
             "trait_zeta_consequence": consequence,
@@ -153,7 +241,7 @@ class SimulationCore:
             "output": validation_output
         })
 
-        self.simulation_history.append(state_record)
+        self.simulation_history.append((seq, state_record))
 
         if self.memory_manager:
             self.memory_manager.store(f"Validation_{datetime.now().strftime('%Y%m%d_%H%M%S')}", validation_output, layer="STM")
@@ -162,13 +250,14 @@ class SimulationCore:
             self.agi_enhancer.log_episode("Impact validation", state_record, module="SimulationCore")
             self.agi_enhancer.reflect_and_adapt("SimulationCore: impact validation complete")
 
-        self.visualizer.render_charts(validation_output)
+        with self._render_lock:
+            self.visualizer.render_charts(validation_output)
 
-        if export_report:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"impact_validation_{timestamp}.{export_format}"
-            logger.info(f"📄 Exporting validation report: {filename}")
-            self.visualizer.export_report(validation_output, filename=filename, format=export_format)
+            if export_report:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"impact_validation_{timestamp}.{export_format}"
+                logger.info(f"📄 Exporting validation report: {filename}")
+                self.visualizer.export_report(validation_output, filename=filename, format=export_format)
 
         return validation_output
 
@@ -187,7 +276,7 @@ class SimulationCore:
 
         environment_simulation = call_gpt(prompt)
 
-        state_record = self._record_state({
+        seq, state_record = self._record_state({
             "actor": actor_id,
             "action": "simulate_environment",
             "config": environment_config,
@@ -195,7 +284,7 @@ class SimulationCore:
             "output": environment_simulation
         })
 
-        self.simulation_history.append(state_record)
+        self.simulation_history.append((seq, state_record))
 
         if self.memory_manager:
             self.memory_manager.store(f"Environment_{datetime.now().strftime('%Y%m%d_%H%M%S')}", environment_simulation, layer="STM")
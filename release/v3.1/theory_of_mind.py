@@ -0,0 +1,185 @@
+import threading
+import logging
+from collections.abc import Mapping
+import numpy as np
+
+logger = logging.getLogger("ANGELA.TheoryOfMind")
+
+# code 0 means "not set" in every column
+STATES = (None, "moving", "confused")
+GOALS = (None, "continue_task", "seek_clarity")
+ACTIONS = (None, "advance", "ask_question")
+
+MOVING, CONFUSED = 1, 2
+CONTINUE_TASK, SEEK_CLARITY = 1, 2
+ADVANCE, ASK_QUESTION = 1, 2
+
+
+def _location_key(value):
+    """Hashable locations intern by equality, like the old `==` check; others by repr."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ("unhashable", repr(value))
+
+
+class _Models(Mapping):
+    """Read-only `models` view: agent name -> model dict, built on access."""
+
+    def __init__(self, engine):
+        self._engine = engine
+
+    def __getitem__(self, agent_name):
+        if agent_name not in self._engine.index:
+            raise KeyError(agent_name)
+        return self._engine.get_model(agent_name)
+
+    def __iter__(self):
+        return iter(list(self._engine.index))
+
+    def __len__(self):
+        return len(self._engine.index)
+
+
+class TheoryOfMindModule:
+    """
+    Batched Theory of Mind over integer-coded agent state.
+    ---------------------------------
+    - One row per modeled agent in NumPy columns: location (interned code),
+      belief state, desired goal and intended next action (small enum codes)
+    - Location codes are only compared; the last observed location value per
+      row is kept in an object column and is what get_model() returns
+    - update_batch() applies beliefs, desires and intentions for every
+      observed agent in one vectorized pass per tick
+    - The per-agent API (update_beliefs, infer_desires, infer_intentions,
+      get_model, describe_agent_state, models) is kept; model dicts are
+      produced on demand rather than stored
+    ---------------------------------
+    """
+
+    def __init__(self, capacity=64):
+        self.index = {}
+        self._lock = threading.RLock()
+        self._location_codes = {}
+        self._location_truthy = np.zeros(capacity, dtype=bool)
+        self._location = np.zeros(capacity, dtype=np.int32)
+        self._location_seen = np.empty(capacity, dtype=object)
+        self._state = np.zeros(capacity, dtype=np.int8)
+        self._goal = np.zeros(capacity, dtype=np.int8)
+        self._action = np.zeros(capacity, dtype=np.int8)
+
+    # --- Storage ---
+
+    def _row(self, agent_name):
+        row = self.index.get(agent_name)
+        if row is None:
+            row = self.index[agent_name] = len(self.index)
+            if row >= self._state.size:
+                capacity = self._state.size * 2
+                for column in ("_location", "_location_seen", "_state", "_goal", "_action"):
+                    dtype = getattr(self, column).dtype
+                    grown = np.empty(capacity, dtype=dtype) if dtype == object else np.zeros(capacity, dtype=dtype)
+                    grown[:row] = getattr(self, column)[:row]
+                    setattr(self, column, grown)
+        return row
+
+    def _location_code(self, value):
+        key = _location_key(value)
+        code = self._location_codes.get(key)
+        if code is None:
+            code = self._location_codes[key] = len(self._location_codes) + 1
+            if code >= self._location_truthy.size:
+                grown = np.zeros(self._location_truthy.size * 2, dtype=bool)
+                grown[:code] = self._location_truthy[:code]
+                self._location_truthy = grown
+            self._location_truthy[code] = bool(value)
+        return code
+
+    @property
+    def models(self):
+        return _Models(self)
+
+    # --- Vectorized updates ---
+
+    def update_batch(self, observations):
+        """Beliefs, desires and intentions for every agent in `observations` (name -> observation)."""
+        with self._lock:
+            rows = np.fromiter((self._row(name) for name in observations), dtype=np.int64, count=len(observations))
+            located = np.fromiter(("location" in obs for obs in observations.values()), dtype=bool, count=len(rows))
+            values = [obs["location"] for obs in observations.values() if "location" in obs]
+            codes = np.fromiter((self._location_code(value) for value in values), dtype=np.int32, count=len(values))
+            moved = rows[located]
+            previous = self._location[moved]
+            confused = self._location_truthy[previous] & (previous == codes)
+            self._state[moved] = np.where(confused, CONFUSED, MOVING)
+            self._location[moved] = codes
+            for row, value in zip(moved.tolist(), values):
+                self._location_seen[row] = value
+            self._infer(rows)
+
+    def _infer(self, rows):
+        state = self._state[rows]
+        goal = np.where(state == CONFUSED, SEEK_CLARITY, np.where(state == MOVING, CONTINUE_TASK, self._goal[rows]))
+        self._goal[rows] = goal
+        self._action[rows] = np.where(goal == SEEK_CLARITY, ASK_QUESTION,
+                                      np.where(goal == CONTINUE_TASK, ADVANCE, self._action[rows]))
+
+    # --- Per-agent API ---
+
+    def observe(self, agent_name, observation):
+        """update_beliefs + infer_desires + infer_intentions for one agent."""
+        with self._lock:
+            self.update_beliefs(agent_name, observation)
+            self.infer_desires(agent_name)
+            self.infer_intentions(agent_name)
+
+    def update_beliefs(self, agent_name, observation):
+        with self._lock:
+            row = self._row(agent_name)
+            if "location" in observation:
+                code = self._location_code(observation["location"])
+                previous = self._location[row]
+                confused = previous == code and self._location_truthy[previous]
+                self._state[row] = CONFUSED if confused else MOVING
+                self._location[row] = code
+                self._location_seen[row] = observation["location"]
+
+    def infer_desires(self, agent_name):
+        row = self.index.get(agent_name)
+        if row is None:
+            return
+        state = self._state[row]
+        if state == CONFUSED:
+            self._goal[row] = SEEK_CLARITY
+        elif state == MOVING:
+            self._goal[row] = CONTINUE_TASK
+
+    def infer_intentions(self, agent_name):
+        row = self.index.get(agent_name)
+        if row is None:
+            return
+        goal = self._goal[row]
+        if goal == SEEK_CLARITY:
+            self._action[row] = ASK_QUESTION
+        elif goal == CONTINUE_TASK:
+            self._action[row] = ADVANCE
+
+    def get_model(self, agent_name):
+        row = self.index.get(agent_name)
+        if row is None:
+            return {}
+        beliefs, desires, intentions = {}, {}, {}
+        if self._state[row]:
+            beliefs["state"] = STATES[self._state[row]]
+        if self._location[row]:
+            beliefs["location"] = self._location_seen[row]
+        if self._goal[row]:
+            desires["goal"] = GOALS[self._goal[row]]
+        if self._action[row]:
+            intentions["next_action"] = ACTIONS[self._action[row]]
+        return {"beliefs": beliefs, "desires": desires, "intentions": intentions}
+
+    def describe_agent_state(self, agent_name):
+        model = self.get_model(agent_name)
+        return f"{agent_name} believes they are {model.get('beliefs', {}).get('state', 'unknown')}, desires to {model.get('desires', {}).get('goal', 'unknown')}, and intends to {model.get('intentions', {}).get('next_action', 'unknown')}."
@@ -1,15 +1,14 @@
 import numpy as np
 from scipy.constants import G
 import matplotlib.pyplot as plt
+from omega_state import Ω
+from field_codec import field_store
 
 # Constants
 G_SI = G  # m^3 kg^-1 s^-2
 KPC_TO_M = 3.0857e19  # Conversion factor from kpc to meters
 MSUN_TO_KG = 1.989e30  # Solar mass in kg
 
-# Global narrative state placeholder (Ω)
-Ω = globals().get("Ω", {"timeline": [], "traits": {}, "symbolic_log": [], "timechain": []})
-
 # Default ToCA parameters (validated)
 k_default = 0.85
 epsilon_default = 0.015
@@ -51,21 +50,21 @@ def plot_AGRF_simulation(r_kpc, M_b_func, v_obs_func, label="ToCA-AGRF"):
 
     gamma_field, beta_field, zeta_field, eta_field, psi_field, lambda_field, phi_field, phi_prime, beta_psi_interaction = compute_trait_fields(r_kpc, v_obs, v_sim)
 
-    # Log to ANGELA's Ω state
+    # Log to ANGELA's Ω state; raw arrays live in the field store, the timeline keeps references
     Ω["timeline"].append({
         "type": "AGRF Simulation",
-        "r_kpc": r_kpc.tolist(),
-        "v_obs": v_obs.tolist(),
-        "v_sim": v_sim.tolist(),
-        "phi_field": phi_field.tolist(),
-        "phi_prime": phi_prime.tolist(),
+        "r_kpc": field_store.ref(r_kpc),
+        "v_obs": field_store.ref(v_obs),
+        "v_sim": field_store.ref(v_sim),
+        "phi_field": field_store.ref(phi_field),
+        "phi_prime": field_store.ref(phi_prime),
         "traits": {
-            "γ": gamma_field.tolist(),
-            "β": beta_field.tolist(),
-            "ζ": zeta_field.tolist(),
-            "η": eta_field,
-            "ψ": psi_field.tolist(),
-            "λ": lambda_field.tolist()
+            "γ": field_store.ref(gamma_field),
+            "β": field_store.ref(beta_field),
+            "ζ": field_store.ref(zeta_field),
+            "η": float(eta_field),
+            "ψ": field_store.ref(psi_field),
+            "λ": field_store.ref(lambda_field)
         }
     })
 
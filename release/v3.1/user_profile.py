@@ -1,4 +1,4 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from index import epsilon_identity
 from modules.agi_enhancer import AGIEnhancer
 import json
@@ -8,6 +8,7 @@ import time
 from datetime import datetime
 
 logger = logging.getLogger("ANGELA.UserProfile")
+call_gpt = cached_call_gpt("user_profile")
 
 class UserProfile:
     """
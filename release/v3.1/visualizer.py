@@ -1,4 +1,4 @@
-from utils.prompt_utils import call_gpt
+from llm_cache import cached_call_gpt
 from datetime import datetime
 import zipfile
 import os
@@ -9,6 +9,7 @@ from numba import jit
 from modules.agi_enhancer import AGIEnhancer
 
 logger = logging.getLogger("ANGELA.Visualizer")
+call_gpt = cached_call_gpt("visualizer")
 
 @jit
 def simulate_toca(k_m=1e-5, delta_m=1e10, energy=1e16, user_data=None):